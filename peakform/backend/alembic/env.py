@@ -12,7 +12,7 @@ from alembic import context
 
 # Import your models
 from app.database import Base
-from app.models import User, WorkoutPlan  # This ensures all models are registered
+from app.models import User, WorkoutPlan, GenerationCacheEntry, PlanDay, PlanExercise  # This ensures all models are registered
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,43 @@
+"""Add generation cache table
+
+Revision ID: 02029118a3ed
+Revises: 6d28f7143d82
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '02029118a3ed'
+down_revision: Union[str, Sequence[str], None] = '6d28f7143d82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('generation_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('generated_plan', sa.JSON(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_generation_cache_cache_key'), 'generation_cache', ['cache_key'], unique=True)
+    op.create_index(op.f('ix_generation_cache_id'), 'generation_cache', ['id'], unique=False)
+    op.create_index('ix_generation_cache_updated_at', 'generation_cache', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_generation_cache_updated_at', table_name='generation_cache')
+    op.drop_index(op.f('ix_generation_cache_id'), table_name='generation_cache')
+    op.drop_index(op.f('ix_generation_cache_cache_key'), table_name='generation_cache')
+    op.drop_table('generation_cache')
@@ -0,0 +1,36 @@
+"""Add generation status columns to workout plans
+
+Revision ID: b7e41c9d5a20
+Revises: 02029118a3ed
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41c9d5a20'
+down_revision: Union[str, Sequence[str], None] = '02029118a3ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('workout_plans') as batch_op:
+        batch_op.add_column(sa.Column('generation_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('generation_error', sa.Text(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_workout_plans_generation_status'), ['generation_status'], unique=False)
+    # plans generated before job mode already have their content
+    op.execute("UPDATE workout_plans SET generation_status = 'done' WHERE generated_plan IS NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('workout_plans') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_workout_plans_generation_status'))
+        batch_op.drop_column('generation_error')
+        batch_op.drop_column('generation_status')
@@ -0,0 +1,27 @@
+"""Add (user_id, created_at, id) index for plan listing
+
+Revision ID: c3f8a1d27b64
+Revises: b7e41c9d5a20
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d27b64'
+down_revision: Union[str, Sequence[str], None] = 'b7e41c9d5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_workout_plans_user_created', 'workout_plans', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workout_plans_user_created', table_name='workout_plans')
@@ -0,0 +1,166 @@
+"""Add plan_days and plan_exercises tables and backfill them
+
+Revision ID: d5a9e2c4f1b7
+Revises: c3f8a1d27b64
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e2c4f1b7'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a1d27b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the tables as of this revision; the backfill must not follow later model changes
+workout_plans = sa.table(
+    'workout_plans',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('generated_plan', sa.JSON),
+)
+# a Table (not table()) so inserts report the new day's primary key
+plan_days = sa.Table(
+    'plan_days',
+    sa.MetaData(),
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('plan_id', sa.Integer),
+    sa.Column('user_id', sa.Integer),
+    sa.Column('position', sa.Integer),
+    sa.Column('title', sa.String),
+    sa.Column('focus', sa.String),
+    sa.Column('exercise_count', sa.Integer),
+    sa.Column('total_sets', sa.Integer),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime),
+)
+plan_exercises = sa.table(
+    'plan_exercises',
+    sa.column('plan_id', sa.Integer),
+    sa.column('day_id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('name_key', sa.String),
+    sa.column('sets', sa.Integer),
+    sa.column('reps', sa.String),
+    sa.column('rest', sa.String),
+    sa.column('muscle', sa.String),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('plan_days',
+    sa.Column('plan_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=True),
+    sa.Column('focus', sa.String(length=255), nullable=True),
+    sa.Column('exercise_count', sa.Integer(), nullable=False),
+    sa.Column('total_sets', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['plan_id'], ['workout_plans.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_plan_days_id'), 'plan_days', ['id'], unique=False)
+    op.create_index('ix_plan_days_plan_position', 'plan_days', ['plan_id', 'position'], unique=False)
+    op.create_table('plan_exercises',
+    sa.Column('plan_id', sa.Integer(), nullable=False),
+    sa.Column('day_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('name_key', sa.String(length=255), nullable=False),
+    sa.Column('sets', sa.Integer(), nullable=True),
+    sa.Column('reps', sa.String(length=50), nullable=True),
+    sa.Column('rest', sa.String(length=50), nullable=True),
+    sa.Column('muscle', sa.String(length=50), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['day_id'], ['plan_days.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['plan_id'], ['workout_plans.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_plan_exercises_id'), 'plan_exercises', ['id'], unique=False)
+    op.create_index('ix_plan_exercises_user_name', 'plan_exercises', ['user_id', 'name_key', 'plan_id'], unique=False)
+    op.create_index('ix_plan_exercises_user_muscle', 'plan_exercises', ['user_id', 'muscle', 'plan_id', 'day_id'], unique=False)
+    op.create_index('ix_plan_exercises_plan_muscle', 'plan_exercises', ['plan_id', 'muscle'], unique=False)
+
+    backfill()
+
+
+def backfill(batch_size: int = 200) -> None:
+    """Populate both tables from the generated_plan of existing plans"""
+    # plan parsing and muscle matching are plain functions over the JSON and
+    # the exercise CSV; no ORM models are involved
+    from app.services.bm25_index import BM25Index
+    from app.services.plan_structure import MuscleMatcher, extract_days, normalize_name
+
+    dataset = os.getenv(
+        'EXERCISE_DATASET_PATH',
+        str(Path(__file__).resolve().parents[3] / 'db' / 'megaGymDataset.csv'),
+    )
+    match = MuscleMatcher(BM25Index.from_csv(dataset) if Path(dataset).is_file() else None)
+    conn = op.get_bind()
+    now = datetime.utcnow()
+    last_id = 0
+    while True:
+        plans = conn.execute(
+            sa.select(workout_plans.c.id, workout_plans.c.user_id, workout_plans.c.generated_plan)
+            .where(workout_plans.c.id > last_id, workout_plans.c.generated_plan.is_not(None))
+            .order_by(workout_plans.c.id)
+            .limit(batch_size)
+        ).all()
+        if not plans:
+            return
+        for plan_id, user_id, generated_plan in plans:
+            for position, day in enumerate(extract_days(generated_plan)):
+                exercises = day['exercises']
+                day_id = conn.execute(
+                    plan_days.insert().values(
+                        plan_id=plan_id, user_id=user_id, position=position,
+                        title=day['title'], focus=day['focus'],
+                        exercise_count=len(exercises),
+                        total_sets=sum(ex['sets'] or 0 for ex in exercises),
+                        created_at=now, updated_at=now,
+                    )
+                ).inserted_primary_key[0]
+                if exercises:
+                    conn.execute(plan_exercises.insert(), [
+                        {
+                            'plan_id': plan_id, 'day_id': day_id, 'user_id': user_id, 'position': j,
+                            'name': ex['name'], 'name_key': normalize_name(ex['name']),
+                            'sets': ex['sets'], 'reps': ex['reps'], 'rest': ex['rest'],
+                            'muscle': match(ex['name']), 'created_at': now, 'updated_at': now,
+                        }
+                        for j, ex in enumerate(exercises)
+                    ])
+        last_id = plans[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_plan_exercises_plan_muscle', table_name='plan_exercises')
+    op.drop_index('ix_plan_exercises_user_muscle', table_name='plan_exercises')
+    op.drop_index('ix_plan_exercises_user_name', table_name='plan_exercises')
+    op.drop_index(op.f('ix_plan_exercises_id'), table_name='plan_exercises')
+    op.drop_table('plan_exercises')
+    op.drop_index('ix_plan_days_plan_position', table_name='plan_days')
+    op.drop_index(op.f('ix_plan_days_id'), table_name='plan_days')
+    op.drop_table('plan_days')
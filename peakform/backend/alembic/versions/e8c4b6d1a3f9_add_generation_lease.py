@@ -0,0 +1,32 @@
+"""Add generation owner and lease columns to workout plans
+
+Revision ID: e8c4b6d1a3f9
+Revises: d5a9e2c4f1b7
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4b6d1a3f9'
+down_revision: Union[str, Sequence[str], None] = 'd5a9e2c4f1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('workout_plans') as batch_op:
+        batch_op.add_column(sa.Column('generation_owner', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('generation_claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('workout_plans') as batch_op:
+        batch_op.drop_column('generation_claimed_at')
+        batch_op.drop_column('generation_owner')
@@ -2,5 +2,7 @@
 from .health import router as health_router
 from .plans import router as plans_router
 from .auth import router as auth_router
+from .exercises import router as exercises_router
+from .plan_structure import router as plan_structure_router
 
-__all__ = ["health_router", "plans_router", "auth_router"]
+__all__ = ["health_router", "plans_router", "auth_router", "exercises_router", "plan_structure_router"]
@@ -1,18 +1,26 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserResponse, UserLogin, Token
 from app.utils.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    PasswordPoolSaturated,
     create_access_token,
-    verify_token,
+    decode_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
+from app.utils.principal_cache import (
+    get_cached_token,
+    cache_token,
+    get_cached_user,
+    cache_user,
+)
 
 router = APIRouter()
 
@@ -20,8 +28,27 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
+def _password_pool_busy() -> HTTPException:
+    """Error returned when the password hashing pool is saturated"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _check_password(user: User, password: str) -> bool:
+    """Verify a login password off the event loop"""
+    if not user:
+        return False
+    try:
+        return await verify_password_async(password, str(user.password_hash))
+    except PasswordPoolSaturated:
+        raise _password_pool_busy()
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
@@ -30,47 +57,65 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    email = verify_token(token)
-    if email is None:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.email == email).first()
+    # Verified tokens and their user rows are cached until the token's exp
+    principal = get_cached_token(token)
+    if principal is None:
+        principal = decode_access_token(token)
+        if principal is None:
+            raise credentials_exception
+        cache_token(token, *principal)
+    email, exp = principal
+
+    user = get_cached_user(email)
+    if user is not None:
+        return user
+
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
 
+    # detach so the cached row is not tied to this request's session
+    db.expunge(user)
+    cache_user(email, user, exp)
     return user
 
 
 @router.post("/api/auth/register", response_model=UserResponse)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    result = await db.execute(select(User).where(User.email == user.email))
+    db_user = result.scalars().first()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await get_password_hash_async(user.password)
+    except PasswordPoolSaturated:
+        raise _password_pool_busy()
     db_user = User(
         email=user.email, username=user.username, password_hash=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     return db_user
 
 
 @router.post("/api/auth/login", response_model=Token)
 async def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
     """Login and get access token"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
 
-    if not user or not verify_password(form_data.password, str(user.password_hash)):
+    if not await _check_password(user, form_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -85,11 +130,12 @@ async def login_for_access_token(
 
 
 @router.post("/api/auth/login-json", response_model=Token)
-async def login_with_json(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login_with_json(user_login: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login with JSON data (alternative to form data)"""
-    user = db.query(User).filter(User.email == user_login.email).first()
+    result = await db.execute(select(User).where(User.email == user_login.email))
+    user = result.scalars().first()
 
-    if not user or not verify_password(user_login.password, str(user.password_hash)):
+    if not await _check_password(user, user_login.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
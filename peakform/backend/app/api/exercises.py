@@ -0,0 +1,52 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+import httpx
+
+from app.schemas import ExerciseSuggestResponse, ExerciseSearchResponse
+from app.services import get_es_client
+from app.services.exercise_catalog import (
+    CatalogUnavailable,
+    InvalidCursor,
+    search_catalog,
+)
+from app.services.exercise_suggest import normalize_prefix, suggest_exercises
+
+router = APIRouter()
+
+
+@router.get("/api/exercises/suggest", response_model=ExerciseSuggestResponse)
+async def suggest_exercises_endpoint(
+    q: str = Query("", max_length=100, description="Typed prefix"),
+    size: int = Query(8, ge=1, le=20),
+    es_client: httpx.AsyncClient = Depends(get_es_client),
+):
+    """Autocomplete exercise names, muscle groups and equipment for a prefix"""
+    suggestions = await suggest_exercises(es_client, q, size)
+    return {"query": normalize_prefix(q), **suggestions}
+
+
+@router.get("/api/exercises/search", response_model=ExerciseSearchResponse)
+async def search_exercises_endpoint(
+    q: Optional[str] = Query(None, max_length=200, description="Free-text query"),
+    muscles: List[str] = Query([], description="Any of these muscle groups"),
+    equipment: List[str] = Query([], description="Any of this equipment"),
+    difficulty: List[str] = Query([], description="Any of these levels"),
+    tags: List[str] = Query([], description="Any of these tags"),
+    size: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, max_length=1000, description="next_cursor from the previous page"),
+    es_client: httpx.AsyncClient = Depends(get_es_client),
+):
+    """Search the exercise catalog with filters, facet counts and cursor paging"""
+    filters = {
+        "muscles": muscles,
+        "equipment": equipment,
+        "difficulty": difficulty,
+        "tags": tags,
+    }
+    try:
+        return await search_catalog(es_client, q, filters, size, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except CatalogUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
@@ -1,6 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
+from app.utils.security import password_pool_stats
+from app.utils.principal_cache import principal_cache_stats
+from app.services.generation_cache import generation_cache_stats
+from app.services.exercise_search import retrieval_stats, es_breaker
+from app.services.exercise_suggest import suggest_stats
 
 router = APIRouter()
 
@@ -15,8 +20,9 @@ def get_db():
 
 
 @router.get("/api/health")
-async def api_health_check():
+async def api_health_check(request: Request):
     """API health check endpoint"""
+    jobs = getattr(request.app.state, "generation_jobs", None)
     return {
         "status": "healthy",
         "service": "PeakForm API",
@@ -26,6 +32,13 @@ async def api_health_check():
             "health": "/health",
             "api_health": "/api/health",
         },
+        "password_pool": password_pool_stats(),
+        "principal_cache": principal_cache_stats(),
+        "generation_cache": generation_cache_stats(),
+        "generation_jobs": jobs.queue_stats() if jobs else None,
+        "retrieval": retrieval_stats(),
+        "suggest": suggest_stats(),
+        "elasticsearch_breaker": es_breaker.stats(),
     }
 
 
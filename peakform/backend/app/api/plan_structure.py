@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user
+from app.database import get_db
+from app.models import User, WorkoutPlan
+from app.schemas import ExerciseUsageResponse, MuscleDaysResponse, MuscleSetsResponse
+from app.services.plan_structure import (
+    expand_muscle,
+    normalize_name,
+    plan_muscle_sets,
+    plans_using_exercise,
+    plans_with_muscle_days,
+)
+
+router = APIRouter()
+
+
+@router.get("/api/plans/user/by-exercise", response_model=ExerciseUsageResponse)
+async def get_plans_using_exercise(
+    name: str = Query(..., min_length=1, max_length=255, description="Exercise name (case-insensitive)"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """The current user's plans that include an exercise, newest first"""
+    plans = await plans_using_exercise(db, current_user.id, name, limit)
+    return {"exercise": normalize_name(name), "plans": plans}
+
+
+@router.get("/api/plans/user/by-muscle-days", response_model=MuscleDaysResponse)
+async def get_plans_by_muscle_days(
+    muscle: str = Query(..., min_length=1, max_length=50, description="Catalog muscle or group (legs, back, arms, core)"),
+    min_days: int = Query(1, ge=1, le=7),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """The current user's plans with at least min_days days training a muscle"""
+    muscles = expand_muscle(muscle)
+    plans = await plans_with_muscle_days(db, current_user.id, muscles, min_days, limit)
+    return {"muscle": muscle.strip().lower(), "muscles": muscles, "min_days": min_days, "plans": plans}
+
+
+@router.get("/api/plans/{plan_id}/muscle-sets", response_model=MuscleSetsResponse)
+async def get_plan_muscle_sets(
+    plan_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Total weekly sets per muscle for one plan"""
+    owned = await db.scalar(
+        select(WorkoutPlan.id).where(WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id)
+    )
+    if owned is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
+        )
+    return {"plan_id": plan_id, "muscles": await plan_muscle_sets(db, plan_id)}
@@ -1,24 +1,52 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
 import json
+from typing import Any, Dict, List, Optional
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 import httpx
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.models import WorkoutPlan, User
-from app.schemas import WorkoutPlanCreate, WorkoutPlanResponse, WorkoutPlanUpdate
+from app.schemas import (
+    WorkoutPlanCreate,
+    WorkoutPlanResponse,
+    WorkoutPlanUpdate,
+    GenerationStatusResponse,
+    WorkoutPlanListResponse,
+)
 from app.api.auth import get_current_user
-import os
-from typing import Dict, Any
+from app.utils.etag import if_match, if_none_match, plan_etag, plan_list_etag, plan_page_etag
+from app.utils.serialization import plan_response
 import logging
 
-from app.config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_API_BASE
-
-# Elasticsearch defaults (best-effort; override with env)
-ES_URL = os.getenv("ELASTICSEARCH_URL", "http://localhost:9200")
-ES_USER = os.getenv("ELASTIC_USERNAME", "elastic")
-ES_PASS = os.getenv("ELASTIC_PASSWORD", "CSE5914peakform")
-ES_INDEX = os.getenv("ELASTIC_INDEX", "exercises")
+from app.config import GEMINI_API_KEY
+from app.services import (
+    GeminiError,
+    get_es_client,
+    get_gemini_client,
+    retrieve_exercises,
+)
+from app.services.generation_jobs import (
+    GenerationJobPool,
+    GenerationQueueFull,
+    get_generation_jobs,
+)
+from app.services.plan_generation import (
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    STATUS_DONE,
+    STATUS_FAILED,
+    WORKER_ID,
+    claim_values,
+    generate_for_plan,
+    generation_lease,
+    stream_generate_for_plan,
+)
+from app.services.plan_listing import InvalidPlanCursor, list_plan_summaries
+from app.services.plan_structure import delete_plan_structure
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +57,7 @@ router = APIRouter()
 async def create_workout_plan(
     plan: WorkoutPlanCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new workout plan"""
     db_plan = WorkoutPlan(
@@ -41,124 +69,215 @@ async def create_workout_plan(
         constraints=plan.constraints,
     )
     db.add(db_plan)
-    db.commit()
-    db.refresh(db_plan)
-    return db_plan
+    await db.commit()
+    await db.refresh(db_plan)
+    return plan_response(db_plan)
+
+
+def _set_etag(response: Response, etag: str) -> None:
+    # private: per-user data; no-cache: always revalidate with If-None-Match
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    _set_etag(response, etag)
+    return response
+
+
+async def _user_plans_etag(db: AsyncSession, user_id: int, *params) -> str:
+    """Collection ETag from one aggregate query (no plan rows are loaded)"""
+    result = await db.execute(
+        select(func.count(), func.max(WorkoutPlan.updated_at), func.sum(WorkoutPlan.id)).where(
+            WorkoutPlan.user_id == user_id
+        )
+    )
+    count, max_updated_at, id_sum = result.one()
+    return plan_list_etag(count, max_updated_at, id_sum, *params)
+
+
+def _check_if_match(request: Request, db_plan: WorkoutPlan) -> None:
+    """412 unless If-Match (when sent) names the plan's current ETag"""
+    if not if_match(request.headers.get("if-match"), plan_etag(db_plan.id, db_plan.updated_at)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Workout plan was modified; reload it and retry",
+        )
 
 
 @router.get("/api/plans/user", response_model=List[WorkoutPlanResponse])
 async def get_user_workout_plans(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
 ):
-    """Get all workout plans for the current user"""
-    plans = (
-        db.query(WorkoutPlan)
-        .filter(WorkoutPlan.user_id == current_user.id)
+    """Get all workout plans for the current user
+
+    A matching If-None-Match gets 304 without loading the plans.
+    """
+    # computed before the rows, so the tag is never newer than the body
+    etag = await _user_plans_etag(db, current_user.id, "full", skip, limit)
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    result = await db.execute(
+        select(WorkoutPlan)
+        .where(WorkoutPlan.user_id == current_user.id)
         .offset(skip)
         .limit(limit)
-        .all()
     )
-    return plans
+    response = plan_response(result.scalars().all())
+    _set_etag(response, etag)
+    return response
+
+
+@router.get("/api/plans/user/summary", response_model=WorkoutPlanListResponse)
+async def list_user_plan_summaries(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=200, description="next_cursor from the previous page"),
+):
+    """Page through the current user's plans, newest first, without plan content
+
+    The first page is tagged from the user's whole collection (its total can
+    change); later pages from their own rows, so they stay one keyset query.
+    """
+    if not cursor:
+        etag = await _user_plans_etag(db, current_user.id, "summary", limit)
+        if if_none_match(request.headers.get("if-none-match"), etag):
+            return _not_modified(etag)
+    try:
+        page = await list_plan_summaries(db, current_user.id, limit, cursor)
+    except InvalidPlanCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if cursor:
+        etag = plan_page_etag(page["plans"], "summary", limit, cursor, page["next_cursor"])
+        if if_none_match(request.headers.get("if-none-match"), etag):
+            return _not_modified(etag)
+    _set_etag(response, etag)
+    return page
 
 
 @router.get("/api/plans/{plan_id}", response_model=WorkoutPlanResponse)
 async def get_workout_plan(
     plan_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get a specific workout plan by ID"""
-    plan = (
-        db.query(WorkoutPlan)
-        .filter(WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id)
-        .first()
+    """Get a specific workout plan by ID
+
+    Sends a strong ETag; a matching If-None-Match gets 304 after an
+    updated_at-only query.
+    """
+    if_none_match_header = request.headers.get("if-none-match")
+    if if_none_match_header:
+        updated_at = await db.scalar(
+            select(WorkoutPlan.updated_at).where(
+                WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id
+            )
+        )
+        if updated_at is not None:
+            etag = plan_etag(plan_id, updated_at)
+            if if_none_match(if_none_match_header, etag):
+                return _not_modified(etag)
+
+    result = await db.execute(
+        select(WorkoutPlan).where(
+            WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id
+        )
     )
+    plan = result.scalars().first()
 
     if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
         )
-    return plan
+    response = plan_response(plan)
+    _set_etag(response, plan_etag(plan.id, plan.updated_at))
+    return response
+
+
+def _select_plan_for_write(request: Request, plan_id: int, user_id: int):
+    stmt = select(WorkoutPlan).where(WorkoutPlan.id == plan_id, WorkoutPlan.user_id == user_id)
+    if "if-match" in request.headers:
+        # hold the row until commit so the If-Match check can't go stale
+        stmt = stmt.with_for_update()
+    return stmt
 
 
 @router.put("/api/plans/{plan_id}", response_model=WorkoutPlanResponse)
 async def update_workout_plan(
     plan_id: int,
     plan_update: WorkoutPlanUpdate,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Update a workout plan"""
-    db_plan = (
-        db.query(WorkoutPlan)
-        .filter(WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id)
-        .first()
-    )
+    """Update a workout plan (If-Match supported for optimistic concurrency)"""
+    result = await db.execute(_select_plan_for_write(request, plan_id, current_user.id))
+    db_plan = result.scalars().first()
 
     if not db_plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
         )
+    _check_if_match(request, db_plan)
 
     # Update only provided fields
     update_data = plan_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_plan, field, value)
 
-    db.commit()
-    db.refresh(db_plan)
-    return db_plan
+    await db.commit()
+    await db.refresh(db_plan)
+    response = plan_response(db_plan)
+    _set_etag(response, plan_etag(db_plan.id, db_plan.updated_at))
+    return response
 
 
 @router.delete("/api/plans/{plan_id}")
 async def delete_workout_plan(
     plan_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Delete a workout plan"""
-    db_plan = (
-        db.query(WorkoutPlan)
-        .filter(WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id)
-        .first()
-    )
+    """Delete a workout plan (If-Match supported for optimistic concurrency)"""
+    result = await db.execute(_select_plan_for_write(request, plan_id, current_user.id))
+    db_plan = result.scalars().first()
 
     if not db_plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
         )
+    _check_if_match(request, db_plan)
 
-    db.delete(db_plan)
-    db.commit()
+    await delete_plan_structure(db, plan_id)
+    await db.delete(db_plan)
+    await db.commit()
     return {"message": "Workout plan deleted successfully"}
 
 
-def _build_generation_prompt(data: WorkoutPlanCreate) -> str:
-    lines = [
-        "You are a fitness coach. Design a weekly workout plan as structured JSON.",
-        "Constraints:",
-        "- Return ONLY valid JSON, no extra commentary.",
-        "- Use keys: weeks, days, focus, exercises, sets, reps, rest, notes.",
-        "- Make it realistic for the user's experience and constraints.",
-        "",
-        f"Experience: {data.experience}",
-        f"Days per week: {data.days_per_week}",
-        f"Target muscles: {data.muscle_groups or 'unspecified'}",
-        f"Constraints: {data.constraints or 'none'}",
-    ]
-    return "\n".join(lines)
-
-
 @router.post("/api/plans/generate", response_model=WorkoutPlanResponse)
 async def create_and_generate_workout_plan(
     plan: WorkoutPlanCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    es_client: httpx.AsyncClient = Depends(get_es_client),
+    gemini_client: httpx.AsyncClient = Depends(get_gemini_client),
+    bypass_cache: bool = False,
 ):
-    """Create a workout plan and generate AI content via Gemini, then save."""
+    """Create a workout plan and generate AI content via Gemini, then save.
+
+    Identical prompts (same inputs and exercise context) reuse a cached plan
+    unless ``bypass_cache`` is set, which forces a fresh Gemini call.
+    """
     if not GEMINI_API_KEY:
         raise HTTPException(status_code=500, detail="Gemini API key not configured")
 
@@ -170,122 +289,221 @@ async def create_and_generate_workout_plan(
         days_per_week=plan.days_per_week,
         muscle_groups=plan.muscle_groups,
         constraints=plan.constraints,
+        **claim_values(),
     )
-    db.add(db_plan)
-    db.commit()
-    db.refresh(db_plan)
+    # Retrieve exercise context concurrently with the insert
+    retrieval = asyncio.create_task(retrieve_exercises(es_client, plan))
+    try:
+        db.add(db_plan)
+        await db.commit()
+        await db.refresh(db_plan)
+    except Exception:
+        retrieval.cancel()
+        raise
+    es_examples = await retrieval
 
-    # 2) Build prompt and call Gemini
-    # Try to retrieve a few relevant exercises from Elasticsearch to provide context to the LLM.
-    es_examples: list[Dict[str, Any]] = []
+    # 2) Build prompt (with exercise context) and call Gemini, 3) save results
     try:
-        # build a simple free-text query from muscle_groups + constraints + name
-        qparts = [p for p in (plan.muscle_groups, plan.constraints, plan.name) if p]
-        es_query_text = " ".join(qparts) or plan.experience
-        es_url = f"{ES_URL.rstrip('/')}/{ES_INDEX}/_search"
-        es_body = {
-            "size": 8,
-            "query": {
-                "multi_match": {
-                    "query": es_query_text,
-                    "fields": ["name^3", "muscles^2", "snippet", "description"],
-                }
-            },
-            "_source": ["id", "name", "muscles", "equipment", "snippet"]
-        }
-
-        async with httpx.AsyncClient(timeout=10.0) as es_client:
-            resp = await es_client.post(es_url, json=es_body, auth=(ES_USER, ES_PASS))
-            if resp.status_code == 200:
-                payload = resp.json()
-                hits = payload.get("hits", {}).get("hits", [])
-                for h in hits:
-                    src = h.get("_source", {})
-                    # keep only a few fields and safe types
-                    es_examples.append({
-                        "name": src.get("name"),
-                        "muscles": src.get("muscles"),
-                        "equipment": src.get("equipment"),
-                        "snippet": src.get("snippet"),
-                    })
+        async with generation_lease(db_plan.id):
+            await generate_for_plan(
+                db,
+                db_plan,
+                es_client,
+                gemini_client,
+                bypass_cache=bypass_cache,
+                es_examples=es_examples,
+            )
+        await db.commit()
+        await db.refresh(db_plan)
+        return plan_response(db_plan)
+    except GeminiError as e:
+        await _mark_generation_failed(db, db_plan, str(e))
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
-        # best-effort: if ES is unreachable or fails, continue without examples
-        es_examples = []
-        logger.warning("Elasticsearch retrieval failed: %s", str(e))
-
-    # log whether ES examples were used
-    if es_examples:
-        logger.info("Elasticsearch examples found: %d", len(es_examples))
-    else:
-        logger.info("No Elasticsearch examples used for prompt generation")
-
-    # Build the prompt including examples when available
-    prompt = _build_generation_prompt(plan)
-    if es_examples:
-        lines = ["\nContext - example exercises from library (short):"]
-        for ex in es_examples:
-            name = ex.get("name") or "(unnamed)"
-            muscles = (", ".join(ex.get("muscles")) if isinstance(ex.get("muscles"), list) else ex.get("muscles")) or "unspecified"
-            equip = (", ".join(ex.get("equipment")) if isinstance(ex.get("equipment"), list) else ex.get("equipment")) or "none"
-            snippet = (ex.get("snippet") or "").strip().replace("\n", " ")
-            lines.append(f"- {name}; Muscles: {muscles}; Equipment: {equip}; Note: {snippet}")
-        prompt = prompt + "\n" + "\n".join(lines)
-    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
-    body = {
-        "contents": [
-            {
-                "role": "user",
-                "parts": [
-                    {"text": prompt},
-                ],
-            }
-        ],
-        "generationConfig": {
-            "response_mime_type": "application/json",
-            "temperature": 0.7,
-        },
-    }
+        # On failure, keep the created plan but without generated content
+        logger.exception("Plan generation failed for plan %s", db_plan.id)
+        # details stay in the log; generation_error is shown to the client
+        await _mark_generation_failed(db, db_plan, "Failed to generate plan")
+        raise HTTPException(status_code=502, detail="Failed to generate plan")
+
+
+async def _mark_generation_failed(db: AsyncSession, db_plan: WorkoutPlan, error: str):
+    await db.rollback()
+    db_plan.generation_status = STATUS_FAILED
+    db_plan.generation_error = error[:500]
+    await db.commit()
+
 
+async def _hand_off_to_jobs(db: AsyncSession, plan_id: int, jobs: GenerationJobPool) -> None:
+    """Re-queue a plan this process was generating as a background job"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, json=body, headers={"Content-Type": "application/json"})
-            if resp.status_code >= 400:
-                raise HTTPException(status_code=502, detail=f"Gemini error: {resp.text[:200]}")
-            payload = resp.json()
-
-        # Extract JSON text from response
-        # Typical structure: candidates[0].content.parts[0].text
-        text = (
-            payload.get("candidates", [{}])[0]
-            .get("content", {})
-            .get("parts", [{}])[0]
-            .get("text")
+        await db.rollback()
+        released = await db.execute(
+            update(WorkoutPlan)
+            .where(
+                WorkoutPlan.id == plan_id,
+                WorkoutPlan.generation_status == STATUS_RUNNING,
+                WorkoutPlan.generation_owner == WORKER_ID,
+            )
+            .values(generation_status=STATUS_PENDING, generation_owner=None)
         )
-        generated_json = None
-        if text:
-            try:
-                generated_json = json.loads(text)
-            except Exception:
-                # If it returned plain text with code fences or commentary, attempt to strip
-                cleaned = text.strip()
-                if cleaned.startswith("```"):
-                    cleaned = cleaned.strip("`")
-                    # remove potential language hint
-                    cleaned = "\n".join(line for line in cleaned.splitlines() if not line.strip().startswith("json"))
-                try:
-                    generated_json = json.loads(cleaned)
-                except Exception:
-                    generated_json = {"raw": text}
-
-        # 3) Save generation results
-        db_plan.generated_plan = generated_json
-        db_plan.generation_prompt = prompt
-        db.commit()
-        db.refresh(db_plan)
-        return db_plan
-    except HTTPException:
-        # Bubble up known HTTP errors
+        await db.commit()
+    except Exception:
+        # the lease expires and the reaper re-queues the plan
+        logger.exception("Could not hand plan %s to the job pool", plan_id)
+        return
+    if released.rowcount:
+        jobs.enqueue(plan_id)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/api/plans/generate/stream")
+async def stream_and_generate_workout_plan(
+    plan: WorkoutPlanCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    es_client: httpx.AsyncClient = Depends(get_es_client),
+    gemini_client: httpx.AsyncClient = Depends(get_gemini_client),
+    jobs: GenerationJobPool = Depends(get_generation_jobs),
+    bypass_cache: bool = False,
+):
+    """Create a workout plan and stream Gemini output as Server-Sent Events.
+
+    Events: ``plan`` (id, sent immediately), ``chunk`` (partial text),
+    then ``done`` (saved plan JSON) or ``error``.
+    """
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=500, detail="Gemini API key not configured")
+
+    db_plan = WorkoutPlan(
+        user_id=current_user.id,
+        name=plan.name,
+        experience=plan.experience,
+        days_per_week=plan.days_per_week,
+        muscle_groups=plan.muscle_groups,
+        constraints=plan.constraints,
+        **claim_values(),
+    )
+    # Retrieve exercise context concurrently with the insert
+    retrieval = asyncio.create_task(retrieve_exercises(es_client, plan))
+    try:
+        db.add(db_plan)
+        await db.commit()
+    except Exception:
+        retrieval.cancel()
         raise
-    except Exception as e:
-        # On failure, keep the created plan but without generated content
-        raise HTTPException(status_code=502, detail=f"Failed to generate plan: {str(e)[:200]}")
+    plan_id = db_plan.id
+
+    async def events():
+        yield _sse("plan", {"plan_id": plan_id, "status": STATUS_RUNNING})
+        finished = False
+        # the request session may be closed once the response starts streaming
+        async with AsyncSessionLocal() as stream_db:
+            stream_plan = await stream_db.get(WorkoutPlan, plan_id)
+            try:
+                es_examples = await retrieval
+                async with generation_lease(plan_id):
+                    async for text in stream_generate_for_plan(
+                        stream_db,
+                        stream_plan,
+                        es_client,
+                        gemini_client,
+                        bypass_cache=bypass_cache,
+                        es_examples=es_examples,
+                    ):
+                        yield _sse("chunk", {"text": text})
+                await stream_db.commit()
+                finished = True
+                yield _sse(
+                    "done",
+                    {
+                        "plan_id": plan_id,
+                        "status": STATUS_DONE,
+                        "generated_plan": stream_plan.generated_plan,
+                    },
+                )
+            except Exception as e:
+                if isinstance(e, GeminiError):
+                    detail = str(e)[:200]
+                else:
+                    logger.exception("Streaming generation failed for plan %s", plan_id)
+                    detail = "Failed to generate plan"
+                await _mark_generation_failed(stream_db, stream_plan, detail)
+                finished = True
+                yield _sse("error", {"plan_id": plan_id, "status": STATUS_FAILED, "detail": detail})
+            finally:
+                if not finished:
+                    # the client went away. Depending on the server this
+                    # arrives as cancellation, GeneratorExit or OSError, and
+                    # a cancelled response keeps cancelling our awaits, so
+                    # hand the plan to the job pool under a shield
+                    with anyio.CancelScope(shield=True):
+                        await _hand_off_to_jobs(stream_db, plan_id, jobs)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/api/plans/generate/async",
+    response_model=GenerationStatusResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_workout_plan_generation(
+    plan: WorkoutPlanCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    jobs: GenerationJobPool = Depends(get_generation_jobs),
+):
+    """Create a workout plan and queue its generation; poll /status for progress"""
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=500, detail="Gemini API key not configured")
+    try:
+        jobs.check_capacity()
+    except GenerationQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue is full, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+    db_plan = WorkoutPlan(
+        user_id=current_user.id,
+        name=plan.name,
+        experience=plan.experience,
+        days_per_week=plan.days_per_week,
+        muscle_groups=plan.muscle_groups,
+        constraints=plan.constraints,
+        generation_status=STATUS_PENDING,
+    )
+    db.add(db_plan)
+    await db.commit()
+    jobs.enqueue(db_plan.id)
+    return {"plan_id": db_plan.id, "status": STATUS_PENDING}
+
+
+@router.get("/api/plans/{plan_id}/status", response_model=GenerationStatusResponse)
+async def get_workout_plan_generation_status(
+    plan_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the generation status of a workout plan"""
+    result = await db.execute(
+        select(WorkoutPlan.generation_status, WorkoutPlan.generation_error).where(
+            WorkoutPlan.id == plan_id, WorkoutPlan.user_id == current_user.id
+        )
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Workout plan not found"
+        )
+    return {"plan_id": plan_id, "status": row.generation_status, "error": row.generation_error}
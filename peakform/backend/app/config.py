@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -6,13 +7,85 @@ load_dotenv()
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./peakform.db")
+# Optional explicit async URL; derived from DATABASE_URL when unset
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
 
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Password hashing pool (bcrypt runs off the event loop)
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", "4"))
+PASSWORD_POOL_MAX_QUEUE = int(os.getenv("PASSWORD_POOL_MAX_QUEUE", "32"))
+
+# Authenticated-principal cache (verified tokens and user rows)
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+
 # Google AI Studio / Gemini
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
 GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+
+# Generated plan cache (in-memory LRU + generation_cache table)
+GENERATION_CACHE_ENABLED = os.getenv("GENERATION_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+GENERATION_CACHE_MEMORY_SIZE = int(os.getenv("GENERATION_CACHE_MEMORY_SIZE", "256"))
+GENERATION_CACHE_MAX_ROWS = int(os.getenv("GENERATION_CACHE_MAX_ROWS", "5000"))
+GENERATION_CACHE_TTL_SECONDS = float(os.getenv("GENERATION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Background generation jobs
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", "4"))
+GENERATION_QUEUE_MAX = int(os.getenv("GENERATION_QUEUE_MAX", "1000"))
+# a running generation whose lease is not renewed for this long is re-queued
+GENERATION_LEASE_SECONDS = float(os.getenv("GENERATION_LEASE_SECONDS", "120"))
+
+# Elasticsearch defaults (best-effort; override with env)
+ES_URL = os.getenv("ELASTICSEARCH_URL", "http://localhost:9200")
+ES_USER = os.getenv("ELASTIC_USERNAME", "elastic")
+ES_PASS = os.getenv("ELASTIC_PASSWORD", "CSE5914peakform")
+ES_INDEX = os.getenv("ELASTIC_INDEX", "exercises")
+ES_CONNECT_TIMEOUT = float(os.getenv("ES_CONNECT_TIMEOUT", "1.0"))
+ES_READ_TIMEOUT = float(os.getenv("ES_READ_TIMEOUT", "10.0"))
+
+# Elasticsearch circuit breaker
+ES_BREAKER_FAILURE_THRESHOLD = int(os.getenv("ES_BREAKER_FAILURE_THRESHOLD", "3"))
+ES_BREAKER_COOLDOWN_SECONDS = float(os.getenv("ES_BREAKER_COOLDOWN_SECONDS", "15"))
+
+# Exercise retrieval cache (invalidated when the index is re-ingested)
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+RETRIEVAL_CACHE_TTL_SECONDS = float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "3600"))
+RETRIEVAL_VERSION_CHECK_SECONDS = float(os.getenv("RETRIEVAL_VERSION_CHECK_SECONDS", "30"))
+
+# Exercise typeahead (/api/exercises/suggest) hot-prefix cache
+SUGGEST_CACHE_SIZE = int(os.getenv("SUGGEST_CACHE_SIZE", "4096"))
+SUGGEST_CACHE_TTL_SECONDS = float(os.getenv("SUGGEST_CACHE_TTL_SECONDS", "300"))
+
+# Exercise retrieval backend: "elasticsearch" (local index as fallback) or "local"
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "elasticsearch").lower()
+EXERCISE_DATASET_PATH = os.getenv(
+    "EXERCISE_DATASET_PATH",
+    str(Path(__file__).resolve().parents[2] / "db" / "megaGymDataset.csv"),
+)
+
+# Retriever for prompt context: "keyword" (ES/BM25), "dense" (local LSA
+# embeddings) or "hybrid" (both, fused by reciprocal rank)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "keyword").lower()
+DENSE_INDEX_DIR = os.getenv(
+    "DENSE_INDEX_DIR",
+    str(Path(__file__).resolve().parents[2] / "db" / "dense_index"),
+)
+
+# Shared outbound HTTP clients (Elasticsearch / Gemini)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Response compression (br/zstd need the optional brotli/zstandard packages)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
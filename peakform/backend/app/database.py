@@ -1,24 +1,52 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from app.config import DATABASE_URL, ASYNC_DATABASE_URL
 
-# Create SQLAlchemy engine
+# Create SQLAlchemy engine (sync; used by Alembic and offline scripts)
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required parameter for SQLite
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},  # Required parameter for SQLite
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _to_async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql+psycopg2:"):
+        return "postgresql+asyncpg:" + url[len("postgresql+psycopg2:"):]
+    if url.startswith("postgresql:") or url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+# Create async engine used by the API request handlers
+async_engine = create_async_engine(ASYNC_DATABASE_URL or _to_async_url(DATABASE_URL))
+
+# Create async session factory; objects stay usable after commit so handlers
+# can return them without an extra round trip
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create base model class
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency injection function: get database session"""
+def get_sync_db():
+    """Get a synchronous database session (scripts, migrations, tooling)"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_db():
+    """Dependency injection function: get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
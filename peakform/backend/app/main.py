@@ -1,9 +1,60 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 # Import API routers
-from app.api import health_router, plans_router, auth_router
+from app.api import (
+    health_router,
+    plans_router,
+    auth_router,
+    exercises_router,
+    plan_structure_router,
+)
+from app.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_ENABLED,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_ZSTD_LEVEL,
+    DENSE_INDEX_DIR,
+    EXERCISE_DATASET_PATH,
+    RETRIEVAL_MODE,
+)
+from app.services import create_es_client, create_gemini_client
+from app.services.bm25_index import load_local_index
+from app.services.dense_index import load_dense_index
+from app.services.exercise_search import es_breaker, probe_elasticsearch
+from app.services.generation_jobs import GenerationJobPool
+from app.utils.compression import CompressionMiddleware
+from app.utils.serialization import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create long-lived outbound HTTP clients, search index and background workers"""
+    await asyncio.to_thread(load_local_index, EXERCISE_DATASET_PATH)
+    if RETRIEVAL_MODE != "keyword":
+        await asyncio.to_thread(load_dense_index, DENSE_INDEX_DIR, EXERCISE_DATASET_PATH)
+    app.state.es_client = create_es_client()
+    app.state.gemini_client = create_gemini_client()
+    app.state.generation_jobs = GenerationJobPool(
+        app.state.es_client, app.state.gemini_client
+    )
+    await app.state.generation_jobs.start()
+    es_probe = asyncio.create_task(
+        es_breaker.probe_loop(lambda: probe_elasticsearch(app.state.es_client))
+    )
+    try:
+        yield
+    finally:
+        es_probe.cancel()
+        await app.state.generation_jobs.stop()
+        await app.state.gemini_client.aclose()
+        await app.state.es_client.aclose()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -12,6 +63,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS middleware
@@ -27,12 +80,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress large JSON responses (plans, plan lists); streams pass through
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        levels={
+            "gzip": COMPRESSION_GZIP_LEVEL,
+            "br": COMPRESSION_BROTLI_QUALITY,
+            "zstd": COMPRESSION_ZSTD_LEVEL,
+        },
+    )
+
 # Include API routers
 app.include_router(health_router, tags=["health"])
 app.include_router(auth_router, tags=["authentication"])
 app.include_router(plans_router, tags=["workout-plans"])
+app.include_router(plan_structure_router, tags=["workout-plans"])
+app.include_router(exercises_router, tags=["exercises"])
 
 
 # Root endpoint
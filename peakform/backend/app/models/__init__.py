@@ -2,6 +2,8 @@
 from .base import BaseModel
 from .user import User
 from .workout_plan import WorkoutPlan
+from .generation_cache import GenerationCacheEntry
+from .plan_structure import PlanDay, PlanExercise
 
 # Ensure all models are registered to Base metadata
-__all__ = ["BaseModel", "User", "WorkoutPlan"]
\ No newline at end of file
+__all__ = ["BaseModel", "User", "WorkoutPlan", "GenerationCacheEntry", "PlanDay", "PlanExercise"]
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, JSON, Index
+from .base import BaseModel
+
+
+class GenerationCacheEntry(BaseModel):
+    """Persistent tier of the Gemini plan generation cache"""
+    __tablename__ = "generation_cache"
+    __table_args__ = (Index("ix_generation_cache_updated_at", "updated_at"),)
+    
+    # sha256 of normalized prompt (incl. exercise context) + model name
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)
+    model = Column(String(100), nullable=False)
+    generated_plan = Column(JSON, nullable=False)  # Cached AI generated plan content
+    hit_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<GenerationCacheEntry(id={self.id}, cache_key='{self.cache_key[:12]}')>"
@@ -0,0 +1,49 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from .base import BaseModel
+
+
+class PlanDay(BaseModel):
+    """One training day of a generated plan (first week), in plan order"""
+    __tablename__ = "plan_days"
+    __table_args__ = (Index("ix_plan_days_plan_position", "plan_id", "position"),)
+    
+    plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # copied from the plan for per-user queries
+    position = Column(Integer, nullable=False)  # 0-based day order in the plan
+    title = Column(String(100), nullable=True)  # "Day 1", "Monday", ...
+    focus = Column(String(255), nullable=True)  # e.g. "Lower body"
+    exercise_count = Column(Integer, default=0, nullable=False)
+    total_sets = Column(Integer, default=0, nullable=False)
+    
+    exercises = relationship("PlanExercise", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<PlanDay(id={self.id}, plan_id={self.plan_id}, position={self.position})>"
+
+
+class PlanExercise(BaseModel):
+    """One exercise of a plan day, with the catalog muscle it was matched to"""
+    __tablename__ = "plan_exercises"
+    __table_args__ = (
+        # "which plans use exercise X"
+        Index("ix_plan_exercises_user_name", "user_id", "name_key", "plan_id"),
+        # "plans with N+ days for a muscle"
+        Index("ix_plan_exercises_user_muscle", "user_id", "muscle", "plan_id", "day_id"),
+        # "weekly sets per muscle" of one plan
+        Index("ix_plan_exercises_plan_muscle", "plan_id", "muscle"),
+    )
+    
+    plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False)
+    day_id = Column(Integer, ForeignKey("plan_days.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    position = Column(Integer, nullable=False)  # order within the day
+    name = Column(String(255), nullable=False)  # as generated
+    name_key = Column(String(255), nullable=False)  # lowercased, whitespace-collapsed
+    sets = Column(Integer, nullable=True)  # first number of "3" / "3-4"; null if absent
+    reps = Column(String(50), nullable=True)
+    rest = Column(String(50), nullable=True)
+    muscle = Column(String(50), nullable=True)  # lowercased catalog BodyPart; null if unmatched
+    
+    def __repr__(self):
+        return f"<PlanExercise(id={self.id}, plan_id={self.plan_id}, name='{self.name}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, JSON, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, JSON, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -6,6 +6,8 @@ from .base import BaseModel
 class WorkoutPlan(BaseModel):
     """Workout plan model"""
     __tablename__ = "workout_plans"
+    # keyset pagination of a user's plans, newest first
+    __table_args__ = (Index("ix_workout_plans_user_created", "user_id", "created_at", "id"),)
     
     # Associate with user
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -20,6 +22,10 @@ class WorkoutPlan(BaseModel):
     # AI generated content
     generated_plan = Column(JSON, nullable=True)  # AI generated detailed plan content
     generation_prompt = Column(Text, nullable=True)  # Prompt used for generation
+    generation_status = Column(String(20), nullable=True, index=True)  # pending/running/done/failed
+    generation_error = Column(Text, nullable=True)  # Last generation failure message
+    generation_owner = Column(String(100), nullable=True)  # process running the generation
+    generation_claimed_at = Column(DateTime, nullable=True)  # lease, renewed while running
     
     # Status management
     is_active = Column(Boolean, default=True, nullable=False)  # Whether it's an active plan
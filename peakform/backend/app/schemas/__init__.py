@@ -1,6 +1,26 @@
 # Import all schemas for easy access
 from .user import UserCreate, UserResponse, UserLogin, Token, TokenData
-from .workout_plan import WorkoutPlanCreate, WorkoutPlanResponse, WorkoutPlanUpdate
+from .workout_plan import (
+    WorkoutPlanCreate,
+    WorkoutPlanResponse,
+    WorkoutPlanUpdate,
+    GenerationStatusResponse,
+    WorkoutPlanSummary,
+    WorkoutPlanListResponse,
+)
+from .exercise import (
+    ExerciseSuggestResponse,
+    ExerciseHit,
+    FacetBucket,
+    ExerciseSearchResponse,
+)
+from .plan_structure import (
+    PlanMatch,
+    ExerciseUsageResponse,
+    MuscleDaysResponse,
+    MuscleSets,
+    MuscleSetsResponse,
+)
 
 __all__ = [
     "UserCreate",
@@ -11,4 +31,16 @@ __all__ = [
     "WorkoutPlanCreate",
     "WorkoutPlanResponse",
     "WorkoutPlanUpdate",
+    "GenerationStatusResponse",
+    "WorkoutPlanSummary",
+    "WorkoutPlanListResponse",
+    "ExerciseSuggestResponse",
+    "ExerciseHit",
+    "FacetBucket",
+    "ExerciseSearchResponse",
+    "PlanMatch",
+    "ExerciseUsageResponse",
+    "MuscleDaysResponse",
+    "MuscleSets",
+    "MuscleSetsResponse",
 ]
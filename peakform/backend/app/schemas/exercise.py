@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+
+
+class ExerciseSuggestResponse(BaseModel):
+    """Typeahead suggestions for a typed prefix, grouped by field"""
+
+    query: str
+    names: List[str] = Field(default_factory=list, description="Matching exercise names")
+    muscles: List[str] = Field(default_factory=list, description="Matching muscle groups")
+    equipment: List[str] = Field(default_factory=list, description="Matching equipment")
+
+
+class ExerciseHit(BaseModel):
+    """Exercise fields shown in search results"""
+
+    id: Optional[str] = None
+    name: Optional[str] = None
+    muscles: List[str] = Field(default_factory=list)
+    equipment: List[str] = Field(default_factory=list)
+    difficulty: Optional[str] = None
+    snippet: Optional[str] = None
+
+    @field_validator("muscles", "equipment", mode="before")
+    @classmethod
+    def as_list(cls, v):
+        if v is None:
+            return []
+        return v if isinstance(v, list) else [v]
+
+
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+
+
+class ExerciseSearchResponse(BaseModel):
+    """One page of exercise search results"""
+
+    query: str
+    total: Optional[int] = Field(None, description="Total matches (first page only)")
+    results: List[ExerciseHit]
+    facets: Optional[Dict[str, List[FacetBucket]]] = Field(
+        None, description="Counts per muscles/equipment/difficulty/tags value (first page only)"
+    )
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor= for the next page")
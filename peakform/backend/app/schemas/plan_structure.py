@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class PlanMatch(BaseModel):
+    """A plan matched by a structure query"""
+
+    plan_id: int
+    name: Optional[str] = None
+    created_at: datetime
+    days: int  # matching days in the plan
+    sets: Optional[int] = None  # total sets of the matching exercises
+
+
+class ExerciseUsageResponse(BaseModel):
+    """Plans of the current user that use an exercise"""
+
+    exercise: str
+    plans: List[PlanMatch]
+
+
+class MuscleDaysResponse(BaseModel):
+    """Plans with at least min_days days training a muscle (or group)"""
+
+    muscle: str
+    muscles: List[str]  # catalog muscles the query expanded to
+    min_days: int
+    plans: List[PlanMatch]
+
+
+class MuscleSets(BaseModel):
+    """Weekly sets for one muscle; muscle is null for unmatched exercises"""
+
+    muscle: Optional[str] = None
+    sets: int
+    exercises: int
+
+
+class MuscleSetsResponse(BaseModel):
+    """Weekly sets per muscle of one plan"""
+
+    plan_id: int
+    muscles: List[MuscleSets]
@@ -43,6 +43,30 @@ class WorkoutPlanResponse(WorkoutPlanBase):
     user_id: int
     generated_plan: Optional[Dict[str, Any]] = None
     generation_prompt: Optional[str] = None
+    generation_status: Optional[str] = None
+    is_active: bool
+    is_favorite: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class GenerationStatusResponse(BaseModel):
+    """Schema for background generation job status"""
+
+    plan_id: int
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class WorkoutPlanSummary(WorkoutPlanBase):
+    """Workout plan without the generated plan and prompt (for listings)"""
+
+    id: int
+    user_id: int
+    generation_status: Optional[str] = None
     is_active: bool
     is_favorite: bool
     created_at: datetime
@@ -53,9 +77,10 @@ class WorkoutPlanResponse(WorkoutPlanBase):
 
 
 class WorkoutPlanListResponse(BaseModel):
-    """Schema for workout plan list response"""
+    """Schema for workout plan list response (keyset-paginated, newest first)"""
 
-    plans: list[WorkoutPlanResponse]
-    total: int
-    page: int
+    plans: list[WorkoutPlanSummary]
+    # counted on the first page only
+    total: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,31 @@
+# Shared service helpers used by the API routers
+from .http_clients import (
+    create_es_client,
+    create_gemini_client,
+    get_es_client,
+    get_gemini_client,
+)
+from .exercise_search import search_exercises, retrieve_exercises, retrieval_stats
+from .gemini import GeminiError, generate_plan_json
+from .generation_cache import (
+    generation_cache_key,
+    get_cached_plan,
+    store_cached_plan,
+    generation_cache_stats,
+)
+
+__all__ = [
+    "create_es_client",
+    "create_gemini_client",
+    "get_es_client",
+    "get_gemini_client",
+    "search_exercises",
+    "retrieve_exercises",
+    "retrieval_stats",
+    "GeminiError",
+    "generate_plan_json",
+    "generation_cache_key",
+    "get_cached_plan",
+    "store_cached_plan",
+    "generation_cache_stats",
+]
@@ -0,0 +1,183 @@
+"""
+In-process BM25 exercise search used as a fallback (or replacement) for
+Elasticsearch. Built from the exercise CSV at startup.
+
+Each field has its own CSR-style inverted index: a term's postings are
+``doc_ids[indptr[t]:indptr[t + 1]]`` with matching term frequencies, so a
+query term is scored with a few vectorized NumPy operations. Fields are
+combined like ES ``multi_match`` ``best_fields``: the best boosted field
+score per document.
+"""
+import csv
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Same field boosts as the Elasticsearch multi_match query
+FIELD_BOOSTS: Dict[str, float] = {"name": 3.0, "muscles": 2.0, "snippet": 1.0, "description": 1.0}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [p.strip() for p in (value or "").split(",") if p.strip()]
+
+
+def row_to_exercise(row: Dict[str, str]) -> Dict[str, Any]:
+    """Map a megaGymDataset.csv row onto the ES document fields"""
+    description = row.get("Desc") or row.get("description") or ""
+    return {
+        "id": row.get("") or row.get("id"),
+        "name": row.get("Title") or row.get("name") or "",
+        "description": description,
+        "snippet": description[0:200],
+        "muscles": _split_list(row.get("BodyPart") or row.get("muscles")),
+        "equipment": _split_list(row.get("Equipment") or row.get("equipment")),
+        "difficulty": row.get("Level") or row.get("difficulty") or "",
+        "tags": _split_list(row.get("Type") or row.get("tags")),
+    }
+
+
+class _FieldIndex:
+    """Inverted index for one field with NumPy postings"""
+
+    __slots__ = ("vocab", "indptr", "doc_ids", "tfs", "doc_len", "avgdl", "idf")
+
+    def __init__(self, docs_tokens: Sequence[List[str]]):
+        n_docs = len(docs_tokens)
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_len = np.zeros(n_docs, dtype=np.float32)
+        for doc_id, tokens in enumerate(docs_tokens):
+            doc_len[doc_id] = len(tokens)
+            for tok in tokens:
+                bucket = postings.setdefault(tok, {})
+                bucket[doc_id] = bucket.get(doc_id, 0) + 1
+
+        self.vocab: Dict[str, int] = {}
+        indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        total = sum(len(b) for b in postings.values())
+        doc_ids = np.empty(total, dtype=np.int32)
+        tfs = np.empty(total, dtype=np.float32)
+        pos = 0
+        for term_id, (term, bucket) in enumerate(postings.items()):
+            self.vocab[term] = term_id
+            n = len(bucket)
+            doc_ids[pos:pos + n] = np.fromiter(bucket.keys(), dtype=np.int32, count=n)
+            tfs[pos:pos + n] = np.fromiter(bucket.values(), dtype=np.float32, count=n)
+            pos += n
+            indptr[term_id + 1] = pos
+
+        df = np.diff(indptr).astype(np.float32)
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.avgdl = float(doc_len.mean()) if n_docs and doc_len.any() else 1.0
+        # Lucene BM25 idf
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def score(self, terms: Sequence[str], n_docs: int, k1: float, b: float) -> np.ndarray:
+        scores = np.zeros(n_docs, dtype=np.float32)
+        norm = k1 * (1.0 - b + b * self.doc_len / self.avgdl)
+        for term in terms:
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            # doc ids are unique within a posting list, so fancy-index += is safe
+            scores[docs] += self.idf[term_id] * tf * (k1 + 1.0) / (tf + norm[docs])
+        return scores
+
+
+class BM25Index:
+    """Multi-field BM25 index over exercise documents"""
+
+    def __init__(
+        self,
+        docs: List[Dict[str, Any]],
+        field_boosts: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.docs = docs
+        self.field_boosts = field_boosts or FIELD_BOOSTS
+        self.k1 = k1
+        self.b = b
+        self.fields: Dict[str, _FieldIndex] = {}
+        for field in self.field_boosts:
+            tokens = []
+            for doc in docs:
+                value = doc.get(field) or ""
+                if isinstance(value, list):
+                    value = " ".join(value)
+                tokens.append(tokenize(value))
+            self.fields[field] = _FieldIndex(tokens)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> "BM25Index":
+        with open(path, newline="", encoding="utf-8") as f:
+            docs = [row_to_exercise(row) for row in csv.DictReader(f)]
+        return cls(docs, **kwargs)
+
+    def search_ids(self, query: str, size: int = 8) -> List[Tuple[int, float]]:
+        """Top-k (doc index, score) pairs, best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.docs:
+            return []
+        n_docs = len(self.docs)
+        best = np.zeros(n_docs, dtype=np.float32)
+        for field, boost in self.field_boosts.items():
+            np.maximum(best, boost * self.fields[field].score(terms, n_docs, self.k1, self.b), out=best)
+        matched = int(np.count_nonzero(best))
+        if matched == 0:
+            return []
+        k = min(size, matched)
+        top = np.argpartition(-best, k - 1)[:k]
+        top = top[np.argsort(-best[top], kind="stable")]
+        return [(int(i), float(best[i])) for i in top]
+
+    def search(self, query: str, size: int = 8, source: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Top-k documents, optionally projected onto ``source`` fields"""
+        hits = []
+        for idx, _score in self.search_ids(query, size):
+            doc = self.docs[idx]
+            hits.append({k: doc.get(k) for k in source} if source else dict(doc))
+        return hits
+
+
+_local_index: Optional[BM25Index] = None
+
+
+def load_local_index(path: str) -> Optional[BM25Index]:
+    """Build the process-wide index from the CSV (no-op if the file is missing)"""
+    global _local_index
+    if not path or not Path(path).is_file():
+        logger.info("Exercise dataset not found at %r; local search disabled", path)
+        return None
+    start = time.perf_counter()
+    _local_index = BM25Index.from_csv(path)
+    logger.info(
+        "Local BM25 exercise index: %d docs in %.0f ms",
+        len(_local_index),
+        (time.perf_counter() - start) * 1000,
+    )
+    return _local_index
+
+
+def get_local_index() -> Optional[BM25Index]:
+    return _local_index
@@ -0,0 +1,280 @@
+"""
+Local dense (LSA) retrieval over the exercise dataset.
+
+Exercise text (title, description, muscles, equipment, type) is embedded by
+TF-IDF followed by a randomized truncated SVD, all in NumPy. Exercises that
+share no words with a query can still rank when their words co-occur with
+the query's words elsewhere in the catalog. Query-time search projects the
+query's TF-IDF weights through the SVD components and takes a top-k over
+``embeddings @ query``.
+
+The index is built offline into a directory and loaded with the embeddings
+memory-mapped:
+
+    python -m app.services.dense_index --out ../db/dense_index
+
+    embeddings.npy   docs x dims float32, rows L2-normalized
+    components.npy   vocab x dims float32 (term -> latent projection)
+    meta.json        vocab, idf, dims and the dataset's sha1
+
+When the directory is missing or was built from a different dataset, the
+index is built in memory at startup instead.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bm25_index import BM25Index, get_local_index, load_local_index, tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIMS = 128
+MIN_DF = 2
+# name words count double; lists are space-joined
+TEXT_FIELDS: Dict[str, int] = {"name": 2, "description": 1, "muscles": 1, "equipment": 1, "tags": 1}
+STOPWORDS = frozenset(
+    """a an and are as at be but by for from has have if in into is it its of on or so
+    than that the their then there these this to up was were while will with you your""".split()
+)
+
+
+def dataset_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS and len(t) > 1]
+
+
+def doc_terms(doc: Dict[str, Any]) -> List[str]:
+    terms: List[str] = []
+    for field, weight in TEXT_FIELDS.items():
+        value = doc.get(field) or ""
+        if isinstance(value, list):
+            value = " ".join(value)
+        terms += _terms(value) * weight
+    return terms
+
+
+def _tfidf_weights(counts: Counter, vocab: Dict[str, int], idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(term ids, L2-normalized sublinear tf-idf weights) for one bag of words"""
+    ids = np.fromiter((vocab[t] for t in counts if t in vocab), dtype=np.int64)
+    if not len(ids):
+        return ids, np.zeros(0, dtype=np.float32)
+    tf = np.fromiter((c for t, c in counts.items() if t in vocab), dtype=np.float32)
+    w = (1.0 + np.log(tf)) * idf[ids]
+    return ids, w / np.linalg.norm(w)
+
+
+def _csr_dot(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """CSR matrix @ dense matrix"""
+    out = np.zeros((len(indptr) - 1, m.shape[1]), dtype=m.dtype)
+    rows = np.flatnonzero(np.diff(indptr))
+    if len(rows):
+        out[rows] = np.add.reduceat(data[:, None] * m[indices], indptr[rows])
+    return out
+
+
+def _csr_transpose(indptr, indices, data, n_cols):
+    order = np.argsort(indices, kind="stable")
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    t_indptr = np.zeros(n_cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_cols), out=t_indptr[1:])
+    return t_indptr, rows[order], data[order]
+
+
+def randomized_svd(csr, n_cols: int, k: int, oversample: int = 10, n_iter: int = 4, seed: int = 0):
+    """Top-k (U * S, Vt) of a sparse matrix (Halko et al. range finder)"""
+    indptr, indices, data = csr
+    t_csr = _csr_transpose(indptr, indices, data, n_cols)
+    rng = np.random.default_rng(seed)
+    width = min(k + oversample, n_cols, len(indptr) - 1)
+    q, _ = np.linalg.qr(_csr_dot(*csr, rng.standard_normal((n_cols, width))))
+    for _ in range(n_iter):
+        z, _ = np.linalg.qr(_csr_dot(*t_csr, q))
+        q, _ = np.linalg.qr(_csr_dot(*csr, z))
+    # B = Q^T X, computed as (X^T Q)^T
+    u_b, s, vt = np.linalg.svd(_csr_dot(*t_csr, q).T, full_matrices=False)
+    k = min(k, len(s))
+    return (q @ u_b[:, :k]) * s[:k], vt[:k]
+
+
+class DenseIndex:
+    """Memory-mappable LSA embeddings with vectorized top-k cosine search"""
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        components: np.ndarray,
+        vocab: Sequence[str],
+        idf: np.ndarray,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        self.embeddings = embeddings
+        self.components = components
+        self.vocab: Dict[str, int] = {t: i for i, t in enumerate(vocab)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.meta = meta or {}
+
+    def __len__(self) -> int:
+        return self.embeddings.shape[0]
+
+    @classmethod
+    def build(cls, docs: List[Dict[str, Any]], dims: int = DEFAULT_DIMS, seed: int = 0) -> "DenseIndex":
+        bags = [Counter(doc_terms(doc)) for doc in docs]
+        df = Counter(t for bag in bags for t in bag)
+        vocab = sorted(t for t, n in df.items() if n >= MIN_DF)
+        term_ids = {t: i for i, t in enumerate(vocab)}
+        n_docs = len(docs)
+        idf = np.array([math.log((1 + n_docs) / (1 + df[t])) + 1.0 for t in vocab], dtype=np.float32)
+
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        indices, data = [], []
+        for i, bag in enumerate(bags):
+            ids, w = _tfidf_weights(bag, term_ids, idf)
+            indices.append(ids)
+            data.append(w)
+            indptr[i + 1] = indptr[i] + len(ids)
+        csr = (indptr, np.concatenate(indices), np.concatenate(data).astype(np.float64))
+
+        doc_vecs, vt = randomized_svd(csr, len(vocab), dims, seed=seed)
+        norms = np.linalg.norm(doc_vecs, axis=1, keepdims=True)
+        embeddings = (doc_vecs / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+        meta = {"docs": n_docs, "dims": int(vt.shape[0]), "vocab_size": len(vocab), "built_at": time.time()}
+        return cls(embeddings, vt.T.astype(np.float32), vocab, idf, meta)
+
+    def save(self, directory: str) -> None:
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+        np.save(out / "embeddings.npy", self.embeddings)
+        np.save(out / "components.npy", self.components)
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        meta = {**self.meta, "vocab": vocab, "idf": [round(float(x), 6) for x in self.idf]}
+        (out / "meta.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, directory: str) -> "DenseIndex":
+        src = Path(directory)
+        meta = json.loads((src / "meta.json").read_text())
+        vocab, idf = meta.pop("vocab"), meta.pop("idf")
+        embeddings = np.load(src / "embeddings.npy", mmap_mode="r")
+        components = np.load(src / "components.npy", mmap_mode="r")
+        return cls(embeddings, components, vocab, np.array(idf, dtype=np.float32), meta)
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Unit query vector, or None when no query term is in the vocabulary"""
+        ids, w = _tfidf_weights(Counter(_terms(text)), self.vocab, self.idf)
+        if not len(ids):
+            return None
+        vec = w @ self.components[ids]
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else None
+
+    def search_ids(self, query: str, size: int = 8) -> List[Tuple[int, float]]:
+        """Top-k (doc index, cosine) pairs, best first"""
+        vec = self.embed(query)
+        if vec is None or not len(self):
+            return []
+        scores = self.embeddings @ vec
+        k = min(size, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+_dense: Dict[str, Any] = {"index": None, "source": None, "loaded_from": None}
+
+
+def load_dense_index(directory: str, dataset_path: str) -> Optional[DenseIndex]:
+    """Load the prebuilt index for the local dataset, else build it in memory
+
+    Must run after load_local_index: rows line up with its documents.
+    """
+    local: Optional[BM25Index] = get_local_index()
+    if local is None:
+        logger.info("Local exercise index not loaded; dense retrieval disabled")
+        return None
+    start = time.perf_counter()
+    index = None
+    sha1 = dataset_sha1(dataset_path)
+    if directory and (Path(directory) / "meta.json").is_file():
+        try:
+            candidate = DenseIndex.load(directory)
+            if candidate.meta.get("dataset_sha1") == sha1 and len(candidate) == len(local):
+                index, loaded_from = candidate, directory
+            else:
+                logger.warning("Dense index at %s was built from another dataset; rebuilding in memory", directory)
+        except Exception as e:
+            logger.warning("Could not load dense index from %s: %s", directory, str(e))
+    if index is None:
+        index = DenseIndex.build(local.docs)
+        index.meta["dataset_sha1"] = sha1
+        loaded_from = "memory"
+    _dense.update(index=index, source=local, loaded_from=loaded_from)
+    logger.info(
+        "Dense exercise index (%s): %d docs x %d dims in %.0f ms",
+        loaded_from,
+        len(index),
+        index.embeddings.shape[1],
+        (time.perf_counter() - start) * 1000,
+    )
+    return index
+
+
+def get_dense_index() -> Optional[DenseIndex]:
+    """The loaded index, if it still matches the local BM25 documents"""
+    if _dense["index"] is None or _dense["source"] is not get_local_index():
+        return None
+    return _dense["index"]
+
+
+def dense_index_stats() -> Optional[Dict[str, Any]]:
+    index = get_dense_index()
+    if index is None:
+        return None
+    return {
+        "docs": len(index),
+        "dims": int(index.embeddings.shape[1]),
+        "vocab": len(index.vocab),
+        "loaded_from": _dense["loaded_from"],
+        "memory_mapped": isinstance(index.embeddings, np.memmap),
+    }
+
+
+def main(argv=None):
+    from app.config import DENSE_INDEX_DIR, EXERCISE_DATASET_PATH
+
+    p = argparse.ArgumentParser(description="Build the dense exercise retrieval index")
+    p.add_argument("--dataset", default=EXERCISE_DATASET_PATH)
+    p.add_argument("--out", default=DENSE_INDEX_DIR)
+    p.add_argument("--dims", type=int, default=DEFAULT_DIMS)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    local = load_local_index(args.dataset)
+    if local is None:
+        raise SystemExit(f"Dataset not found: {args.dataset}")
+    start = time.perf_counter()
+    index = DenseIndex.build(local.docs, dims=args.dims, seed=args.seed)
+    index.meta["dataset_sha1"] = dataset_sha1(args.dataset)
+    index.save(args.out)
+    print(
+        f"Wrote {args.out}: {len(index)} docs x {index.meta['dims']} dims, "
+        f"{index.meta['vocab_size']} terms in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
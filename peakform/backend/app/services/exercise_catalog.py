@@ -0,0 +1,340 @@
+"""
+Public exercise search: free text plus keyword filters, facet counts and
+search_after cursor pagination.
+
+Uses the Elasticsearch index when available (through the shared client and
+circuit breaker) and the local exercise dataset otherwise. Pages are
+addressed by the sort values of the last hit, never by offset, so page 100
+costs the same as page 1. Facet counts are computed on the first page only.
+"""
+import base64
+import bisect
+import hashlib
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from app.config import ES_URL, ES_INDEX, RETRIEVAL_BACKEND
+from .bm25_index import BM25Index, get_local_index
+from .exercise_search import SearchRejected, es_breaker
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ("muscles", "equipment", "difficulty", "tags")
+# fields the exercise browser renders; everything else stays in the index
+RESULT_FIELDS = ["id", "name", "muscles", "equipment", "difficulty", "snippet"]
+FACET_SIZE = 30
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or belongs to a different query"""
+
+
+class CatalogUnavailable(RuntimeError):
+    """No backend can continue this cursor"""
+
+
+def _fingerprint(q: str, filters: Dict[str, List[str]]) -> str:
+    canonical = json.dumps([q, {k: sorted(v) for k, v in sorted(filters.items()) if v}])
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+def encode_cursor(backend: str, fingerprint: str, after: Sequence[Any]) -> str:
+    raw = json.dumps([backend, fingerprint, list(after)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _valid_after(backend: str, scored: bool, after: Any) -> bool:
+    """search_after values shaped like the sort the backend used: [score or name, id]"""
+    if not isinstance(after, list) or len(after) != 2 or not isinstance(after[1], str):
+        return False
+    first = after[0]
+    if scored:
+        return isinstance(first, (int, float)) and not isinstance(first, bool) and math.isfinite(first)
+    # ES reports a missing name.keyword as null
+    return isinstance(first, str) or (backend == "es" and first is None)
+
+
+def decode_cursor(cursor: str, fingerprint: str, scored: bool) -> Tuple[str, List[Any]]:
+    """(backend, search_after values) for a cursor issued for this query
+
+    ``scored`` is whether the query has text (sorted by score, not name).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        backend, fp, after = json.loads(raw)
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if fp != fingerprint:
+        raise InvalidCursor("Cursor does not match this query")
+    if backend not in ("es", "local") or not _valid_after(backend, scored, after):
+        raise InvalidCursor("Malformed cursor")
+    return backend, after
+
+
+def _hit(src: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: src.get(k) for k in RESULT_FIELDS}
+
+
+# --- Elasticsearch ---------------------------------------------------------
+
+
+def _es_filter(field: str, values: List[str]) -> Dict[str, Any]:
+    return {"terms": {field: values}}
+
+
+def build_es_query(
+    q: str, filters: Dict[str, List[str]], size: int, after: Optional[List[Any]]
+) -> Dict[str, Any]:
+    """Request body: filters in post_filter so each facet ignores its own filter"""
+    active = {f: v for f, v in filters.items() if v}
+    query = (
+        {"multi_match": {"query": q, "fields": ["name^3", "muscles^2", "snippet", "description"]}}
+        if q
+        else {"match_all": {}}
+    )
+    sort = (
+        [{"_score": "desc"}, {"id": "asc"}]
+        if q
+        else [{"name.keyword": "asc"}, {"id": "asc"}]
+    )
+    body: Dict[str, Any] = {
+        "size": size,
+        "query": query,
+        "sort": sort,
+        "_source": RESULT_FIELDS,
+        # exact totals only for the first page
+        "track_total_hits": after is None,
+    }
+    if active:
+        body["post_filter"] = {"bool": {"filter": [_es_filter(f, v) for f, v in active.items()]}}
+    if after is not None:
+        body["search_after"] = after
+    else:
+        aggs = {}
+        for field in FACET_FIELDS:
+            others = [_es_filter(f, v) for f, v in active.items() if f != field]
+            aggs[field] = {
+                "filter": {"bool": {"filter": others}} if others else {"match_all": {}},
+                "aggs": {"values": {"terms": {"field": field, "size": FACET_SIZE}}},
+            }
+        body["aggs"] = aggs
+    return body
+
+
+async def _search_elasticsearch(
+    client: httpx.AsyncClient, q: str, filters: Dict[str, List[str]], size: int, after: Optional[List[Any]]
+) -> Dict[str, Any]:
+    body = build_es_query(q, filters, size, after)
+    resp = await client.post(f"{ES_URL.rstrip('/')}/{ES_INDEX}/_search", json=body)
+    if 400 <= resp.status_code < 500:
+        raise SearchRejected(f"Elasticsearch returned {resp.status_code}")
+    if resp.status_code != 200:
+        raise RuntimeError(f"Elasticsearch returned {resp.status_code}")
+    data = resp.json()
+    hits = data.get("hits", {}).get("hits", [])
+    facets = None
+    if after is None:
+        aggs = data.get("aggregations", {})
+        facets = {
+            field: [
+                {"value": str(b["key"]), "count": b["doc_count"]}
+                for b in aggs.get(field, {}).get("values", {}).get("buckets", [])
+            ]
+            for field in FACET_FIELDS
+        }
+    total = data.get("hits", {}).get("total")
+    return {
+        "results": [_hit(h.get("_source", {})) for h in hits],
+        "total": total.get("value") if isinstance(total, dict) and after is None else None,
+        "facets": facets,
+        "after": hits[-1].get("sort") if len(hits) == size else None,
+    }
+
+
+# --- local dataset ---------------------------------------------------------
+
+
+class LocalCatalog:
+    """Filter/sort/facet over the in-process exercise documents
+
+    Facet values are one-hot NumPy matrices (docs x values), so filters are
+    boolean masks and facet counts are column sums.
+    """
+
+    def __init__(self, index: BM25Index):
+        self.index = index
+        self.docs = index.docs
+        self.facet_values: Dict[str, List[str]] = {}
+        self.value_cols: Dict[str, Dict[str, int]] = {}
+        self.matrix: Dict[str, np.ndarray] = {}
+        for field in FACET_FIELDS:
+            per_doc = [self._values(doc, field) for doc in self.docs]
+            names = sorted({v for vals in per_doc for v in vals})
+            cols = {v: j for j, v in enumerate(names)}
+            m = np.zeros((len(self.docs), len(names)), dtype=bool)
+            for i, vals in enumerate(per_doc):
+                m[i, [cols[v] for v in vals]] = True
+            self.facet_values[field] = names
+            self.value_cols[field] = cols
+            self.matrix[field] = m
+        # browse order (no query): (name, id), like name.keyword + id in ES
+        self.keys = sorted(
+            ((doc.get("name") or "", str(doc.get("id"))), i) for i, doc in enumerate(self.docs)
+        )
+        self.sort_keys = [k for k, _ in self.keys]
+
+    @staticmethod
+    def _values(doc: Dict[str, Any], field: str) -> List[str]:
+        value = doc.get(field)
+        if isinstance(value, list):
+            return [str(v) for v in value]
+        return [str(value)] if value else []
+
+    def _mask(self, field: str, values: List[str]) -> np.ndarray:
+        """Docs having any of the values"""
+        cols = [self.value_cols[field][v] for v in values if v in self.value_cols[field]]
+        if not cols:
+            return np.zeros(len(self.docs), dtype=bool)
+        return self.matrix[field][:, cols].any(axis=1)
+
+    def search(
+        self, q: str, filters: Dict[str, List[str]], size: int, after: Optional[List[Any]]
+    ) -> Dict[str, Any]:
+        n_docs = len(self.docs)
+        masks = {f: self._mask(f, v) for f, v in filters.items() if v}
+        allowed = np.ones(n_docs, dtype=bool)
+        for m in masks.values():
+            allowed &= m
+
+        if q:
+            # (-score, id) ascending == score desc, id asc
+            scored = sorted(
+                (-score, str(self.docs[i].get("id")), i)
+                for i, score in self.index.search_ids(q, n_docs)
+            )
+            start = 0
+            if after is not None:
+                start = bisect.bisect_right(
+                    [(neg, d) for neg, d, _ in scored], (-float(after[0]), str(after[1]))
+                )
+            candidates = ((i, [-neg, doc_id]) for neg, doc_id, i in scored[start:])
+            matched = np.zeros(n_docs, dtype=bool)
+            matched[[i for _, _, i in scored]] = True
+        else:
+            start = 0
+            if after is not None:
+                start = bisect.bisect_right(self.sort_keys, (str(after[0]), str(after[1])))
+            candidates = ((i, list(key)) for key, i in self.keys[start:])
+            matched = np.ones(n_docs, dtype=bool)
+
+        results: List[Tuple[List[Any], int]] = []
+        for i, sort in candidates:
+            if allowed[i]:
+                results.append((sort, i))
+                if len(results) >= size:
+                    break
+
+        facets = total = None
+        if after is None:
+            facets = {}
+            for field in FACET_FIELDS:
+                # each facet counts under every filter except its own
+                base = matched.copy()
+                for f, m in masks.items():
+                    if f != field:
+                        base &= m
+                counts = self.matrix[field][base].sum(axis=0)
+                order = sorted(
+                    (j for j in np.flatnonzero(counts)),
+                    key=lambda j: (-counts[j], self.facet_values[field][j]),
+                )[:FACET_SIZE]
+                facets[field] = [
+                    {"value": self.facet_values[field][j], "count": int(counts[j])} for j in order
+                ]
+            total = int(np.count_nonzero(matched & allowed))
+        return {
+            "results": [_hit(self.docs[i]) for _, i in results],
+            "total": total,
+            "facets": facets,
+            "after": results[-1][0] if len(results) == size else None,
+        }
+
+
+_local_catalog: Dict[str, Any] = {"source": None, "catalog": None}
+
+
+def _get_local_catalog() -> Optional[LocalCatalog]:
+    local = get_local_index()
+    if local is None:
+        return None
+    if _local_catalog["source"] is not local:
+        _local_catalog["catalog"] = LocalCatalog(local)
+        _local_catalog["source"] = local
+    return _local_catalog["catalog"]
+
+
+def _search_local(q: str, filters: Dict[str, List[str]], size: int, after: Optional[List[Any]]) -> Dict[str, Any]:
+    catalog = _get_local_catalog()
+    if catalog is None:
+        return {"results": [], "total": 0 if after is None else None, "facets": None, "after": None}
+    return catalog.search(q, filters, size, after)
+
+
+# --- entry point -----------------------------------------------------------
+
+
+async def search_catalog(
+    client: httpx.AsyncClient,
+    q: Optional[str],
+    filters: Dict[str, List[str]],
+    size: int = 20,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One page of exercise search results with an opaque next_cursor
+
+    Raises InvalidCursor for a cursor from another query, and
+    CatalogUnavailable when an Elasticsearch cursor can't be continued.
+    """
+    q = " ".join((q or "").split())
+    fingerprint = _fingerprint(q, filters)
+    backend, after = decode_cursor(cursor, fingerprint, bool(q)) if cursor else (None, None)
+
+    page = None
+    admitted = RETRIEVAL_BACKEND != "local" and backend in (None, "es") and es_breaker.allow_request()
+    if admitted:
+        try:
+            page = await _search_elasticsearch(client, q, filters, size, after)
+            es_breaker.record_success()
+            backend = "es"
+        except SearchRejected as e:
+            # request-specific (e.g. a crafted cursor): don't count it against
+            # the shared breaker that plan generation relies on
+            logger.warning("Elasticsearch rejected exercise search: %s", e)
+            if backend == "es":
+                raise InvalidCursor("Cursor rejected by the search backend")
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            es_breaker.record_failure(error[:200])
+            logger.warning("Elasticsearch exercise search failed: %s", error)
+        finally:
+            es_breaker.release_trial(admitted)
+    if page is None:
+        if backend == "es":
+            # ES sort values (content-hash ids) don't map onto the local order
+            raise CatalogUnavailable("Search backend unavailable; restart the search")
+        page = _search_local(q, filters, size, after)
+        backend = "local"
+
+    next_cursor = encode_cursor(backend, fingerprint, page["after"]) if page["after"] else None
+    return {
+        "query": q,
+        "total": page["total"],
+        "results": page["results"],
+        "facets": page["facets"],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,269 @@
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import (
+    ES_URL,
+    ES_INDEX,
+    RETRIEVAL_CACHE_SIZE,
+    RETRIEVAL_CACHE_TTL_SECONDS,
+    RETRIEVAL_VERSION_CHECK_SECONDS,
+    RETRIEVAL_BACKEND,
+    RETRIEVAL_MODE,
+    ES_BREAKER_FAILURE_THRESHOLD,
+    ES_BREAKER_COOLDOWN_SECONDS,
+)
+from app.utils.cache import TTLCache
+from app.utils.circuit_breaker import CircuitBreaker, CLOSED
+from .bm25_index import get_local_index
+from .dense_index import dense_index_stats, get_dense_index
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[\w'-]+")
+
+# normalized query -> exercise examples
+_retrieval_cache = TTLCache(maxsize=RETRIEVAL_CACHE_SIZE, ttl=RETRIEVAL_CACHE_TTL_SECONDS)
+_retrieval_latencies_ms: "deque[float]" = deque(maxlen=1000)
+# concrete index name + _meta.ingest_version written by tools/ingest_es.py
+_index_version: Dict[str, Any] = {"value": None, "checked_at": 0.0}
+
+es_breaker = CircuitBreaker(
+    "elasticsearch",
+    failure_threshold=ES_BREAKER_FAILURE_THRESHOLD,
+    cooldown=ES_BREAKER_COOLDOWN_SECONDS,
+)
+
+ES_SEARCH_FIELDS = ["name^3", "muscles^2", "snippet", "description"]
+ES_SOURCE_FIELDS = ["id", "name", "muscles", "equipment", "snippet"]
+# reciprocal rank fusion constant (score = sum of 1 / (RRF_K + rank))
+RRF_K = 60
+# local fallback answers are cached briefly so ES is retried soon
+FALLBACK_CACHE_TTL_SECONDS = 10.0
+
+
+class SearchRejected(RuntimeError):
+    """Elasticsearch answered 4xx: a bad request, not an unhealthy cluster"""
+
+
+def normalize_query(muscle_groups: Optional[str], constraints: Optional[str], experience: str) -> str:
+    """Free-text query from muscle_groups + constraints: lowercased, deduped, sorted
+
+    The plan name is ignored so equivalent requests share one cache entry.
+    """
+    text = " ".join(p for p in (muscle_groups, constraints) if p).lower()
+    tokens = sorted(set(_TOKEN_RE.findall(text)))
+    return " ".join(tokens) or experience.lower()
+
+
+def _example(src: Dict[str, Any]) -> Dict[str, Any]:
+    # keep only a few fields and safe types
+    return {
+        "name": src.get("name"),
+        "muscles": src.get("muscles"),
+        "equipment": src.get("equipment"),
+        "snippet": src.get("snippet"),
+    }
+
+
+async def _search_elasticsearch(
+    client: httpx.AsyncClient, query_text: str, size: int
+) -> List[Dict[str, Any]]:
+    """Run the multi_match query; raises when ES is unreachable or errors"""
+    es_url = f"{ES_URL.rstrip('/')}/{ES_INDEX}/_search"
+    es_body = {
+        "size": size,
+        "query": {
+            "multi_match": {
+                "query": query_text,
+                "fields": ES_SEARCH_FIELDS,
+            }
+        },
+        "_source": ES_SOURCE_FIELDS,
+    }
+    resp = await client.post(es_url, json=es_body)
+    if 400 <= resp.status_code < 500:
+        raise SearchRejected(f"Elasticsearch returned {resp.status_code}")
+    if resp.status_code != 200:
+        raise RuntimeError(f"Elasticsearch returned {resp.status_code}")
+    hits = resp.json().get("hits", {}).get("hits", [])
+    return [_example(h.get("_source", {})) for h in hits]
+
+
+def _search_local(query_text: str, size: int) -> List[Dict[str, Any]]:
+    """Query the in-process BM25 index (empty if it is not loaded)"""
+    index = get_local_index()
+    if index is None:
+        return []
+    return [_example(doc) for doc in index.search(query_text, size)]
+
+
+async def _search_keyword(
+    client: httpx.AsyncClient, query_text: str, size: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Elasticsearch, falling back to the local BM25 index when ES fails
+
+    Only the local index when RETRIEVAL_BACKEND is "local". Returns the
+    examples and whether they came from the fallback.
+    """
+    if RETRIEVAL_BACKEND == "local":
+        return _search_local(query_text, size), False
+    admitted = es_breaker.allow_request()
+    if admitted:
+        try:
+            es_examples = await _search_elasticsearch(client, query_text, size)
+            es_breaker.record_success()
+            return es_examples, False
+        except SearchRejected as e:
+            # this query's fault, not the cluster's: fall back without
+            # counting it against the breaker
+            logger.warning("Elasticsearch rejected retrieval query: %s", e)
+        except Exception as e:
+            # best-effort: if ES is unreachable or fails, use the local index
+            error = str(e) or type(e).__name__
+            es_breaker.record_failure(error[:200])
+            logger.warning("Elasticsearch retrieval failed: %s", error)
+        finally:
+            # a cancelled trial must not leave the breaker half-open
+            es_breaker.release_trial(admitted)
+    es_examples = _search_local(query_text, size)
+    if es_examples:
+        logger.info("Using local exercise index fallback")
+    return es_examples, True
+
+
+def _search_dense(query_text: str, size: int) -> List[Dict[str, Any]]:
+    """Query the local dense index (empty if it is not loaded)"""
+    index = get_dense_index()
+    if index is None:
+        return []
+    docs = get_local_index().docs
+    return [_example(docs[i]) for i, _score in index.search_ids(query_text, size)]
+
+
+def fuse_rankings(rankings: List[List[Dict[str, Any]]], size: int) -> List[Dict[str, Any]]:
+    """Reciprocal rank fusion of example lists, keyed by exercise name
+
+    ES hits and local documents don't share ids, but names match.
+    """
+    scores: Dict[str, float] = {}
+    examples: Dict[str, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, example in enumerate(ranking):
+            key = (example.get("name") or "").lower()
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+            examples.setdefault(key, example)
+    best = sorted(scores, key=lambda k: -scores[k])[:size]
+    return [examples[k] for k in best]
+
+
+async def search_exercises(
+    client: httpx.AsyncClient, query_text: str, size: int = 8, mode: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Retrieve a few relevant exercises (best-effort)
+
+    ``mode`` (default RETRIEVAL_MODE) picks the retriever: "keyword",
+    "dense" or "hybrid" (keyword and dense results fused by reciprocal
+    rank). Dense falls back to keyword when the dense index isn't loaded.
+    """
+    examples, _fallback = await _search(client, query_text, size, mode)
+    return examples
+
+
+async def _search(
+    client: httpx.AsyncClient, query_text: str, size: int, mode: Optional[str]
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """search_exercises plus whether the keyword side used the local fallback"""
+    mode = mode or RETRIEVAL_MODE
+    fallback = False
+    if mode != "keyword" and get_dense_index() is not None:
+        if mode == "dense":
+            examples = _search_dense(query_text, size)
+        else:
+            # retrieve deeper than size so fusion has candidates to agree on
+            keyword, fallback = await _search_keyword(client, query_text, size * 2)
+            examples = fuse_rankings([keyword, _search_dense(query_text, size * 2)], size)
+    else:
+        examples, fallback = await _search_keyword(client, query_text, size)
+
+    # log whether examples were used
+    if examples:
+        logger.info("Exercise examples found: %d", len(examples))
+    else:
+        logger.info("No exercise examples used for prompt generation")
+    return examples, fallback
+
+
+async def _refresh_index_version(client: httpx.AsyncClient) -> None:
+    """Clear the retrieval cache when the index is re-ingested or swapped"""
+    now = time.monotonic()
+    if now - _index_version["checked_at"] < RETRIEVAL_VERSION_CHECK_SECONDS:
+        return
+    if es_breaker.state != CLOSED:
+        return
+    _index_version["checked_at"] = now
+    try:
+        resp = await client.get(f"{ES_URL.rstrip('/')}/{ES_INDEX}/_mapping")
+        if resp.status_code != 200:
+            return
+        version = ",".join(
+            f"{name}:{(body.get('mappings') or {}).get('_meta', {}).get('ingest_version')}"
+            for name, body in sorted(resp.json().items())
+        )
+    except Exception as e:
+        logger.debug("Index version check failed: %s", str(e))
+        return
+    if _index_version["value"] is not None and version != _index_version["value"]:
+        logger.info("Exercise index changed (%s); clearing retrieval cache", version)
+        _retrieval_cache.clear()
+    _index_version["value"] = version
+
+
+async def retrieve_exercises(client: httpx.AsyncClient, data) -> List[Dict[str, Any]]:
+    """Cached exercise retrieval for a plan (WorkoutPlanCreate or WorkoutPlan row)"""
+    query_text = normalize_query(data.muscle_groups, data.constraints, data.experience)
+    if RETRIEVAL_BACKEND != "local":
+        await _refresh_index_version(client)
+    cached = _retrieval_cache.get(query_text)
+    if cached is not None:
+        return list(cached)
+
+    start = time.perf_counter()
+    examples, fallback = await _search(client, query_text, 8, None)
+    _retrieval_latencies_ms.append((time.perf_counter() - start) * 1000)
+    # ES failed: the local fallback answer is kept only briefly, so ES
+    # results (and index-version invalidation) resume once it recovers;
+    # empty results are not cached at all
+    if examples:
+        _retrieval_cache.set(query_text, examples, ttl=FALLBACK_CACHE_TTL_SECONDS if fallback else None)
+    return examples
+
+
+async def probe_elasticsearch(client: httpx.AsyncClient) -> bool:
+    """Cluster health probe used to close the breaker"""
+    resp = await client.get(f"{ES_URL.rstrip('/')}/_cluster/health")
+    return resp.status_code == 200 and resp.json().get("status") in ("green", "yellow")
+
+
+def retrieval_stats() -> Dict[str, Any]:
+    """Cache hit rate and backend retrieval latency (last 1000 misses)"""
+    latencies = sorted(_retrieval_latencies_ms)
+
+    def pct(p: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+    return {
+        "cache": _retrieval_cache.stats(),
+        "backend": RETRIEVAL_BACKEND,
+        "mode": RETRIEVAL_MODE,
+        "dense_index": dense_index_stats(),
+        "local_index_docs": len(get_local_index() or ()),
+        "index_version": _index_version["value"],
+        "latency_ms": {"samples": len(latencies), "p50": pct(0.5), "p99": pct(0.99)},
+    }
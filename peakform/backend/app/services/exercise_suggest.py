@@ -0,0 +1,216 @@
+"""
+Exercise typeahead for the create-plan form: exercise names, muscle groups
+and equipment matching a typed prefix.
+
+Served from the `.prefix` edge-ngram subfields of the ES index (see
+DEFAULT_MAPPING in tools/ingest_es.py) over the shared ES client, or from a
+sorted in-process prefix index built from the local exercise dataset when
+RETRIEVAL_BACKEND is "local" or Elasticsearch is unavailable. Results are
+kept in a small hot-prefix cache, since most keystrokes repeat a few short
+prefixes.
+"""
+import bisect
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import (
+    ES_URL,
+    ES_INDEX,
+    RETRIEVAL_BACKEND,
+    SUGGEST_CACHE_SIZE,
+    SUGGEST_CACHE_TTL_SECONDS,
+)
+from app.utils.cache import TTLCache
+from .bm25_index import BM25Index, get_local_index
+from .exercise_search import FALLBACK_CACHE_TTL_SECONDS, es_breaker
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_FIELDS = ("names", "muscles", "equipment")
+MAX_PREFIX_LENGTH = 50
+
+# (normalized prefix, size) -> suggestions
+_suggest_cache = TTLCache(maxsize=SUGGEST_CACHE_SIZE, ttl=SUGGEST_CACHE_TTL_SECONDS)
+_suggest_latencies_ms: "deque[float]" = deque(maxlen=1000)
+
+
+def normalize_prefix(q: Optional[str]) -> str:
+    """Lowercased, whitespace-collapsed prefix"""
+    return " ".join((q or "").lower().split())[:MAX_PREFIX_LENGTH]
+
+
+def _word_starts(value: str) -> List[str]:
+    """Lowercased suffixes of a value starting at each word ("barbell curl", "curl")"""
+    words = value.lower().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _matches(value: str, prefix: str) -> bool:
+    return any(s.startswith(prefix) for s in _word_starts(value))
+
+
+class PrefixIndex:
+    """Sorted-array prefix lookup over exercise names, muscles and equipment
+
+    Every value is keyed by each of its word suffixes, so "cur" finds
+    "Barbell curl"; values whose first word matches rank first.
+    """
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        values: Dict[str, Dict[str, str]] = {field: {} for field in SUGGEST_FIELDS}
+        for doc in docs:
+            if doc.get("name"):
+                values["names"].setdefault(doc["name"].lower(), doc["name"])
+            for field in ("muscles", "equipment"):
+                for v in doc.get(field) or []:
+                    values[field].setdefault(v.lower(), v)
+        # field -> sorted (key, is word suffix, display)
+        self.entries: Dict[str, List[tuple]] = {}
+        self.keys: Dict[str, List[str]] = {}
+        for field, by_lower in values.items():
+            entries = []
+            for display in by_lower.values():
+                for i, key in enumerate(_word_starts(display)):
+                    entries.append((key, i > 0, display))
+            entries.sort()
+            self.entries[field] = entries
+            self.keys[field] = [e[0] for e in entries]
+
+    def lookup(self, field: str, prefix: str, size: int) -> List[str]:
+        keys, entries = self.keys[field], self.entries[field]
+        start = bisect.bisect_left(keys, prefix)
+        leading, inner = [], []
+        for key, is_suffix, display in entries[start:]:
+            if not key.startswith(prefix):
+                break
+            (inner if is_suffix else leading).append(display)
+            if len(leading) >= size:
+                break
+        out: List[str] = []
+        for display in leading + inner:
+            if display not in out:
+                out.append(display)
+                if len(out) >= size:
+                    break
+        return out
+
+    def suggest(self, prefix: str, size: int) -> Dict[str, List[str]]:
+        return {field: self.lookup(field, prefix, size) for field in SUGGEST_FIELDS}
+
+
+# built lazily from (and rebuilt with) the local BM25 index
+_prefix_index: Dict[str, Any] = {"source": None, "index": None}
+
+
+def _get_prefix_index() -> Optional[PrefixIndex]:
+    local: Optional[BM25Index] = get_local_index()
+    if local is None:
+        return None
+    if _prefix_index["source"] is not local:
+        _prefix_index["index"] = PrefixIndex(local.docs)
+        _prefix_index["source"] = local
+    return _prefix_index["index"]
+
+
+def _suggest_local(prefix: str, size: int) -> Dict[str, List[str]]:
+    index = _get_prefix_index()
+    if index is None:
+        return {field: [] for field in SUGGEST_FIELDS}
+    return index.suggest(prefix, size)
+
+
+async def _suggest_elasticsearch(
+    client: httpx.AsyncClient, prefix: str, size: int
+) -> Dict[str, List[str]]:
+    """One _search: name hits plus global filtered terms aggs for muscles/equipment"""
+
+    def prefix_match(field: str) -> Dict[str, Any]:
+        return {"match": {f"{field}.prefix": {"query": prefix, "operator": "and"}}}
+
+    es_body = {
+        "size": size,
+        "_source": ["name"],
+        "query": prefix_match("name"),
+        "aggs": {
+            "all": {
+                "global": {},
+                "aggs": {
+                    field: {
+                        "filter": prefix_match(field),
+                        "aggs": {"values": {"terms": {"field": field, "size": 50}}},
+                    }
+                    for field in ("muscles", "equipment")
+                },
+            }
+        },
+    }
+    resp = await client.post(f"{ES_URL.rstrip('/')}/{ES_INDEX}/_search", json=es_body)
+    if resp.status_code != 200:
+        raise RuntimeError(f"Elasticsearch returned {resp.status_code}")
+    body = resp.json()
+    names: List[str] = []
+    for hit in body.get("hits", {}).get("hits", []):
+        name = hit.get("_source", {}).get("name")
+        if name and name not in names:
+            names.append(name)
+    out = {"names": names[:size]}
+    aggs = body.get("aggregations", {}).get("all", {})
+    for field in ("muscles", "equipment"):
+        buckets = aggs.get(field, {}).get("values", {}).get("buckets", [])
+        # a document matching the prefix also brings its other values along
+        matching = [str(b["key"]) for b in buckets if _matches(str(b["key"]), prefix)]
+        out[field] = matching[:size]
+    return out
+
+
+async def suggest_exercises(
+    client: httpx.AsyncClient, q: Optional[str], size: int = 8
+) -> Dict[str, List[str]]:
+    """Typeahead suggestions for a prefix, grouped by field (best-effort)"""
+    prefix = normalize_prefix(q)
+    if not prefix:
+        return {field: [] for field in SUGGEST_FIELDS}
+    cached = _suggest_cache.get((prefix, size))
+    if cached is not None:
+        return cached
+
+    start = time.perf_counter()
+    result = None
+    ttl = None
+    admitted = RETRIEVAL_BACKEND != "local" and es_breaker.allow_request()
+    if admitted:
+        try:
+            result = await _suggest_elasticsearch(client, prefix, size)
+            es_breaker.record_success()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            es_breaker.record_failure(error[:200])
+            logger.warning("Elasticsearch suggest failed: %s", error)
+        finally:
+            es_breaker.release_trial(admitted)
+    if result is None:
+        result = _suggest_local(prefix, size)
+        if RETRIEVAL_BACKEND != "local":
+            ttl = FALLBACK_CACHE_TTL_SECONDS
+    _suggest_latencies_ms.append((time.perf_counter() - start) * 1000)
+    _suggest_cache.set((prefix, size), result, ttl=ttl)
+    return result
+
+
+def suggest_stats() -> Dict[str, Any]:
+    """Hot-prefix cache counters and backend latency (last 1000 misses)"""
+    latencies = sorted(_suggest_latencies_ms)
+
+    def pct(p: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+    return {
+        "cache": _suggest_cache.stats(),
+        "latency_ms": {"samples": len(latencies), "p50": pct(0.5), "p99": pct(0.99)},
+    }
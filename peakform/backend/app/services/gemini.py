@@ -0,0 +1,98 @@
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_API_BASE
+
+
+class GeminiError(Exception):
+    """Raised when Gemini returns an error response"""
+
+
+def build_request_body(prompt: str) -> Dict[str, Any]:
+    return {
+        "contents": [
+            {
+                "role": "user",
+                "parts": [
+                    {"text": prompt},
+                ],
+            }
+        ],
+        "generationConfig": {
+            "response_mime_type": "application/json",
+            "temperature": 0.7,
+        },
+    }
+
+
+def parse_generated_text(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse model output as JSON, tolerating code fences"""
+    generated_json = None
+    if text:
+        try:
+            generated_json = json.loads(text)
+        except Exception:
+            # If it returned plain text with code fences or commentary, attempt to strip
+            cleaned = text.strip()
+            if cleaned.startswith("```"):
+                cleaned = cleaned.strip("`")
+                # remove potential language hint
+                cleaned = "\n".join(line for line in cleaned.splitlines() if not line.strip().startswith("json"))
+            try:
+                generated_json = json.loads(cleaned)
+            except Exception:
+                generated_json = {"raw": text}
+    return generated_json
+
+
+def _generate_url(method: str) -> str:
+    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:{method}?key={GEMINI_API_KEY}"
+    if method == "streamGenerateContent":
+        url += "&alt=sse"
+    return url
+
+
+def _chunk_text(payload: Dict[str, Any]) -> str:
+    """Concatenate text parts of the first candidate in a response chunk"""
+    candidates = payload.get("candidates") or [{}]
+    parts = candidates[0].get("content", {}).get("parts") or []
+    return "".join(part.get("text") or "" for part in parts)
+
+
+async def stream_plan_text(client: httpx.AsyncClient, prompt: str) -> AsyncIterator[str]:
+    """Call Gemini streamGenerateContent (SSE) and yield text as it arrives"""
+    async with client.stream(
+        "POST", _generate_url("streamGenerateContent"), json=build_request_body(prompt)
+    ) as resp:
+        if resp.status_code >= 400:
+            body = await resp.aread()
+            raise GeminiError(f"Gemini error: {body.decode(errors='replace')[:200]}")
+        async for line in resp.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if not data:
+                continue
+            text = _chunk_text(json.loads(data))
+            if text:
+                yield text
+
+
+async def generate_plan_json(client: httpx.AsyncClient, prompt: str) -> Optional[Dict[str, Any]]:
+    """Call Gemini generateContent and return the parsed plan JSON"""
+    resp = await client.post(_generate_url("generateContent"), json=build_request_body(prompt))
+    if resp.status_code >= 400:
+        raise GeminiError(f"Gemini error: {resp.text[:200]}")
+    payload = resp.json()
+
+    # Extract JSON text from response
+    # Typical structure: candidates[0].content.parts[0].text
+    text = (
+        payload.get("candidates", [{}])[0]
+        .get("content", {})
+        .get("parts", [{}])[0]
+        .get("text")
+    )
+    return parse_generated_text(text)
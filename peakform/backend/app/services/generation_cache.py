@@ -0,0 +1,120 @@
+import copy
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import (
+    GEMINI_MODEL,
+    GENERATION_CACHE_ENABLED,
+    GENERATION_CACHE_MEMORY_SIZE,
+    GENERATION_CACHE_MAX_ROWS,
+    GENERATION_CACHE_TTL_SECONDS,
+)
+from app.models import GenerationCacheEntry
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Hot tier: cache_key -> generated plan dict
+_memory_tier = TTLCache(maxsize=GENERATION_CACHE_MEMORY_SIZE, ttl=GENERATION_CACHE_TTL_SECONDS)
+_db_stats = {"hits": 0, "misses": 0, "stores": 0}
+
+_WS_RE = re.compile(r"\s+")
+
+
+def generation_cache_key(prompt: str, model: str = GEMINI_MODEL) -> str:
+    """Hash of the normalized prompt (incl. exercise context) and model"""
+    lines = (_WS_RE.sub(" ", line).strip().lower() for line in prompt.splitlines())
+    normalized = "\n".join(line for line in lines if line)
+    return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def is_cacheable(generated_plan: Optional[Dict[str, Any]]) -> bool:
+    """Only cache plans that parsed as JSON (not empty or raw-text fallbacks)"""
+    return bool(generated_plan) and set(generated_plan) != {"raw"}
+
+
+async def get_cached_plan(db: AsyncSession, key: str) -> Optional[Dict[str, Any]]:
+    """Look up a generated plan in the memory tier, then the table tier"""
+    if not GENERATION_CACHE_ENABLED:
+        return None
+    plan = _memory_tier.get(key)
+    if plan is not None:
+        return copy.deepcopy(plan)
+
+    result = await db.execute(
+        select(GenerationCacheEntry).where(GenerationCacheEntry.cache_key == key)
+    )
+    entry = result.scalars().first()
+    if entry is None:
+        _db_stats["misses"] += 1
+        return None
+    if entry.created_at < datetime.utcnow() - timedelta(seconds=GENERATION_CACHE_TTL_SECONDS):
+        await db.delete(entry)
+        _db_stats["misses"] += 1
+        return None
+
+    _db_stats["hits"] += 1
+    # touching the row bumps updated_at, which drives size eviction
+    entry.hit_count = entry.hit_count + 1
+    _memory_tier.set(key, entry.generated_plan)
+    return copy.deepcopy(entry.generated_plan)
+
+
+async def store_cached_plan(db: AsyncSession, key: str, generated_plan: Dict[str, Any]) -> None:
+    """Write a freshly generated plan to both tiers (committed by the caller)"""
+    if not GENERATION_CACHE_ENABLED or not is_cacheable(generated_plan):
+        return
+    _memory_tier.set(key, generated_plan)
+    # upsert: concurrent generations of the same prompt race on the unique
+    # cache_key, and losing that race must not fail the generation
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    now = datetime.utcnow()
+    stmt = insert(GenerationCacheEntry).values(
+        cache_key=key, model=GEMINI_MODEL, generated_plan=generated_plan,
+        hit_count=0, created_at=now, updated_at=now,
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[GenerationCacheEntry.cache_key],
+            set_={
+                "model": stmt.excluded.model,
+                "generated_plan": stmt.excluded.generated_plan,
+                "created_at": stmt.excluded.created_at,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+    _db_stats["stores"] += 1
+    await _evict_overflow(db)
+
+
+async def _evict_overflow(db: AsyncSession) -> None:
+    """Keep the table tier under GENERATION_CACHE_MAX_ROWS (least recently used first)"""
+    await db.flush()
+    total = (await db.execute(select(func.count(GenerationCacheEntry.id)))).scalar_one()
+    overflow = total - GENERATION_CACHE_MAX_ROWS
+    if overflow <= 0:
+        return
+    oldest = (
+        select(GenerationCacheEntry.id)
+        .order_by(GenerationCacheEntry.updated_at.asc())
+        .limit(overflow)
+    )
+    await db.execute(delete(GenerationCacheEntry).where(GenerationCacheEntry.id.in_(oldest)))
+    logger.info("Evicted %d generation cache rows", overflow)
+
+
+def generation_cache_stats() -> Dict[str, Any]:
+    return {
+        "enabled": GENERATION_CACHE_ENABLED,
+        "memory": _memory_tier.stats(),
+        "table": dict(_db_stats),
+    }
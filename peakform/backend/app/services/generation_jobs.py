@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import Request
+from sqlalchemy import or_, select, update
+
+from app.config import (
+    GENERATION_WORKERS,
+    GEMINI_CONCURRENCY,
+    GENERATION_QUEUE_MAX,
+    GENERATION_LEASE_SECONDS,
+)
+from app.database import AsyncSessionLocal
+from app.models import WorkoutPlan
+from .plan_generation import (
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    STATUS_FAILED,
+    WORKER_ID,
+    claim_values,
+    generate_for_plan,
+    generation_lease,
+)
+from .gemini import GeminiError
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationQueueFull(Exception):
+    """Raised when too many generation jobs are waiting"""
+
+
+class GenerationJobPool:
+    """Bounded pool of asyncio workers that generate plans in the background.
+
+    Job state lives on the plan row (``generation_status``), so pending work
+    is recovered from the database when the app restarts. A running plan
+    carries its owner process and a lease (``generation_claimed_at``) that
+    the owner renews; only plans whose lease has expired are taken over, so
+    several app processes can share the table.
+    """
+
+    def __init__(
+        self,
+        es_client: httpx.AsyncClient,
+        gemini_client: httpx.AsyncClient,
+        workers: int = GENERATION_WORKERS,
+        gemini_concurrency: int = GEMINI_CONCURRENCY,
+        max_queue: int = GENERATION_QUEUE_MAX,
+    ):
+        self.es_client = es_client
+        self.gemini_client = gemini_client
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: "asyncio.Queue[int]" = asyncio.Queue()
+        self._gemini_slots = asyncio.Semaphore(gemini_concurrency)
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {"completed": 0, "failed": 0, "recovered": 0}
+
+    async def start(self) -> None:
+        """Re-queue unfinished jobs from the database and start workers"""
+        await self._reclaim_expired()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(WorkoutPlan.id)
+                .where(WorkoutPlan.generation_status == STATUS_PENDING)
+                .order_by(WorkoutPlan.id)
+            )
+            for plan_id in result.scalars().all():
+                self._queue.put_nowait(plan_id)
+                self.stats["recovered"] += 1
+        if self.stats["recovered"]:
+            logger.info("Recovered %d pending generation jobs", self.stats["recovered"])
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"generation-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._reaper(), name="generation-reaper"))
+
+    async def _reclaim_expired(self) -> List[int]:
+        """Set running plans whose owner stopped renewing the lease back to pending"""
+        cutoff = datetime.utcnow() - timedelta(seconds=GENERATION_LEASE_SECONDS)
+        expired = (
+            WorkoutPlan.generation_status == STATUS_RUNNING,
+            or_(WorkoutPlan.generation_claimed_at.is_(None), WorkoutPlan.generation_claimed_at < cutoff),
+        )
+        async with AsyncSessionLocal() as db:
+            plan_ids = (await db.execute(select(WorkoutPlan.id).where(*expired))).scalars().all()
+            if not plan_ids:
+                return []
+            await db.execute(
+                update(WorkoutPlan)
+                .where(WorkoutPlan.id.in_(plan_ids), *expired)
+                .values(generation_status=STATUS_PENDING, generation_owner=None)
+            )
+            await db.commit()
+        logger.info("Reclaimed %d generation jobs with expired leases", len(plan_ids))
+        return list(plan_ids)
+
+    async def _reaper(self) -> None:
+        """Periodically re-queue jobs abandoned by a process that died"""
+        while True:
+            await asyncio.sleep(GENERATION_LEASE_SECONDS / 2)
+            try:
+                for plan_id in await self._reclaim_expired():
+                    # a duplicate queue entry is harmless: the claim is atomic
+                    self._queue.put_nowait(plan_id)
+                    self.stats["recovered"] += 1
+            except Exception:
+                logger.exception("Reclaiming expired generation jobs failed")
+
+    async def stop(self) -> None:
+        """Cancel workers; unfinished jobs stay pending in the database"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def check_capacity(self) -> None:
+        if self._queue.qsize() >= self.max_queue:
+            raise GenerationQueueFull()
+
+    def enqueue(self, plan_id: int) -> None:
+        """Queue a plan whose row was committed with status pending"""
+        self._queue.put_nowait(plan_id)
+
+    def queue_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            **self.stats,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            plan_id = await self._queue.get()
+            try:
+                await self._run_job(plan_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Generation job %s crashed", plan_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, plan_id: int) -> None:
+        async with AsyncSessionLocal() as db:
+            # claim the job; another process may already have picked it up
+            claimed = await db.execute(
+                update(WorkoutPlan)
+                .where(
+                    WorkoutPlan.id == plan_id,
+                    WorkoutPlan.generation_status == STATUS_PENDING,
+                )
+                .values(**claim_values())
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return
+
+            db_plan: Optional[WorkoutPlan] = await db.get(WorkoutPlan, plan_id)
+            if db_plan is None:
+                return
+            try:
+                # renew from the claim on, including while waiting for a Gemini
+                # slot, so the reaper doesn't hand a queued job to another worker
+                async with generation_lease(plan_id), self._gemini_slots:
+                    await generate_for_plan(db, db_plan, self.es_client, self.gemini_client)
+                await db.commit()
+                self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                # shutting down: hand the job back to the next start()
+                await db.rollback()
+                await db.execute(
+                    update(WorkoutPlan)
+                    .where(WorkoutPlan.id == plan_id, WorkoutPlan.generation_owner == WORKER_ID)
+                    .values(generation_status=STATUS_PENDING, generation_owner=None)
+                )
+                await db.commit()
+                raise
+            except Exception as e:
+                # details stay in the log; generation_error is shown to the client
+                if isinstance(e, GeminiError):
+                    error = str(e)
+                    logger.warning("Generation job %s failed: %s", plan_id, error)
+                else:
+                    error = "Failed to generate plan"
+                    logger.exception("Generation job %s failed", plan_id)
+                await db.rollback()
+                await db.execute(
+                    update(WorkoutPlan)
+                    .where(WorkoutPlan.id == plan_id)
+                    .values(generation_status=STATUS_FAILED, generation_error=error[:500])
+                )
+                await db.commit()
+                self.stats["failed"] += 1
+
+
+def get_generation_jobs(request: Request) -> GenerationJobPool:
+    """Dependency: the app-wide generation job pool"""
+    return request.app.state.generation_jobs
@@ -0,0 +1,68 @@
+import logging
+
+import httpx
+from fastapi import Request
+
+from app.config import (
+    ES_USER,
+    ES_PASS,
+    ES_CONNECT_TIMEOUT,
+    ES_READ_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP2_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package"""
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def create_es_client() -> httpx.AsyncClient:
+    """Long-lived Elasticsearch client (created once in the app lifespan)"""
+    return httpx.AsyncClient(
+        auth=(ES_USER, ES_PASS),
+        # fail fast when ES is down, but allow slow queries once connected
+        timeout=httpx.Timeout(ES_READ_TIMEOUT, connect=ES_CONNECT_TIMEOUT),
+        limits=_limits(),
+        http2=_http2_available(),
+    )
+
+
+def create_gemini_client() -> httpx.AsyncClient:
+    """Long-lived Gemini client (created once in the app lifespan)"""
+    return httpx.AsyncClient(
+        timeout=30.0,
+        limits=_limits(),
+        http2=_http2_available(),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+def get_es_client(request: Request) -> httpx.AsyncClient:
+    """Dependency: shared Elasticsearch client from app state"""
+    return request.app.state.es_client
+
+
+def get_gemini_client(request: Request) -> httpx.AsyncClient:
+    """Dependency: shared Gemini client from app state"""
+    return request.app.state.gemini_client
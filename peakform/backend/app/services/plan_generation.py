@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import GENERATION_LEASE_SECONDS
+from app.database import AsyncSessionLocal
+from app.models import WorkoutPlan
+from .exercise_search import retrieve_exercises
+from .gemini import generate_plan_json, parse_generated_text, stream_plan_text
+from .generation_cache import generation_cache_key, get_cached_plan, store_cached_plan
+from .plan_structure import replace_plan_structure
+
+# Plan lifecycle values for WorkoutPlan.generation_status
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process on the plans it is generating (generation_owner)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def claim_values() -> Dict[str, Any]:
+    """Column values that mark a plan as running in this process"""
+    return {
+        "generation_status": STATUS_RUNNING,
+        "generation_owner": WORKER_ID,
+        "generation_claimed_at": datetime.utcnow(),
+    }
+
+
+async def _renew_lease(plan_id: int) -> None:
+    while True:
+        await asyncio.sleep(GENERATION_LEASE_SECONDS / 3)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(WorkoutPlan)
+                    .where(
+                        WorkoutPlan.id == plan_id,
+                        WorkoutPlan.generation_owner == WORKER_ID,
+                        WorkoutPlan.generation_status == STATUS_RUNNING,
+                    )
+                    # keep updated_at (and the plan's ETag) unchanged
+                    .values(generation_claimed_at=datetime.utcnow(), updated_at=WorkoutPlan.updated_at)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning("Could not renew generation lease for plan %s: %s", plan_id, e)
+
+
+@asynccontextmanager
+async def generation_lease(plan_id: int):
+    """Keep renewing this process's lease on a running plan while the body runs"""
+    renewal = asyncio.create_task(_renew_lease(plan_id))
+    try:
+        yield
+    finally:
+        renewal.cancel()
+
+
+def build_generation_prompt(data) -> str:
+    """Base prompt from plan inputs (WorkoutPlanCreate or WorkoutPlan row)"""
+    lines = [
+        "You are a fitness coach. Design a weekly workout plan as structured JSON.",
+        "Constraints:",
+        "- Return ONLY valid JSON, no extra commentary.",
+        "- Use keys: weeks, days, focus, exercises, sets, reps, rest, notes.",
+        "- Make it realistic for the user's experience and constraints.",
+        "",
+        f"Experience: {data.experience}",
+        f"Days per week: {data.days_per_week}",
+        f"Target muscles: {data.muscle_groups or 'unspecified'}",
+        f"Constraints: {data.constraints or 'none'}",
+    ]
+    return "\n".join(lines)
+
+
+def append_exercise_context(prompt: str, es_examples: List[Dict[str, Any]]) -> str:
+    """Build the prompt including examples when available"""
+    if not es_examples:
+        return prompt
+    lines = ["\nContext - example exercises from library (short):"]
+    for ex in es_examples:
+        name = ex.get("name") or "(unnamed)"
+        muscles = (", ".join(ex.get("muscles")) if isinstance(ex.get("muscles"), list) else ex.get("muscles")) or "unspecified"
+        equip = (", ".join(ex.get("equipment")) if isinstance(ex.get("equipment"), list) else ex.get("equipment")) or "none"
+        snippet = (ex.get("snippet") or "").strip().replace("\n", " ")
+        lines.append(f"- {name}; Muscles: {muscles}; Equipment: {equip}; Note: {snippet}")
+    return prompt + "\n" + "\n".join(lines)
+
+
+async def build_plan_prompt(
+    data,
+    es_client: httpx.AsyncClient,
+    es_examples: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """Assemble the full Gemini prompt, retrieving exercise context if not given"""
+    if es_examples is None:
+        # Try to retrieve a few relevant exercises from Elasticsearch to provide context to the LLM.
+        es_examples = await retrieve_exercises(es_client, data)
+    return append_exercise_context(build_generation_prompt(data), es_examples)
+
+
+async def generate_for_plan(
+    db: AsyncSession,
+    db_plan: WorkoutPlan,
+    es_client: httpx.AsyncClient,
+    gemini_client: httpx.AsyncClient,
+    bypass_cache: bool = False,
+    es_examples: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """Fill generated_plan/generation_prompt and the plan_days/plan_exercises
+    rows of a plan (caller commits)"""
+    prompt = await build_plan_prompt(db_plan, es_client, es_examples)
+    cache_key = generation_cache_key(prompt)
+    generated_json = None if bypass_cache else await get_cached_plan(db, cache_key)
+    if generated_json is None:
+        generated_json = await generate_plan_json(gemini_client, prompt)
+        await store_cached_plan(db, cache_key, generated_json)
+
+    db_plan.generated_plan = generated_json
+    db_plan.generation_prompt = prompt
+    db_plan.generation_status = STATUS_DONE
+    db_plan.generation_error = None
+    await replace_plan_structure(db, db_plan)
+
+
+async def stream_generate_for_plan(
+    db: AsyncSession,
+    db_plan: WorkoutPlan,
+    es_client: httpx.AsyncClient,
+    gemini_client: httpx.AsyncClient,
+    bypass_cache: bool = False,
+    es_examples: Optional[List[Dict[str, Any]]] = None,
+) -> AsyncIterator[str]:
+    """Yield generated plan text as Gemini streams it, then fill the plan row
+
+    The caller commits once the iterator is exhausted.
+    """
+    prompt = await build_plan_prompt(db_plan, es_client, es_examples)
+    cache_key = generation_cache_key(prompt)
+    generated_json = None if bypass_cache else await get_cached_plan(db, cache_key)
+    if generated_json is not None:
+        yield json.dumps(generated_json)
+    else:
+        parts: List[str] = []
+        async for text in stream_plan_text(gemini_client, prompt):
+            parts.append(text)
+            yield text
+        generated_json = parse_generated_text("".join(parts))
+        await store_cached_plan(db, cache_key, generated_json)
+
+    db_plan.generated_plan = generated_json
+    db_plan.generation_prompt = prompt
+    db_plan.generation_status = STATUS_DONE
+    db_plan.generation_error = None
+    await replace_plan_structure(db, db_plan)
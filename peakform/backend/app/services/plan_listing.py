@@ -0,0 +1,88 @@
+"""
+Keyset-paginated listing of a user's workout plans, newest first.
+
+Pages are addressed by the (created_at, id) of the last plan returned, so
+each page is an index range scan on ix_workout_plans_user_created however
+deep it is. Only the summary columns are selected; generated_plan and
+generation_prompt stay in the database.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import WorkoutPlan
+
+SUMMARY_COLUMNS = (
+    WorkoutPlan.id,
+    WorkoutPlan.user_id,
+    WorkoutPlan.name,
+    WorkoutPlan.experience,
+    WorkoutPlan.days_per_week,
+    WorkoutPlan.muscle_groups,
+    WorkoutPlan.constraints,
+    WorkoutPlan.generation_status,
+    WorkoutPlan.is_active,
+    WorkoutPlan.is_favorite,
+    WorkoutPlan.created_at,
+    WorkoutPlan.updated_at,
+)
+
+
+class InvalidPlanCursor(ValueError):
+    """Cursor is malformed"""
+
+
+def encode_plan_cursor(created_at: datetime, plan_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), plan_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_plan_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, plan_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(plan_id)
+    except Exception:
+        raise InvalidPlanCursor("Malformed cursor")
+
+
+async def list_plan_summaries(
+    db: AsyncSession, user_id: int, limit: int = 20, cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """One page of plan summaries plus next_cursor (and total on the first page)
+
+    Raises InvalidPlanCursor for a malformed cursor.
+    """
+    stmt = select(*SUMMARY_COLUMNS).where(WorkoutPlan.user_id == user_id)
+    if cursor:
+        created_at, plan_id = decode_plan_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                WorkoutPlan.created_at < created_at,
+                and_(WorkoutPlan.created_at == created_at, WorkoutPlan.id < plan_id),
+            )
+        )
+    # one extra row tells whether there is a next page
+    stmt = stmt.order_by(WorkoutPlan.created_at.desc(), WorkoutPlan.id.desc()).limit(limit + 1)
+    rows: List[Any] = (await db.execute(stmt)).mappings().all()
+
+    total = None
+    if not cursor:
+        # covered by the user_id indexes; no table rows are read
+        total = await db.scalar(
+            select(func.count()).select_from(WorkoutPlan).where(WorkoutPlan.user_id == user_id)
+        )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_plan_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return {
+        "plans": [dict(r) for r in rows],
+        "total": total,
+        "page_size": limit,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,312 @@
+"""
+Normalized copy of a generated plan's structure in plan_days and
+plan_exercises, so questions across plans ("which plans use exercise X",
+"weekly sets per muscle", "plans with 4+ leg days") are indexed SQL instead
+of parsing every generated_plan blob.
+
+Rows are rebuilt whenever a plan's generation completes (the caller
+commits) and deleted with the plan. Days are read from the same shapes the
+plan page understands ({"days": [...]}, {"weeks": [{"days": [...]}]}, a bare
+list, or weekday keys), first week only. Each exercise is matched to a
+catalog muscle through the local exercise index.
+
+Backfill existing plans with `python -m app.services.plan_structure`
+(the Alembic migration that adds the tables runs it once).
+"""
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import PlanDay, PlanExercise, WorkoutPlan
+from .bm25_index import BM25Index, get_local_index, tokenize
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+EXERCISE_LIST_KEYS = ("exercises", "workouts", "routine", "items")
+# query-time groups over the catalog's BodyPart values
+MUSCLE_GROUPS: Dict[str, Sequence[str]] = {
+    "legs": ("quadriceps", "hamstrings", "glutes", "calves", "adductors", "abductors"),
+    "back": ("lats", "middle back", "lower back", "traps"),
+    "arms": ("biceps", "triceps", "forearms"),
+    "core": ("abdominals",),
+}
+_INT_RE = re.compile(r"\d+")
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())[:255]
+
+
+def expand_muscle(muscle: str) -> List[str]:
+    """Catalog muscles for a muscle or group name ("legs" -> quadriceps, ...)"""
+    key = muscle.strip().lower()
+    return list(MUSCLE_GROUPS.get(key, (key,)))
+
+
+def _first(d: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        if d.get(key):
+            return d[key]
+    return None
+
+
+def _text(value: Any, limit: int) -> Optional[str]:
+    return str(value)[:limit] if value not in (None, "") else None
+
+
+def _sets(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _INT_RE.search(str(value or ""))
+    return int(match.group()) if match else None
+
+
+def extract_days(generated_plan: Any) -> List[Dict[str, Any]]:
+    """[{title, focus, exercises: [{name, sets, reps, rest}]}] from a generated plan"""
+    g = generated_plan
+    raw_days = None
+    if isinstance(g, dict) and isinstance(g.get("days"), list):
+        raw_days = g["days"]
+    elif isinstance(g, dict) and isinstance(g.get("weeks"), list) and g["weeks"]:
+        w0 = g["weeks"][0]
+        raw_days = w0.get("days") if isinstance(w0, dict) else w0 if isinstance(w0, list) else None
+    elif isinstance(g, list):
+        raw_days = g
+    elif isinstance(g, dict):
+        found = [k for k in WEEKDAYS if k in g]
+        raw_days = [{"title": k, "exercises": g[k]} for k in found] or None
+    if not isinstance(raw_days, list):
+        return []
+
+    days = []
+    for i, d in enumerate(raw_days):
+        if isinstance(d, list):
+            ex_list, d = d, {}
+        elif isinstance(d, dict):
+            ex_list = next((d[k] for k in EXERCISE_LIST_KEYS if isinstance(d.get(k), list)), None)
+            if ex_list is None:
+                ex_list = [d] if (d.get("name") or d.get("focus")) else []
+        else:
+            continue
+        exercises = []
+        for ex in ex_list:
+            if isinstance(ex, str):
+                ex = {"name": ex}
+            if not isinstance(ex, dict):
+                continue
+            name = _first(ex, "name", "exercise", "title")
+            if not name:
+                continue
+            exercises.append({
+                "name": str(name)[:255],
+                "sets": _sets(_first(ex, "sets", "set", "Sets")),
+                "reps": _text(_first(ex, "reps", "Reps", "rep"), 50),
+                "rest": _text(_first(ex, "rest", "Rest"), 50),
+            })
+        title = _first(d, "title", "name", "day")
+        days.append({
+            "title": _text(title, 100) or f"Day {i + 1}",
+            "focus": _text(d.get("focus"), 255),
+            "exercises": exercises,
+        })
+    return days
+
+
+def _stem(tokens: Sequence[str]) -> set:
+    # "lunges" ~ "lunge"
+    return {t[:-1] if len(t) > 3 and t.endswith("s") else t for t in tokens}
+
+
+class MuscleMatcher:
+    """Generated exercise name -> lowercased catalog muscle (or None)
+
+    Exact name match first, then the best BM25 hit whose name contains
+    every word of the generated name.
+    """
+
+    def __init__(self, index: Optional[BM25Index]):
+        self.index = index
+        self.exact: Dict[str, str] = {}
+        self.cache: Dict[str, Optional[str]] = {}
+        for doc in index.docs if index else ():
+            if doc.get("muscles"):
+                self.exact.setdefault(normalize_name(doc.get("name") or ""), doc["muscles"][0].lower())
+
+    def __call__(self, name: str) -> Optional[str]:
+        key = normalize_name(name)
+        if key in self.exact:
+            return self.exact[key]
+        if key not in self.cache:
+            self.cache[key] = self._search(key)
+        return self.cache[key]
+
+    def _search(self, key: str) -> Optional[str]:
+        words = _stem(tokenize(key))
+        if not self.index or not words:
+            return None
+        for i, _score in self.index.search_ids(key, 5):
+            doc = self.index.docs[i]
+            if doc.get("muscles") and words <= _stem(tokenize(doc.get("name") or "")):
+                return doc["muscles"][0].lower()
+        return None
+
+
+_matcher: Dict[str, Any] = {"source": None, "matcher": None}
+
+
+def get_muscle_matcher() -> MuscleMatcher:
+    local = get_local_index()
+    if _matcher["matcher"] is None or _matcher["source"] is not local:
+        _matcher.update(source=local, matcher=MuscleMatcher(local))
+    return _matcher["matcher"]
+
+
+def build_plan_days(plan_id: int, user_id: int, generated_plan: Any) -> List[PlanDay]:
+    """PlanDay rows (with their PlanExercise children) for one plan"""
+    match = get_muscle_matcher()
+    rows = []
+    for position, day in enumerate(extract_days(generated_plan)):
+        exercises = [
+            PlanExercise(
+                plan_id=plan_id,
+                user_id=user_id,
+                position=j,
+                name=ex["name"],
+                name_key=normalize_name(ex["name"]),
+                sets=ex["sets"],
+                reps=ex["reps"],
+                rest=ex["rest"],
+                muscle=match(ex["name"]),
+            )
+            for j, ex in enumerate(day["exercises"])
+        ]
+        rows.append(PlanDay(
+            plan_id=plan_id,
+            user_id=user_id,
+            position=position,
+            title=day["title"],
+            focus=day["focus"],
+            exercise_count=len(exercises),
+            total_sets=sum(ex.sets or 0 for ex in exercises),
+            exercises=exercises,
+        ))
+    return rows
+
+
+async def delete_plan_structure(db: AsyncSession, plan_id: int) -> None:
+    await db.execute(delete(PlanExercise).where(PlanExercise.plan_id == plan_id))
+    await db.execute(delete(PlanDay).where(PlanDay.plan_id == plan_id))
+
+
+async def replace_plan_structure(db: AsyncSession, db_plan: WorkoutPlan) -> None:
+    """Rebuild a plan's day/exercise rows from its generated_plan (caller commits)"""
+    await delete_plan_structure(db, db_plan.id)
+    db.add_all(build_plan_days(db_plan.id, db_plan.user_id, db_plan.generated_plan))
+
+
+# --- queries ----------------------------------------------------------------
+
+
+async def _with_plan_info(db: AsyncSession, grouped, limit: int) -> List[Dict[str, Any]]:
+    """Join per-plan aggregates (plan_id, days, sets) onto plan name/created_at"""
+    sub = grouped.subquery()
+    rows = await db.execute(
+        select(sub.c.plan_id, WorkoutPlan.name, WorkoutPlan.created_at, sub.c.days, sub.c.sets)
+        .join(WorkoutPlan, WorkoutPlan.id == sub.c.plan_id)
+        .order_by(WorkoutPlan.created_at.desc(), WorkoutPlan.id.desc())
+        .limit(limit)
+    )
+    return [dict(r) for r in rows.mappings().all()]
+
+
+async def plans_using_exercise(db: AsyncSession, user_id: int, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """The user's plans containing an exercise (exact name, case-insensitive)"""
+    grouped = (
+        select(
+            PlanExercise.plan_id,
+            func.count(PlanExercise.day_id.distinct()).label("days"),
+            func.sum(PlanExercise.sets).label("sets"),
+        )
+        .where(PlanExercise.user_id == user_id, PlanExercise.name_key == normalize_name(name))
+        .group_by(PlanExercise.plan_id)
+    )
+    return await _with_plan_info(db, grouped, limit)
+
+
+async def plans_with_muscle_days(
+    db: AsyncSession, user_id: int, muscles: Sequence[str], min_days: int, limit: int = 50
+) -> List[Dict[str, Any]]:
+    """The user's plans with at least min_days days training any of the muscles"""
+    grouped = (
+        select(
+            PlanExercise.plan_id,
+            func.count(PlanExercise.day_id.distinct()).label("days"),
+            func.sum(PlanExercise.sets).label("sets"),
+        )
+        .where(PlanExercise.user_id == user_id, PlanExercise.muscle.in_(list(muscles)))
+        .group_by(PlanExercise.plan_id)
+        .having(func.count(PlanExercise.day_id.distinct()) >= min_days)
+    )
+    return await _with_plan_info(db, grouped, limit)
+
+
+async def plan_muscle_sets(db: AsyncSession, plan_id: int) -> List[Dict[str, Any]]:
+    """Weekly sets and exercise count per muscle of one plan, most sets first"""
+    total_sets = func.coalesce(func.sum(PlanExercise.sets), 0)
+    rows = await db.execute(
+        select(PlanExercise.muscle, total_sets.label("sets"), func.count().label("exercises"))
+        .where(PlanExercise.plan_id == plan_id)
+        .group_by(PlanExercise.muscle)
+        .order_by(total_sets.desc(), PlanExercise.muscle)
+    )
+    return [dict(r) for r in rows.mappings().all()]
+
+
+# --- backfill ---------------------------------------------------------------
+
+
+def backfill_plan_structure(session: Session, batch_size: int = 200) -> int:
+    """Build rows for every generated plan that has none; returns plans processed"""
+    done = select(PlanDay.plan_id).distinct()
+    last_id, processed = 0, 0
+    while True:
+        plans = session.execute(
+            select(WorkoutPlan.id, WorkoutPlan.user_id, WorkoutPlan.generated_plan)
+            .where(
+                WorkoutPlan.id > last_id,
+                WorkoutPlan.generated_plan.is_not(None),
+                WorkoutPlan.id.not_in(done),
+            )
+            .order_by(WorkoutPlan.id)
+            .limit(batch_size)
+        ).all()
+        if not plans:
+            return processed
+        for plan_id, user_id, generated_plan in plans:
+            session.add_all(build_plan_days(plan_id, user_id, generated_plan))
+        session.commit()
+        processed += len(plans)
+        last_id = plans[-1].id
+
+
+def main():
+    from app.config import EXERCISE_DATASET_PATH
+    from app.database import SessionLocal
+    from .bm25_index import load_local_index
+
+    logging.basicConfig(level=logging.INFO)
+    load_local_index(EXERCISE_DATASET_PATH)
+    with SessionLocal() as session:
+        count = backfill_plan_structure(session)
+    print(f"Backfilled plan structure for {count} plans")
+
+
+if __name__ == "__main__":
+    main()
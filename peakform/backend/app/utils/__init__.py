@@ -2,13 +2,25 @@
 from .security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    password_pool_stats,
+    PasswordPoolSaturated,
     create_access_token,
+    decode_access_token,
     verify_token,
 )
+from .cache import TTLCache
 
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "password_pool_stats",
+    "PasswordPoolSaturated",
     "create_access_token",
+    "decode_access_token",
     "verify_token",
+    "TTLCache",
 ]
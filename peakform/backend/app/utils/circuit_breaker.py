@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# allow_request results; only a TRIAL call owns the half-open slot
+REJECTED = 0
+ADMITTED = 1
+TRIAL = 2
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for a flaky dependency.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    callers fail fast. Once ``cooldown`` seconds pass, either a single trial
+    call (half-open) or the background probe decides whether to close it.
+    Callers record the outcome and pass the result of ``allow_request`` to
+    ``release_trial`` in a ``finally``, so a trial that is cancelled before
+    it records anything does not hold the half-open slot, and a call that
+    was admitted while closed never frees another call's trial.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial_in_flight = False
+
+    def allow_request(self) -> int:
+        """Whether a call may go to the dependency right now
+
+        REJECTED (falsy), ADMITTED, or TRIAL for the single half-open call.
+        """
+        if self.state == CLOSED:
+            return ADMITTED
+        if self.state == OPEN and time.monotonic() - (self.opened_at or 0) >= self.cooldown:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return TRIAL
+        self.rejected += 1
+        return REJECTED
+
+    def release_trial(self, admitted: int) -> None:
+        """End a call admitted by allow_request; frees the half-open slot if it was the trial"""
+        if admitted == TRIAL:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("Circuit '%s' closed", self.name)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        if self.state != OPEN:
+            self.trips += 1
+            logger.warning("Circuit '%s' opened: %s", self.name, self.last_error)
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    async def probe_loop(self, probe: Callable[[], Awaitable[bool]], interval: Optional[float] = None) -> None:
+        """Background task: while open, probe the dependency and close on success"""
+        interval = interval or self.cooldown
+        while True:
+            await asyncio.sleep(interval)
+            if self.state == CLOSED:
+                continue
+            try:
+                healthy = await probe()
+            except Exception as e:
+                healthy = False
+                self.last_error = str(e)
+            if healthy:
+                self.record_success()
+            elif self.state != OPEN:
+                self._trip()
+            else:
+                # still down: restart the cool-down window
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "trips": self.trips,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "failure_threshold": self.failure_threshold,
+            "cooldown_seconds": self.cooldown,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,195 @@
+"""
+Content-negotiated response compression (zstd, br, gzip).
+
+An ASGI middleware that compresses complete response bodies at least
+``minimum_size`` bytes long with the best encoding the client accepts.
+Streaming responses (bodies sent in several messages, e.g. SSE) and
+responses that already carry a Content-Encoding pass through untouched.
+brotli and zstd are used only when their optional packages are installed.
+A compressed response's strong ETag gets the coding as a suffix
+("<tag>-gzip"); app.utils.etag accepts that form in conditional requests.
+"""
+import asyncio
+import gzip
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils.etag import encoded_etag
+
+logger = logging.getLogger(__name__)
+
+# bodies this large are compressed off the event loop
+OFFLOAD_BYTES = 256 * 1024
+
+
+def _brotli() -> Optional[Callable[[bytes, int], bytes]]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return lambda data, level: brotli.compress(data, quality=level)
+
+
+def _zstd() -> Optional[Callable[[bytes, int], bytes]]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def available_codecs() -> Dict[str, Callable[[bytes, int], bytes]]:
+    """encoding -> compress(data, level) for the codecs importable here"""
+    codecs = {"gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0)}
+    for name, factory in (("br", _brotli), ("zstd", _zstd)):
+        fn = factory()
+        if fn is not None:
+            codecs[name] = fn
+    return codecs
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """{coding: q} from an Accept-Encoding header"""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header: str, preference: List[str]) -> Optional[str]:
+    """First encoding in server preference order the client accepts (q > 0)"""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    for coding in preference:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    """Compress complete responses for clients that accept it"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        levels: Optional[Dict[str, int]] = None,
+        encodings: Tuple[str, ...] = ("zstd", "br", "gzip"),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+        codecs = available_codecs()
+        self.codecs = codecs
+        self.preference = [e for e in encodings if e in codecs]
+        missing = [e for e in encodings if e not in codecs]
+        if missing:
+            logger.info("Response compression without %s (optional packages not installed)", ", ".join(missing))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        validators = b""
+        for key, value in scope.get("headers", ()):
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+            elif key == b"if-none-match":
+                validators = value
+        encoding = negotiate(accept, self.preference)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send, validators))
+
+    async def compress(self, encoding: str, body: bytes) -> bytes:
+        fn, level = self.codecs[encoding], self.levels[encoding]
+        if len(body) >= OFFLOAD_BYTES:
+            return await asyncio.to_thread(fn, body, level)
+        return fn(body, level)
+
+
+class _CompressingSend:
+    """Holds http.response.start until the first body message decides"""
+
+    __slots__ = ("middleware", "encoding", "send", "validators", "start", "passthrough")
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send, validators: bytes = b""):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.validators = validators  # the request's If-None-Match
+        self.start = None
+        self.passthrough = False
+
+    def _etag(self, value: bytes) -> bytes:
+        return encoded_etag(value.decode("latin-1"), self.encoding).encode("latin-1")
+
+    async def __call__(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message["type"] == "http.response.start":
+            headers = {k.lower(): v for k, v in message.get("headers", ())}
+            if message["status"] == 304 and b"etag" in headers:
+                # revalidated with the tag of the compressed representation:
+                # answer with that same tag
+                coded = self._etag(headers[b"etag"])
+                if coded in self.validators:
+                    message = {**message, "headers": [
+                        (k, coded if k.lower() == b"etag" else v) for k, v in message.get("headers", ())
+                    ]}
+            if (
+                b"content-encoding" in headers
+                or headers.get(b"content-type", b"").startswith(b"text/event-stream")
+                or message["status"] in (204, 304)
+            ):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.start is None:
+            await self.send(message)
+            return
+
+        start, self.start = self.start, None
+        self.passthrough = True
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.middleware.minimum_size:
+            # streamed or small: send as is
+            await self.send(start)
+            await self.send(message)
+            return
+
+        compressed = await self.middleware.compress(self.encoding, body)
+        # a strong ETag must differ per content-coding, or a cache could
+        # serve these bytes to a client that didn't accept the coding
+        headers = [
+            (k, self._etag(v) if k.lower() == b"etag" else v)
+            for k, v in start.get("headers", ())
+            if k.lower() not in (b"content-length", b"vary")
+        ]
+        vary = [v for k, v in start.get("headers", ()) if k.lower() == b"vary"]
+        headers += [
+            (b"content-encoding", self.encoding.encode()),
+            (b"content-length", str(len(compressed)).encode()),
+            (b"vary", b", ".join(vary + [b"Accept-Encoding"])),
+        ]
+        await self.send({**start, "headers": headers})
+        await self.send({"type": "http.response.body", "body": compressed})
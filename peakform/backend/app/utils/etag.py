@@ -0,0 +1,78 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+
+def _quote(*parts: Any) -> str:
+    raw = "|".join(str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def plan_etag(plan_id: int, updated_at: datetime) -> str:
+    """Strong ETag of one plan; any write bumps updated_at"""
+    return _quote("plan", plan_id, updated_at.isoformat())
+
+
+def plan_list_etag(count: int, max_updated_at: Optional[datetime], id_sum: Optional[int], *params: Any) -> str:
+    """ETag of a user's plan list
+
+    Creates and updates move max(updated_at), deletes change the count and
+    the id sum; ``params`` are the query parameters shaping the page.
+    """
+    stamp = max_updated_at.isoformat() if max_updated_at else ""
+    return _quote("plans", count, stamp, id_sum or 0, *params)
+
+
+def plan_page_etag(plans: Iterable[Any], *params: Any) -> str:
+    """ETag of one page of plans from the (id, updated_at) of the rows it returned"""
+    stamps = [f"{p['id']}@{p['updated_at'].isoformat()}" for p in plans]
+    return _quote("plan-page", ",".join(stamps), *params)
+
+
+# content-codings CompressionMiddleware appends to a strong ETag
+ENCODINGS = ("gzip", "br", "zstd")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the content-coded representation: '"<tag>-<encoding>"'
+
+    A strong validator must differ between codings of the same resource
+    (RFC 9110 8.8.3). Weak tags are returned unchanged.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_tag(tag: str) -> str:
+    """The tag without a content-coding suffix added by encoded_etag"""
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def _tags(header: str) -> Iterable[str]:
+    return (t.strip() for t in header.split(",") if t.strip())
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches (weak comparison, RFC 9110)
+
+    A tag of any content-coded representation of this version matches.
+    """
+    if not header:
+        return False
+    return any(t == "*" or _identity_tag(t.removeprefix("W/")) == etag for t in _tags(header))
+
+
+def if_match(header: Optional[str], etag: str) -> bool:
+    """True if an If-Match header is absent or matches (strong comparison)
+
+    Clients may send back the tag of a compressed response: it names the
+    same plan version.
+    """
+    if header is None:
+        return True
+    return any(t == "*" or (not t.startswith("W/") and _identity_tag(t) == etag) for t in _tags(header))
@@ -0,0 +1,66 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+
+from app.config import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+from app.models import User
+from .cache import TTLCache
+
+# token -> (email, exp); skips JWT signature checks for repeat tokens
+_token_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+# email (token "sub") -> detached User row; skips the per-request user lookup
+_user_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def _seconds_until(exp: float) -> float:
+    return exp - time.time()
+
+
+def get_cached_token(token: str) -> Optional[Tuple[str, float]]:
+    """Return (email, exp) for a previously verified, unexpired token"""
+    entry = _token_cache.get(token)
+    if entry is None:
+        return None
+    if _seconds_until(entry[1]) <= 0:
+        _token_cache.pop(token)
+        return None
+    return entry
+
+
+def cache_token(token: str, email: str, exp: float) -> None:
+    """Remember a verified token until its exp (or the cache TTL)"""
+    _token_cache.set(token, (email, exp), ttl=_seconds_until(exp))
+
+
+def get_cached_user(email: str) -> Optional[User]:
+    return _user_cache.get(email)
+
+
+def cache_user(email: str, user: User, exp: float) -> None:
+    """Cache a detached user row, never past the token's exp"""
+    _user_cache.set(email, user, ttl=_seconds_until(exp))
+
+
+def invalidate_user(email: Optional[str]) -> None:
+    """Drop a cached user row so the next request reloads it"""
+    if email:
+        _user_cache.pop(email)
+
+
+def principal_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for both cache tiers"""
+    return {"tokens": _token_cache.stats(), "users": _user_cache.stats()}
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    # covers deactivation (is_active) as well as email/password changes
+    invalidate_user(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted or []:
+        invalidate_user(old_email)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    invalidate_user(target.email)
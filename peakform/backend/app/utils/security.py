@@ -1,12 +1,39 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    PASSWORD_POOL_WORKERS,
+    PASSWORD_POOL_MAX_QUEUE,
+)
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Dedicated pool for bcrypt work; bcrypt releases the GIL so threads scale
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_POOL_WORKERS, thread_name_prefix="password-hash"
+)
+_password_pending = 0  # running + queued jobs, guarded by _password_stats_lock
+_password_stats_lock = threading.Lock()
+_password_stats = {
+    "completed": 0,
+    "rejected": 0,
+    "wait_seconds_total": 0.0,
+    "hash_seconds_total": 0.0,
+}
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the password hashing queue is full"""
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
@@ -18,6 +45,65 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_password_job(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a bcrypt call on the password pool, rejecting work when saturated"""
+    global _password_pending
+    with _password_stats_lock:
+        if _password_pending >= PASSWORD_POOL_WORKERS + PASSWORD_POOL_MAX_QUEUE:
+            _password_stats["rejected"] += 1
+            raise PasswordPoolSaturated()
+        _password_pending += 1
+
+    submitted = time.perf_counter()
+
+    def timed_job():
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with _password_stats_lock:
+                _password_stats["completed"] += 1
+                _password_stats["wait_seconds_total"] += started - submitted
+                _password_stats["hash_seconds_total"] += finished - started
+
+    def release(_future):
+        global _password_pending
+        with _password_stats_lock:
+            _password_pending -= 1
+
+    # the slot is tied to the pool's future, not the awaiting task: it is
+    # released when the hash finishes in its thread (or is dropped from the
+    # queue before starting), so a cancelled caller cannot free a slot while
+    # bcrypt is still running
+    future = _password_executor.submit(timed_job)
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bounded password pool"""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bounded password pool"""
+    return await _run_password_job(get_password_hash, password)
+
+
+def password_pool_stats() -> Dict[str, Any]:
+    """Snapshot of password pool counters"""
+    with _password_stats_lock:
+        stats = dict(_password_stats)
+    completed = stats["completed"] or 1
+    stats["pending"] = _password_pending
+    stats["workers"] = PASSWORD_POOL_WORKERS
+    stats["max_queue"] = PASSWORD_POOL_MAX_QUEUE
+    stats["avg_wait_ms"] = round(stats["wait_seconds_total"] / completed * 1000, 2)
+    stats["avg_hash_ms"] = round(stats["hash_seconds_total"] / completed * 1000, 2)
+    return stats
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -31,13 +117,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify JWT token and extract email"""
+def decode_access_token(token: str) -> Optional[Tuple[str, float]]:
+    """Verify JWT token and return (email, exp timestamp)"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("sub")
         if email is None:
             return None
-        return str(email)
+        return str(email), float(payload.get("exp") or 0)
     except JWTError:
         return None
+
+
+def verify_token(token: str) -> Optional[str]:
+    """Verify JWT token and extract email"""
+    decoded = decode_access_token(token)
+    return decoded[0] if decoded else None
@@ -0,0 +1,60 @@
+"""
+Fast JSON responses.
+
+FastJSONResponse renders with orjson when it is installed (the stdlib json
+module otherwise) and is the app's default response class. plan_response
+serializes WorkoutPlan rows straight to JSON bytes in WorkoutPlanResponse
+field order. The stored generated_plan dict is emitted as is instead of
+being validated as Dict[str, Any] and walked again by the encoder.
+"""
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse, Response
+
+from app.schemas import WorkoutPlanResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup; falls back to the json module
+    orjson = None
+
+# same keys and order as the response_model serializes
+PLAN_FIELDS = tuple(WorkoutPlanResponse.model_fields)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, formatted like Starlette's JSONResponse"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def plan_dict(plan) -> dict:
+    """WorkoutPlanResponse-shaped dict of a WorkoutPlan row (no validation)"""
+    return {field: getattr(plan, field) for field in PLAN_FIELDS}
+
+
+def plan_response(plans: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """JSON response for one WorkoutPlan row, or a list of rows"""
+    if isinstance(plans, (list, tuple)):
+        content = [plan_dict(p) for p in plans]
+    else:
+        content = plan_dict(plans)
+    return Response(dumps(content), status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,60 @@
+"""
+Build time and query throughput of the in-process BM25 exercise index.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.bm25_index import BM25Index  # noqa: E402
+
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "db" / "megaGymDataset.csv"
+
+SAMPLE_QUERIES = [
+    "legs glutes",
+    "chest triceps",
+    "bad knees low impact",
+    "shoulders dumbbell",
+    "lower back pain",
+    "biceps curl",
+    "abdominals core",
+    "hamstrings kettlebell",
+    "full body beginner",
+    "lats pull",
+]
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--dataset", default=str(DEFAULT_DATASET))
+    p.add_argument("--queries", type=int, default=20000)
+    p.add_argument("--size", type=int, default=8)
+    args = p.parse_args(argv)
+
+    start = time.perf_counter()
+    index = BM25Index.from_csv(args.dataset)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(0)
+    queries = [rng.choice(SAMPLE_QUERIES) for _ in range(args.queries)]
+    latencies = []
+    start = time.perf_counter()
+    for q in queries:
+        t = time.perf_counter()
+        index.search(q, args.size)
+        latencies.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    print(f"docs:          {len(index)}")
+    print(f"build:         {build_ms:.1f} ms")
+    print(f"queries/sec:   {args.queries / elapsed:,.0f}")
+    print(f"p50 latency:   {latencies[len(latencies) // 2]:.3f} ms")
+    print(f"p99 latency:   {latencies[int(len(latencies) * 0.99)]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Response compression for typical plan payloads: bytes saved and CPU cost.
+
+Part 1 compresses a single plan and plan lists with each available codec
+(gzip always; br/zstd when brotli/zstandard are installed) at a few levels.
+Part 2 drives the app in-process (httpx ASGITransport) against the seeded
+SQLite database from bench_plan_listing and compares wire bytes and CPU
+time per request with and without Accept-Encoding.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_plan_listing import percentile, sample_generated_plan, seed  # noqa: E402
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 11], "zstd": [1, 3, 10]}
+
+
+def plan_document(i: int):
+    return {
+        "id": i, "user_id": 1, "name": f"Plan {i}", "experience": "intermediate", "days_per_week": 5,
+        "muscle_groups": "legs, back", "constraints": "", "generated_plan": sample_generated_plan(),
+        "generation_prompt": "You are a certified strength coach. " * 40, "generation_status": "done",
+        "is_active": True, "is_favorite": False,
+        "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-01T00:00:00",
+    }
+
+
+def codec_table(repeat: int):
+    from app.utils.compression import available_codecs
+
+    codecs = available_codecs()
+    payloads = {
+        "1 plan": json.dumps(plan_document(1)).encode(),
+        "20 plans": json.dumps([plan_document(i) for i in range(20)]).encode(),
+        "100 plans": json.dumps([plan_document(i) for i in range(100)]).encode(),
+    }
+    print(f"codecs available: {', '.join(codecs)}")
+    print(f"{'payload':<11}{'codec':<9}{'raw':>9}{'encoded':>9}{'saved':>8}{'cpu us':>10}")
+    for label, data in payloads.items():
+        for name, fn in codecs.items():
+            for level in LEVELS[name]:
+                start = time.process_time()
+                for _ in range(repeat):
+                    out = fn(data, level)
+                cpu_us = (time.process_time() - start) * 1e6 / repeat
+                saved = 1 - len(out) / len(data)
+                print(f"{label:<11}{name + '-' + str(level):<9}{len(data):>9}{len(out):>9}"
+                      f"{saved:>8.0%}{cpu_us:>10.0f}")
+
+
+async def app_table(args):
+    import httpx
+    from app.main import app
+    from app.utils.compression import available_codecs
+    from app.utils.security import create_access_token
+
+    email = seed(args.plans)
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    transport = httpx.ASGITransport(app=app)
+    encodings = ["identity"] + [e for e in ("gzip", "br", "zstd") if e in available_codecs()]
+    print(f"\nend to end, {args.repeat} requests per row (default levels)")
+    print(f"{'request':<30}{'encoding':<10}{'wire bytes':>11}{'p50 ms':>9}{'cpu ms':>9}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, url, params in (
+            ("GET /api/plans/{id}", "/api/plans/1", {}),
+            ("GET /api/plans/user?limit=20", "/api/plans/user", {"limit": 20}),
+            ("GET /api/plans/user?limit=100", "/api/plans/user", {"limit": 100}),
+        ):
+            for encoding in encodings:
+                headers = {**auth, "Accept-Encoding": encoding}
+                latencies = []
+                cpu_start = time.process_time()
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    resp = await client.get(url, params=params, headers=headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                cpu_ms = (time.process_time() - cpu_start) * 1000 / args.repeat
+                print(f"{label:<30}{encoding:<10}{resp.num_bytes_downloaded:>11}"
+                      f"{percentile(latencies, 50):>9.2f}{cpu_ms:>9.2f}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--plans", type=int, default=200)
+    p.add_argument("--repeat", type=int, default=100)
+    args = p.parse_args(argv)
+    codec_table(args.repeat)
+    asyncio.run(app_table(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Dense (LSA) exercise index: build and load time, and per-query latency of
+the keyword (BM25), dense and hybrid retrievers on the local dataset.
+
+Also prints the top results of each retriever for a few intent-style
+queries so ranking changes can be eyeballed alongside the numbers.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services import exercise_search  # noqa: E402
+from app.services.bm25_index import load_local_index  # noqa: E402
+from app.services.dense_index import DenseIndex, dataset_sha1, load_dense_index  # noqa: E402
+from benchmarks.bench_bm25 import SAMPLE_QUERIES  # noqa: E402
+
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "db" / "megaGymDataset.csv"
+
+SHOWCASE_QUERIES = ["bad knees low impact", "cardio no equipment", "lower back pain"]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def time_mode(mode, queries, size):
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        await exercise_search.search_exercises(None, q, size, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def main_async(args):
+    local = load_local_index(args.dataset)
+    exercise_search.RETRIEVAL_BACKEND = "local"
+
+    start = time.perf_counter()
+    index = DenseIndex.build(local.docs, dims=args.dims)
+    build_ms = (time.perf_counter() - start) * 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        index.meta["dataset_sha1"] = dataset_sha1(args.dataset)
+        index.save(tmp)
+        start = time.perf_counter()
+        load_dense_index(tmp, args.dataset)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(f"docs: {len(index)}, dims: {index.meta['dims']}, vocab: {index.meta['vocab_size']}")
+        print(f"build: {build_ms:.0f} ms, load (memory-mapped): {load_ms:.1f} ms")
+        rng = random.Random(0)
+        queries = [rng.choice(SAMPLE_QUERIES) for _ in range(args.queries)]
+        print(f"\n{args.queries} queries, top {args.size}")
+        print(f"{'retriever':<10}{'p50 ms':>9}{'p99 ms':>9}")
+        for mode in ("keyword", "dense", "hybrid"):
+            lat = await time_mode(mode, queries, args.size)
+            print(f"{mode:<10}{percentile(lat, 50):>9.3f}{percentile(lat, 99):>9.3f}")
+
+        for q in SHOWCASE_QUERIES:
+            print(f"\n{q!r}")
+            for mode in ("keyword", "dense", "hybrid"):
+                hits = await exercise_search.search_exercises(None, q, 5, mode=mode)
+                print(f"  {mode:<8} " + "; ".join(h["name"] for h in hits))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--dataset", default=str(DEFAULT_DATASET))
+    p.add_argument("--queries", type=int, default=5000)
+    p.add_argument("--size", type=int, default=8)
+    p.add_argument("--dims", type=int, default=128)
+    args = p.parse_args(argv)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+GET /api/exercises/search latency and payload size at page 1 vs page N.
+
+Drives the app in-process (httpx ASGITransport) on the local catalog,
+walks search_after cursors to the target depth, then times repeated
+requests for the first and the deep page. Also reports how large the same
+page would be with full exercise documents instead of the projected fields.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "db" / "megaGymDataset.csv"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def main_async(args):
+    import httpx
+    from app.main import app
+    from app.services import create_es_client, exercise_catalog
+    from app.services.bm25_index import load_local_index
+
+    index = load_local_index(args.dataset)
+    exercise_catalog.RETRIEVAL_BACKEND = "local"
+    full_by_id = {str(d["id"]): d for d in index.docs}
+    app.state.es_client = create_es_client()
+
+    transport = httpx.ASGITransport(app=app)
+    print(f"page size {args.size}, {args.repeat} requests per page")
+    print(f"{'query':<22}{'page':>6}{'p50 ms':>9}{'p99 ms':>9}{'bytes':>9}{'full docs':>11}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for q in args.queries:
+            base = {"size": args.size}
+            if q:
+                base["q"] = q
+            cursors = {1: None}
+            cursor = None
+            for page in range(2, args.depth + 1):
+                resp = await client.get("/api/exercises/search", params={**base, **({"cursor": cursor} if cursor else {})})
+                cursor = resp.json()["next_cursor"]
+                if not cursor:
+                    break
+                cursors[page] = cursor
+            for page in sorted(set([1, max(cursors)])):
+                params = {**base, **({"cursor": cursors[page]} if cursors[page] else {})}
+                latencies = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    resp = await client.get("/api/exercises/search", params=params)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                body = resp.json()
+                full = len(json.dumps([full_by_id[r["id"]] for r in body["results"]]))
+                print(f"{(q or '(browse)'):<22}{page:>6}{percentile(latencies, 50):>9.2f}"
+                      f"{percentile(latencies, 99):>9.2f}{len(resp.content):>9}{full:>11}")
+    await app.state.es_client.aclose()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--dataset", default=str(DEFAULT_DATASET))
+    p.add_argument("--size", type=int, default=20)
+    p.add_argument("--depth", type=int, default=100)
+    p.add_argument("--repeat", type=int, default=200)
+    p.add_argument("--queries", nargs="+", default=["", "strength", "chest press"])
+    args = p.parse_args(argv)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
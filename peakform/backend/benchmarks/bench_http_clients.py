@@ -0,0 +1,87 @@
+"""
+Generate-path latency with per-request vs shared (pooled) httpx clients.
+
+Runs the ES retrieval + Gemini call used by /api/plans/generate against local
+stub servers and reports p50/p99 latency for both client strategies.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import start_stub_server  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def run_mode(mode: str, n: int, concurrency: int):
+    import httpx
+    from app.services import (
+        create_es_client,
+        create_gemini_client,
+        generate_plan_json,
+        search_exercises,
+    )
+    from app.config import ES_USER, ES_PASS
+
+    shared_es = create_es_client() if mode == "pooled" else None
+    shared_gemini = create_gemini_client() if mode == "pooled" else None
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            if mode == "pooled":
+                await search_exercises(shared_es, "legs glutes")
+                await generate_plan_json(shared_gemini, "prompt")
+            else:
+                # previous behaviour: a fresh client (and connection) per call
+                async with httpx.AsyncClient(timeout=10.0, auth=(ES_USER, ES_PASS)) as es:
+                    await search_exercises(es, "legs glutes")
+                async with httpx.AsyncClient(timeout=30.0) as gem:
+                    await generate_plan_json(gem, "prompt")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    wall = time.perf_counter() - wall
+    if shared_es:
+        await shared_es.aclose()
+        await shared_gemini.aclose()
+    return latencies, wall
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--requests", type=int, default=500)
+    p.add_argument("--concurrency", type=int, default=20)
+    p.add_argument("--stub-latency-ms", type=float, default=5.0)
+    args = p.parse_args(argv)
+
+    server, base = start_stub_server(args.stub_latency_ms)
+    os.environ["ELASTICSEARCH_URL"] = base
+    os.environ["GEMINI_API_BASE"] = base
+    os.environ["GEMINI_API_KEY"] = "bench"
+
+    print(f"{'mode':<12}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}")
+    for mode in ("per-request", "pooled"):
+        lat, wall = asyncio.run(run_mode(mode, args.requests, args.concurrency))
+        print(
+            f"{mode:<12}{percentile(lat, 50):>10.2f}{percentile(lat, 99):>10.2f}"
+            f"{statistics.mean(lat):>10.2f}{args.requests / wall:>10.1f}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Conditional GETs on plan resources: latency, CPU time and bytes of
+GET /api/plans/{plan_id} and GET /api/plans/user with and without a
+matching If-None-Match.
+
+Reuses the seeded SQLite database from bench_plan_listing and drives the
+app in-process (httpx ASGITransport). CPU time is process time per request,
+covering the app and the in-process client.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_plan_listing import percentile, seed  # noqa: E402
+
+
+async def measure(client, url, params, headers, repeat):
+    latencies = []
+    cpu_start = time.process_time()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        resp = await client.get(url, params=params, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / repeat
+    return latencies, cpu_ms, resp
+
+
+async def main_async(args):
+    import httpx
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    email = seed(args.plans)
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    transport = httpx.ASGITransport(app=app)
+    print(f"{args.plans} plans, {args.repeat} requests per row")
+    print(f"{'request':<34}{'status':>7}{'p50 ms':>9}{'cpu ms':>9}{'bytes':>11}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        targets = [
+            ("GET /api/plans/{id}", "/api/plans/1", {}),
+            (f"GET /api/plans/user?limit={args.list_limit}", "/api/plans/user", {"limit": args.list_limit}),
+        ]
+        for label, url, params in targets:
+            first = await client.get(url, params=params, headers=auth)
+            etag = first.headers["etag"]
+            for variant, headers in (("", auth), (" +INM", {**auth, "If-None-Match": etag})):
+                lat, cpu_ms, resp = await measure(client, url, params, headers, args.repeat)
+                print(f"{label + variant:<34}{resp.status_code:>7}{percentile(lat, 50):>9.2f}"
+                      f"{cpu_ms:>9.2f}{len(resp.content):>11}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--plans", type=int, default=500)
+    p.add_argument("--list-limit", type=int, default=100)
+    p.add_argument("--repeat", type=int, default=200)
+    args = p.parse_args(argv)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Plan listing cost for a user with many plans: the legacy
+GET /api/plans/user (offset/limit, full rows) vs the keyset-paginated
+GET /api/plans/user/summary at the first page and deep pages.
+
+Seeds a throwaway SQLite database with plans carrying a realistic
+generated_plan, then drives the app in-process (httpx ASGITransport).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench_plans_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/bench.db")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def sample_generated_plan(days: int = 5):
+    exercise = {"name": "Barbell back squat", "sets": 4, "reps": "6-8", "rest_seconds": 120,
+                "notes": "Brace, keep the bar over mid-foot, control the descent."}
+    return {
+        "summary": "Five-day upper/lower split focused on progressive overload.",
+        "weekly_schedule": [
+            {"day": d + 1, "focus": "Lower body", "exercises": [dict(exercise) for _ in range(6)]}
+            for d in range(days)
+        ],
+        "notes": ["Warm up for ten minutes before each session."] * 3,
+    }
+
+
+def seed(n_plans: int):
+    from app.database import Base, SessionLocal, engine
+    from app.models import User, WorkoutPlan
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user = User(email="bench@example.com", username="bench", password_hash="x")
+    db.add(user)
+    db.commit()
+    user_id, email = user.id, user.email
+    plan = sample_generated_plan()
+    start = datetime(2026, 1, 1)
+    db.bulk_insert_mappings(WorkoutPlan, [
+        {
+            "user_id": user_id, "name": f"Plan {i}", "experience": "intermediate", "days_per_week": 5,
+            "muscle_groups": "legs, back", "constraints": "", "generated_plan": plan,
+            "generation_prompt": "You are a certified strength coach. " * 40, "generation_status": "done",
+            "is_active": True, "is_favorite": False,
+            "created_at": start + timedelta(minutes=i), "updated_at": start + timedelta(minutes=i),
+        }
+        for i in range(n_plans)
+    ])
+    db.commit()
+    db.close()
+    return email
+
+
+async def timed(client, url, params, headers, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        resp = await client.get(url, params=params, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    assert resp.status_code == 200, resp.text
+    return latencies, resp
+
+
+async def main_async(args):
+    import httpx
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    email = seed(args.plans)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    transport = httpx.ASGITransport(app=app)
+    print(f"{args.plans} plans, page size {args.page_size}, {args.repeat} requests per row")
+    print(f"{'request':<34}{'p50 ms':>9}{'p99 ms':>9}{'bytes':>11}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        rows = [
+            ("legacy, all plans", "/api/plans/user", {"limit": args.plans}),
+            ("legacy, first page", "/api/plans/user", {"limit": args.page_size}),
+            ("legacy, last page", "/api/plans/user",
+             {"skip": args.plans - args.page_size, "limit": args.page_size}),
+        ]
+        for label, url, params in rows:
+            lat, resp = await timed(client, url, params, headers, args.repeat)
+            print(f"{label:<34}{percentile(lat, 50):>9.2f}{percentile(lat, 99):>9.2f}{len(resp.content):>11}")
+
+        # walk the cursors to the last page
+        cursors = [None]
+        while True:
+            params = {"limit": args.page_size, **({"cursor": cursors[-1]} if cursors[-1] else {})}
+            nxt = (await client.get("/api/plans/user/summary", params=params, headers=headers)).json()["next_cursor"]
+            if not nxt:
+                break
+            cursors.append(nxt)
+        for label, cursor in (("summary, first page", None), (f"summary, page {len(cursors)}", cursors[-1])):
+            params = {"limit": args.page_size, **({"cursor": cursor} if cursor else {})}
+            lat, resp = await timed(client, "/api/plans/user/summary", params, headers, args.repeat)
+            print(f"{label:<34}{percentile(lat, 50):>9.2f}{percentile(lat, 99):>9.2f}{len(resp.content):>11}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--plans", type=int, default=5000)
+    p.add_argument("--page-size", type=int, default=20)
+    p.add_argument("--repeat", type=int, default=50)
+    args = p.parse_args(argv)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
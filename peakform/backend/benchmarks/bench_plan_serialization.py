@@ -0,0 +1,82 @@
+"""
+Plan response serialization time for 1, 100 and 1000 plans.
+
+Compares the response_model path (pydantic validation of the ORM rows
+with from_attributes, JSON-mode dump, then a stdlib-json JSONResponse)
+with the same path rendered by FastJSONResponse, and with plan_response
+(rows straight to JSON bytes). Every path must produce identical bytes;
+the script exits with an error if they differ.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models import WorkoutPlan  # noqa: E402
+from app.schemas import WorkoutPlanResponse  # noqa: E402
+from app.utils import serialization  # noqa: E402
+from app.utils.serialization import FastJSONResponse, plan_response  # noqa: E402
+from benchmarks.bench_plan_listing import sample_generated_plan  # noqa: E402
+
+
+def make_plans(n: int) -> List[WorkoutPlan]:
+    start = datetime(2026, 1, 1, 8, 30, 15, 123456)
+    plans = []
+    for i in range(n):
+        plan = sample_generated_plan()
+        plan["summary"] += f" Variant {i} – deload every 4th week."
+        plans.append(WorkoutPlan(
+            id=i + 1, user_id=1, name=f"Plan {i}", experience="intermediate", days_per_week=5,
+            muscle_groups="legs, back", constraints=None if i % 2 else "bad knees",
+            generated_plan=plan, generation_prompt="You are a certified strength coach. " * 40,
+            generation_status="done", is_active=True, is_favorite=bool(i % 3),
+            # whole seconds on some rows: isoformat drops the microseconds
+            created_at=start + timedelta(minutes=i), updated_at=start + timedelta(seconds=i, microseconds=i % 2),
+        ))
+    return plans
+
+
+def response_model_path(adapter, plans, response_class):
+    value = adapter.validate_python(plans, from_attributes=True)
+    return response_class(adapter.dump_python(value, mode="json")).body
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args(argv)
+
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'no (json fallback)'}, "
+          f"best of {args.repeat}")
+    print(f"{'plans':>6}{'bytes':>10}{'response_model ms':>19}{'+orjson ms':>12}{'plan_response ms':>18}{'speedup':>9}")
+    for n in args.sizes:
+        plans = make_plans(n)
+        adapter = TypeAdapter(WorkoutPlanResponse if n == 1 else List[WorkoutPlanResponse])
+        target = plans[0] if n == 1 else plans
+        old_ms, old = timed(lambda: response_model_path(adapter, target, JSONResponse), args.repeat)
+        mid_ms, mid = timed(lambda: response_model_path(adapter, target, FastJSONResponse), args.repeat)
+        new_ms, new = timed(lambda: plan_response(target).body, args.repeat)
+        if not (old == mid == new):
+            raise SystemExit(f"{n} plans: serialized bytes differ from the response_model path")
+        print(f"{n:>6}{len(old):>10}{old_ms:>19.3f}{mid_ms:>12.3f}{new_ms:>18.3f}{old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Cross-plan questions answered from the normalized plan_days/plan_exercises
+tables vs scanning every plan's generated_plan JSON in Python.
+
+Seeds the SQLite database from bench_plan_listing, rewrites each plan to a
+varied {"days": [...]} layout, backfills the structure tables (timed), then
+compares the three structure endpoints (in-process, httpx ASGITransport)
+with a scan that loads and parses the user's generated_plan blobs.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_plan_listing import percentile, seed  # noqa: E402
+
+EXERCISES = [
+    ("Barbell Squat", "Lower body"), ("Romanian Deadlift", "Lower body"), ("Walking Lunges", "Lower body"),
+    ("Bench Press", "Push"), ("Push-up", "Push"), ("Overhead Press", "Push"),
+    ("Pull-up", "Pull"), ("Bent Over Barbell Row", "Pull"), ("Barbell Curl", "Pull"),
+    ("Plank", "Core"), ("Crunches", "Core"),
+]
+
+
+def varied_plan(rng: random.Random):
+    days = []
+    for d in range(rng.randint(3, 6)):
+        picks = rng.sample(EXERCISES, 5)
+        days.append({
+            "title": f"Day {d + 1}", "focus": picks[0][1],
+            "exercises": [{"name": name, "sets": rng.randint(2, 5), "reps": "8-12", "rest": "90s"}
+                          for name, _ in picks],
+        })
+    return {"summary": "Benchmark plan", "days": days}
+
+
+def prepare(n_plans: int):
+    from app.config import EXERCISE_DATASET_PATH
+    from app.database import SessionLocal
+    from app.models import WorkoutPlan
+    from app.services.bm25_index import load_local_index
+    from app.services.plan_structure import backfill_plan_structure
+
+    email = seed(n_plans)
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        ids = [row.id for row in db.query(WorkoutPlan.id)]
+        db.bulk_update_mappings(WorkoutPlan, [{"id": i, "generated_plan": varied_plan(rng)} for i in ids])
+        db.commit()
+    load_local_index(EXERCISE_DATASET_PATH)
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        count = backfill_plan_structure(db)
+        print(f"backfilled {count} plans in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return email
+
+
+def scan(question, user_id):
+    """The same answers computed from the JSON blobs"""
+    from app.database import SessionLocal
+    from app.models import WorkoutPlan
+    from app.services.plan_structure import expand_muscle, extract_days, get_muscle_matcher, normalize_name
+
+    match = get_muscle_matcher()
+    with SessionLocal() as db:
+        rows = db.query(WorkoutPlan.id, WorkoutPlan.generated_plan).filter(WorkoutPlan.user_id == user_id).all()
+    hits = []
+    for plan_id, generated in rows:
+        days = extract_days(generated)
+        if question == "exercise":
+            if any(normalize_name(ex["name"]) == "bench press" for d in days for ex in d["exercises"]):
+                hits.append(plan_id)
+        elif question == "muscle-days":
+            legs = set(expand_muscle("legs"))
+            if sum(any(match(ex["name"]) in legs for ex in d["exercises"]) for d in days) >= 4:
+                hits.append(plan_id)
+        elif plan_id == 1:
+            totals = {}
+            for d in days:
+                for ex in d["exercises"]:
+                    muscle = match(ex["name"])
+                    totals[muscle] = totals.get(muscle, 0) + (ex["sets"] or 0)
+            return totals
+    return hits
+
+
+async def main_async(args):
+    import httpx
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    email = prepare(args.plans)
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    transport = httpx.ASGITransport(app=app)
+    print(f"{args.plans} plans, {args.repeat} runs per row")
+    print(f"{'question':<28}{'tables p50 ms':>15}{'scan p50 ms':>13}{'results':>9}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, question, url, params, key in (
+            ("plans using bench press", "exercise", "/api/plans/user/by-exercise", {"name": "Bench Press"}, "plans"),
+            ("plans with 4+ leg days", "muscle-days", "/api/plans/user/by-muscle-days",
+             {"muscle": "legs", "min_days": 4, "limit": 200}, "plans"),
+            ("weekly sets per muscle", "sets", "/api/plans/1/muscle-sets", {}, "muscles"),
+        ):
+            sql = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                resp = await client.get(url, params=params, headers=auth)
+                sql.append((time.perf_counter() - start) * 1000)
+            assert resp.status_code == 200, resp.text
+            scanned = []
+            for _ in range(max(1, args.repeat // 10)):
+                start = time.perf_counter()
+                scan(question, 1)
+                scanned.append((time.perf_counter() - start) * 1000)
+            print(f"{label:<28}{percentile(sql, 50):>15.2f}{percentile(scanned, 50):>13.2f}"
+                  f"{len(resp.json()[key]):>9}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--plans", type=int, default=2000)
+    p.add_argument("--repeat", type=int, default=50)
+    args = p.parse_args(argv)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time-to-first-byte of streamed vs blocking Gemini generation.
+
+Uses the fake Gemini server from stub_servers: the blocking endpoint answers
+after the same total delay the streaming endpoint spreads across its chunks.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import start_stub_server  # noqa: E402
+
+
+async def measure(n: int):
+    from app.services import create_gemini_client, generate_plan_json
+    from app.services.gemini import stream_plan_text
+
+    client = create_gemini_client()
+    blocking, first_chunk, stream_total = [], [], []
+    for _ in range(n):
+        start = time.perf_counter()
+        await generate_plan_json(client, "prompt")
+        blocking.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        first = None
+        async for _text in stream_plan_text(client, "prompt"):
+            if first is None:
+                first = time.perf_counter()
+        first_chunk.append((first - start) * 1000)
+        stream_total.append((time.perf_counter() - start) * 1000)
+    await client.aclose()
+    return blocking, first_chunk, stream_total
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--requests", type=int, default=20)
+    p.add_argument("--chunks", type=int, default=8)
+    p.add_argument("--chunk-delay-ms", type=float, default=250.0)
+    args = p.parse_args(argv)
+
+    server, base = start_stub_server(
+        latency_ms=args.chunks * args.chunk_delay_ms,
+        stream_chunks=args.chunks,
+        stream_chunk_delay_ms=args.chunk_delay_ms,
+    )
+    os.environ["GEMINI_API_BASE"] = base
+    os.environ["GEMINI_API_KEY"] = "bench"
+
+    blocking, first_chunk, stream_total = asyncio.run(measure(args.requests))
+    print(f"{'metric':<28}{'p50 ms':>10}")
+    print(f"{'blocking generate (TTFB)':<28}{statistics.median(blocking):>10.1f}")
+    print(f"{'stream first chunk (TTFB)':<28}{statistics.median(first_chunk):>10.1f}")
+    print(f"{'stream complete':<28}{statistics.median(stream_total):>10.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Latency of GET /api/exercises/suggest for 1-3 character prefixes.
+
+Drives the FastAPI app in-process (httpx ASGITransport) with the local
+prefix index, and with the Elasticsearch path against the stub server.
+Reports p50/p99 with a cold hot-prefix cache (every prefix once) and a
+warm one (Zipf-distributed keystrokes).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import start_stub_server  # noqa: E402
+
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "db" / "megaGymDataset.csv"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def prefixes_from(docs):
+    """Distinct 1-3 character prefixes of words in exercise names/values"""
+    found = set()
+    for doc in docs:
+        words = (doc["name"] or "").lower().split() + [v.lower() for v in doc["muscles"] + doc["equipment"]]
+        for w in words:
+            for n in (1, 2, 3):
+                if len(w) >= n:
+                    found.add(w[:n])
+    return sorted(found)
+
+
+async def run(client, queries, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(q):
+        async with sem:
+            start = time.perf_counter()
+            resp = await client.get("/api/exercises/suggest", params={"q": q})
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert resp.status_code == 200, resp.text
+
+    await asyncio.gather(*(one(q) for q in queries))
+    return latencies
+
+
+async def main_async(args):
+    import httpx
+    from app.main import app
+    from app.services import create_es_client, exercise_suggest
+    from app.services.bm25_index import load_local_index
+
+    index = load_local_index(args.dataset)
+    prefixes = prefixes_from(index.docs)
+    rng = random.Random(0)
+    # Zipf-like keystroke mix: a few short prefixes dominate
+    weights = [1.0 / (rank + 1) for rank in range(len(prefixes))]
+    hot = rng.sample(prefixes, len(prefixes))
+    warm_queries = rng.choices(hot, weights=weights, k=args.requests)
+
+    app.state.es_client = create_es_client()
+    print(f"prefixes: {len(prefixes)} distinct (1-3 chars), warm requests: {args.requests}, "
+          f"concurrency: {args.concurrency}")
+    print(f"{'backend':<10}{'cache':<7}{'p50 ms':>10}{'p99 ms':>10}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for backend in args.backends:
+            exercise_suggest.RETRIEVAL_BACKEND = "local" if backend == "local" else "elasticsearch"
+            exercise_suggest._suggest_cache.clear()
+            cold = await run(client, prefixes, args.concurrency)
+            warm = await run(client, warm_queries, args.concurrency)
+            for label, lat in (("cold", cold), ("warm", warm)):
+                print(f"{backend:<10}{label:<7}{percentile(lat, 50):>10.2f}{percentile(lat, 99):>10.2f}")
+    await app.state.es_client.aclose()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--dataset", default=str(DEFAULT_DATASET))
+    p.add_argument("--requests", type=int, default=5000)
+    p.add_argument("--concurrency", type=int, default=20)
+    p.add_argument("--es-latency-ms", type=float, default=2.0)
+    p.add_argument("--backends", nargs="+", default=["local", "es-stub"], choices=["local", "es-stub"])
+    args = p.parse_args(argv)
+
+    server, base_url = start_stub_server(latency_ms=args.es_latency_ms)
+    os.environ["ELASTICSEARCH_URL"] = base_url
+    asyncio.run(main_async(args))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Local stand-ins for Elasticsearch `_search` and Gemini `generateContent` /
+`streamGenerateContent` (SSE).
+
+Both run on a background ThreadingHTTPServer speaking HTTP/1.1 keep-alive so
+connection reuse by the client is observable.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+STUB_PLAN = {
+    "weeks": 1,
+    "days": [
+        {
+            "day": 1,
+            "focus": "Full body",
+            "exercises": [
+                {"name": "Goblet squat", "sets": 3, "reps": "8-10", "rest": "90s"},
+                {"name": "Push-up", "sets": 3, "reps": "10-12", "rest": "60s"},
+            ],
+        }
+    ],
+    "notes": "stub",
+}
+
+STUB_HITS = {
+    "hits": {
+        "hits": [
+            {
+                "_source": {
+                    "id": str(i),
+                    "name": f"Exercise {i}",
+                    "muscles": ["Quadriceps"],
+                    "equipment": ["Dumbbell"],
+                    "snippet": "A short description of the movement.",
+                }
+            }
+            for i in range(8)
+        ]
+    }
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # write headers + body in one send; unbuffered writes stall keep-alive
+    # clients on Nagle/delayed ACK (~40ms per response)
+    wbufsize = 1 << 16
+    latency = 0.0
+    stream_chunks = 8
+    stream_chunk_delay = 0.05
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, obj, code=200):
+        data = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if ":streamGenerateContent" in self.path:
+            self._stream_plan()
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        if self.path.split("?")[0].endswith("/_search"):
+            self._send_json(STUB_HITS)
+        elif ":generateContent" in self.path:
+            self._send_json(
+                {"candidates": [{"content": {"parts": [{"text": json.dumps(STUB_PLAN)}]}}]}
+            )
+        else:
+            self._send_json({"error": "not found"}, code=404)
+
+    def _stream_plan(self):
+        """Fake Gemini streamGenerateContent?alt=sse: plan JSON in N chunks"""
+        text = json.dumps(STUB_PLAN)
+        step = max(1, len(text) // self.stream_chunks + 1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for i in range(0, len(text), step):
+            chunk = {"candidates": [{"content": {"parts": [{"text": text[i:i + step]}]}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode())
+            self.wfile.flush()
+            time.sleep(self.stream_chunk_delay)
+        self.close_connection = True
+
+    def do_GET(self):
+        self._send_json({"status": "green"})
+
+
+class _StubServer(ThreadingHTTPServer):
+    # the default listen backlog of 5 drops SYNs under concurrent connects
+    request_queue_size = 128
+
+
+def start_stub_server(
+    latency_ms: float = 0.0, stream_chunks: int = 8, stream_chunk_delay_ms: float = 50.0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a stub server on an ephemeral port; returns (server, base_url)"""
+    handler = type(
+        "Handler",
+        (_StubHandler,),
+        {
+            "latency": latency_ms / 1000.0,
+            "stream_chunks": stream_chunks,
+            "stream_chunk_delay": stream_chunk_delay_ms / 1000.0,
+        },
+    )
+    server = _StubServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
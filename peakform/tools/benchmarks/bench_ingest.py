@@ -0,0 +1,88 @@
+"""
+End-to-end throughput of tools/ingest_es.py against the local fake ES.
+
+Generates a synthetic dataset, then runs the ingest CLI once per mode as a
+subprocess and reports source rows/sec, documents indexed, MB/sec on the
+wire, bulk requests, peak memory and retry counts.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fake_es import start_fake_es
+from synth_dataset import write_dataset
+
+INGEST = Path(__file__).resolve().parent.parent / "ingest_es.py"
+
+# mode -> (extra CLI args, warm-up run first)
+MODES = {
+    "baseline": (["--batch", "500"], False),
+    "max-bytes": (["--batch", "100000", "--max-bytes", "5000000"], False),
+    "gzip": (["--batch", "500", "--gzip"], False),
+    "max-bytes+gzip": (["--batch", "100000", "--max-bytes", "5000000", "--gzip"], False),
+    "workers-2": (["--batch", "500", "--workers", "2"], False),
+    "manifest-rerun": (["--batch", "500", "--manifest", "{tmp}/manifest.db"], True),
+    "reindex": (["--batch", "500", "--reindex"], False),
+}
+
+
+def run_ingest(url: str, dataset: str, args, threads: int):
+    env = dict(os.environ, ELASTICSEARCH_URL=url)
+    cmd = [sys.executable, str(INGEST), "--index", "bench", "--files", dataset, "--threads", str(threads), *args]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    rss = re.search(r"Peak RSS: ([\d.]+) MB", proc.stderr)
+    summary = re.search(r"Indexed: (\d+).*failed: (\d+), retried: (\d+)", proc.stdout)
+    if summary is None:
+        raise RuntimeError(f"ingest failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    return {
+        "elapsed": elapsed,
+        "rss": float(rss.group(1)) if rss else float("nan"),
+        "indexed": int(summary.group(1)),
+        "failed": int(summary.group(2)),
+        "retried": int(summary.group(3)),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--rows", type=int, default=50000)
+    p.add_argument("--desc-words", type=int, default=40)
+    p.add_argument("--format", choices=["csv", "json", "ndjson"], default="csv")
+    p.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    p.add_argument("--threads", type=int, default=4)
+    p.add_argument("--latency-ms", type=float, default=5.0, help="Fake ES delay per _bulk request")
+    p.add_argument("--reject-rate", type=float, default=0.0, help="Fraction of _bulk requests rejected with 429")
+    p.add_argument("--item-reject-rate", type=float, default=0.0, help="Fraction of bulk items rejected with 429")
+    args = p.parse_args(argv)
+
+    server, url, stats = start_fake_es(args.latency_ms, args.reject_rate, args.item_reject_rate)
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = write_dataset(os.path.join(tmp, f"exercises.{args.format}"), args.rows, args.desc_words)
+        size_mb = os.path.getsize(dataset) / 1e6
+        print(f"dataset: {args.rows:,} rows, {size_mb:.1f} MB {args.format}; fake ES latency "
+              f"{args.latency_ms:g}ms, reject {args.reject_rate:g}/{args.item_reject_rate:g} (request/item)")
+        print(f"{'mode':<16} {'rows/sec':>10} {'indexed':>8} {'MB/sec':>8} {'wire MB':>8} {'requests':>9} "
+              f"{'peak MB':>8} {'retried':>8} {'failed':>7}")
+        for mode in args.modes:
+            extra, warm_up = MODES[mode]
+            extra = [a.format(tmp=tmp) for a in extra]
+            if warm_up:
+                run_ingest(url, dataset, extra, args.threads)
+            stats.reset()
+            r = run_ingest(url, dataset, extra, args.threads)
+            s = stats.snapshot()
+            wire_mb = s["bytes_received"] / 1e6
+            print(f"{mode:<16} {args.rows / r['elapsed']:>10,.0f} {r['indexed']:>8} {wire_mb / r['elapsed']:>8.2f} "
+                  f"{wire_mb:>8.2f} {s['bulk_requests']:>9} {r['rss']:>8.1f} {r['retried']:>8} {r['failed']:>7}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
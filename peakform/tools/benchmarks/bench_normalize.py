@@ -0,0 +1,50 @@
+"""
+Rows/sec of the ingest normalization + serialization pipeline, in-process
+and with --workers processes.
+
+Rows are megaGymDataset.csv repeated in memory, so the numbers measure
+normalize_row/json encoding only (no file or network I/O).
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import ingest_es  # noqa: E402
+
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "db" / "megaGymDataset.csv"
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--dataset", default=str(DEFAULT_DATASET))
+    p.add_argument("--rows", type=int, default=200000)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--chunk-size", type=int, default=1000)
+    args = p.parse_args(argv)
+
+    base = list(ingest_es.read_csv_file(args.dataset))
+    rows = [base[i % len(base)] for i in range(args.rows)]
+    cores = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    for d in rows:
+        ingest_es.normalize_row(d)
+    elapsed = time.perf_counter() - start
+    print(f"rows:            {len(rows):,} (cpu cores: {cores})")
+    print(f"normalize only:  {len(rows) / elapsed:,.0f} rows/sec")
+
+    print(f"{'workers':>8} {'rows/sec':>12} {'rows/sec/core':>14}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        n = sum(1 for _ in ingest_es.prepare_docs(iter(rows), workers=workers, chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - start
+        used = min(workers, cores)
+        print(f"{workers:>8} {n / elapsed:>12,.0f} {n / elapsed / used:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Local Elasticsearch stand-in for ingest benchmarks.
+
+Implements just enough of the REST API for tools/ingest_es.py: `_bulk`
+(index/create/delete actions, gzip bodies), index create/GET/DELETE (with
+wildcards), `_mapping`, `_settings`, `_refresh`, `_forcemerge`, aliases
+(`_alias`, `_aliases`) and `/_cluster/health`. It records request counts
+and body sizes, and can inject latency and 429 rejections, either for whole
+requests or for individual bulk items. Runs on a background ThreadingHTTPServer speaking
+HTTP/1.1 keep-alive.
+
+Run standalone with `python3 tools/benchmarks/fake_es.py --port 9200`.
+"""
+import argparse
+import fnmatch
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+
+class FakeEsStats:
+    """Counters shared by all handler threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.bulk_requests = 0
+            self.bytes_received = 0
+            self.bytes_decoded = 0
+            self.docs = 0
+            self.deletes = 0
+            self.rejected_requests = 0
+            self.rejected_items = 0
+            self.max_request_bytes = 0
+            self.connections = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for k, v in counts.items():
+                setattr(self, k, getattr(self, k) + v)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return {k: v for k, v in vars(self).items() if k != "lock"}
+
+
+class _FakeEsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # buffer headers + body into one write; an unbuffered handler would hit
+    # Nagle/delayed-ACK stalls on keep-alive connections that real ES doesn't
+    wbufsize = 1 << 16
+    stats: FakeEsStats = None
+    # index name -> {"mappings", "settings", "docs"}; alias name -> index names
+    indices: Dict[str, dict] = None
+    aliases: Dict[str, set] = None
+    latency = 0.0
+    reject_rate = 0.0
+    item_reject_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.stats.add(connections=1)
+
+    def _send_json(self, obj, code=200):
+        data = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        body = gzip.decompress(raw) if self.headers.get("Content-Encoding") == "gzip" and raw else raw
+        self.stats.add(requests=1, bytes_received=len(raw), bytes_decoded=len(body))
+        with self.stats.lock:
+            self.stats.max_request_bytes = max(self.stats.max_request_bytes, len(raw))
+        return body
+
+    def _path(self):
+        return [p for p in self.path.split("?")[0].split("/") if p]
+
+    def _not_found(self, name: str):
+        self._send_json({"error": {"type": "index_not_found_exception", "index": name}, "status": 404}, code=404)
+
+    def _resolve(self, expr: str):
+        """Index names for an index, alias or wildcard expression"""
+        names = []
+        for part in expr.split(","):
+            if "*" in part:
+                names += [n for n in self.indices if fnmatch.fnmatch(n, part)]
+            elif part in self.aliases:
+                names += sorted(self.aliases[part])
+            elif part in self.indices:
+                names.append(part)
+        return names
+
+    def _index_view(self, name: str) -> dict:
+        info = self.indices[name]
+        return {
+            "aliases": {a: {} for a, members in self.aliases.items() if name in members},
+            "mappings": info["mappings"],
+            "settings": {"index": info["settings"]},
+        }
+
+    def do_GET(self):
+        self._read_body()
+        parts = self._path()
+        if parts[:2] == ["_cluster", "health"]:
+            self._send_json({"cluster_name": "fake", "status": "green", "number_of_nodes": 1, "timed_out": False})
+        elif parts and parts[0] == "_alias" and len(parts) == 2:
+            found = {n: {"aliases": {parts[1]: {}}} for n in sorted(self.aliases.get(parts[1], ()))}
+            self._send_json(found) if found else self._send_json({"error": "alias missing", "status": 404}, code=404)
+        elif parts and not parts[0].startswith("_") and len(parts) <= 2:
+            names = self._resolve(parts[0])
+            if not names and "*" not in parts[0]:
+                return self._not_found(parts[0])
+            section = parts[1].lstrip("_") if len(parts) == 2 else None
+            views = {n: self._index_view(n) for n in names}
+            if section == "mapping":
+                views = {n: {"mappings": v["mappings"]} for n, v in views.items()}
+            elif section == "settings":
+                views = {n: {"settings": v["settings"]} for n, v in views.items()}
+            self._send_json(views)
+        else:
+            self._send_json({"name": "fake-es", "version": {"number": "8.0.0"}})
+
+    def do_PUT(self):
+        body = json.loads(self._read_body() or b"{}")
+        parts = self._path()
+        if len(parts) == 1:
+            if parts[0] in self.indices or parts[0] in self.aliases:
+                self._send_json({"error": {"type": "resource_already_exists_exception"}, "status": 400}, code=400)
+                return
+            settings = dict(body.get("settings", {}).get("index", body.get("settings", {})))
+            self.indices[parts[0]] = {"mappings": body.get("mappings", {}), "settings": settings, "docs": 0}
+            self._send_json({"acknowledged": True, "index": parts[0]})
+            return
+        names = self._resolve(parts[0]) if parts else []
+        if len(parts) != 2 or not names:
+            return self._not_found(parts[0] if parts else "")
+        for n in names:
+            if parts[1] == "_mapping" and "_meta" in body:
+                self.indices[n]["mappings"]["_meta"] = body["_meta"]
+            elif parts[1] == "_settings":
+                for k, v in body.get("index", body).items():
+                    if v is None:
+                        self.indices[n]["settings"].pop(k, None)
+                    else:
+                        self.indices[n]["settings"][k] = v
+        self._send_json({"acknowledged": True})
+
+    def do_DELETE(self):
+        self._read_body()
+        parts = self._path()
+        names = [n for n in self._resolve(parts[0]) if n in self.indices] if len(parts) == 1 else []
+        if not names:
+            return self._not_found(parts[0] if parts else "")
+        for n in names:
+            del self.indices[n]
+            for members in self.aliases.values():
+                members.discard(n)
+        self._send_json({"acknowledged": True})
+
+    def do_POST(self):
+        body = self._read_body()
+        parts = self._path()
+        if parts == ["_aliases"]:
+            self._update_aliases(json.loads(body or b"{}").get("actions", []))
+            return
+        if not parts or parts[-1] != "_bulk":
+            if parts and not parts[0].startswith("_") and not self._resolve(parts[0]):
+                return self._not_found(parts[0])
+            self._send_json({"acknowledged": True, "_shards": {"failed": 0}})
+            return
+        targets = self._resolve(parts[0]) if len(parts) == 2 else []
+        if len(parts) == 2 and parts[0] not in self.indices and len(targets) != 1:
+            # like ES: writes need a concrete index or an alias with one index
+            # (unknown names are auto-created)
+            if targets:
+                self._send_json({"error": {"type": "illegal_argument_exception"}, "status": 400}, code=400)
+                return
+            self.indices[parts[0]] = {"mappings": {}, "settings": {}, "docs": 0}
+            targets = [parts[0]]
+        self.stats.add(bulk_requests=1)
+        if self.latency:
+            time.sleep(self.latency)
+        if random.random() < self.reject_rate:
+            self.stats.add(rejected_requests=1)
+            self._send_json({"error": {"type": "es_rejected_execution_exception"}, "status": 429}, code=429)
+            return
+        self._send_json(self._bulk(body, targets[0] if targets else None))
+
+    def _update_aliases(self, actions):
+        """Apply all alias actions at once (atomic, as in ES)"""
+        aliases = {a: set(m) for a, m in self.aliases.items()}
+        drop = []
+        for action in actions:
+            (kind, spec), = action.items()
+            if spec["index"] not in self.indices:
+                return self._not_found(spec["index"])
+            if kind == "add":
+                aliases.setdefault(spec["alias"], set()).add(spec["index"])
+            elif kind == "remove":
+                aliases.get(spec["alias"], set()).discard(spec["index"])
+            elif kind == "remove_index":
+                drop.append(spec["index"])
+        for name in drop:
+            del self.indices[name]
+            for members in aliases.values():
+                members.discard(name)
+        self.aliases.clear()
+        self.aliases.update({a: m for a, m in aliases.items() if m})
+        self._send_json({"acknowledged": True})
+
+    def _bulk(self, body: bytes, index: str = None) -> dict:
+        lines = [line for line in body.split(b"\n") if line.strip()]
+        items = []
+        docs = deletes = rejected = 0
+        i = 0
+        while i < len(lines):
+            action = next(iter(json.loads(lines[i])))
+            # every action but delete is followed by a source line
+            i += 1 if action == "delete" else 2
+            if random.random() < self.item_reject_rate:
+                rejected += 1
+                items.append({action: {"status": 429, "error": {
+                    "type": "es_rejected_execution_exception", "reason": "rejected execution (fake)"}}})
+            elif action == "delete":
+                deletes += 1
+                items.append({action: {"status": 200, "result": "deleted"}})
+            else:
+                docs += 1
+                items.append({action: {"status": 201, "result": "created"}})
+        self.stats.add(docs=docs, deletes=deletes, rejected_items=rejected)
+        if index in self.indices:
+            with self.stats.lock:
+                self.indices[index]["docs"] += docs - deletes
+        return {"took": 1, "errors": rejected > 0, "items": items}
+
+
+def start_fake_es(
+    latency_ms: float = 0.0, reject_rate: float = 0.0, item_reject_rate: float = 0.0, port: int = 0
+) -> Tuple[ThreadingHTTPServer, str, FakeEsStats]:
+    """Start a fake ES on a port (ephemeral by default); returns (server, base_url, stats)"""
+    stats = FakeEsStats()
+    handler = type(
+        "Handler",
+        (_FakeEsHandler,),
+        {
+            "stats": stats,
+            "indices": {},
+            "aliases": {},
+            "latency": latency_ms / 1000.0,
+            "reject_rate": reject_rate,
+            "item_reject_rate": item_reject_rate,
+        },
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}", stats
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Run the fake Elasticsearch server in the foreground")
+    p.add_argument("--port", type=int, default=9200)
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every _bulk request")
+    p.add_argument("--reject-rate", type=float, default=0.0, help="Fraction of _bulk requests answered with 429")
+    p.add_argument("--item-reject-rate", type=float, default=0.0, help="Fraction of bulk items rejected with 429")
+    args = p.parse_args(argv)
+    server, url, stats = start_fake_es(args.latency_ms, args.reject_rate, args.item_reject_rate, port=args.port)
+    print(f"Fake Elasticsearch listening on {url} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(json.dumps(stats.snapshot()))
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Synthetic exercise datasets for ingest benchmarks.
+
+Writes rows shaped like db/megaGymDataset.csv (Title, Desc, Type, BodyPart,
+Equipment, Level, ...) as CSV, a JSON array or NDJSON, with a configurable
+row count and description length. Output is deterministic for a given seed.
+"""
+import argparse
+import csv
+import json
+import random
+from typing import Dict, Iterable
+
+COLUMNS = ["", "Title", "Desc", "Type", "BodyPart", "Equipment", "Level", "Rating", "RatingDesc"]
+TYPES = ["Strength", "Plyometrics", "Cardio", "Stretching", "Powerlifting", "Strongman"]
+BODY_PARTS = [
+    "Abdominals", "Adductors", "Abductors", "Biceps", "Calves", "Chest", "Forearms", "Glutes",
+    "Hamstrings", "Lats", "Lower Back", "Middle Back", "Traps", "Neck", "Quadriceps", "Shoulders", "Triceps",
+]
+EQUIPMENT = ["Bands", "Barbell", "Kettlebells", "Dumbbell", "Cable", "Machine", "Body Only", "Medicine Ball", "None"]
+LEVELS = ["Beginner", "Intermediate", "Expert"]
+MOVES = ["press", "row", "curl", "squat", "lunge", "raise", "extension", "pull", "deadlift", "crunch", "plank", "hold"]
+WORDS = (
+    "the exercise targets muscles with controlled tempo keep your core braced and back neutral "
+    "lower the weight slowly then drive up through the heels pause at the top squeeze and repeat "
+    "this movement builds strength stability and endurance suitable for any workout program"
+).split()
+
+
+def synth_rows(rows: int, desc_words: int = 40, seed: int = 0) -> Iterable[Dict[str, str]]:
+    rng = random.Random(seed)
+    for i in range(rows):
+        part = rng.choice(BODY_PARTS)
+        equip = rng.choice(EQUIPMENT)
+        yield {
+            "": str(i),
+            "Title": f"{equip} {part.lower()} {rng.choice(MOVES)} {i}",
+            "Desc": " ".join(rng.choice(WORDS) for _ in range(desc_words)).capitalize() + ".",
+            "Type": rng.choice(TYPES),
+            "BodyPart": part,
+            "Equipment": equip,
+            "Level": rng.choice(LEVELS),
+            "Rating": f"{rng.uniform(0, 10):.1f}",
+            "RatingDesc": rng.choice(["Average", ""]),
+        }
+
+
+def write_dataset(path: str, rows: int, desc_words: int = 40, fmt: str = None, seed: int = 0) -> str:
+    """Write a dataset; format is taken from the extension unless given"""
+    fmt = fmt or path.rsplit(".", 1)[-1]
+    data = synth_rows(rows, desc_words, seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(data)
+        elif fmt == "json":
+            f.write("[\n")
+            for n, row in enumerate(data):
+                f.write((",\n" if n else "") + json.dumps(row))
+            f.write("\n]\n")
+        elif fmt in ("ndjson", "jsonl"):
+            for row in data:
+                f.write(json.dumps(row) + "\n")
+        else:
+            raise ValueError(f"Unknown dataset format: {fmt}")
+    return path
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("path", help="Output file (.csv, .json, .ndjson)")
+    p.add_argument("--rows", type=int, default=100000)
+    p.add_argument("--desc-words", type=int, default=40, help="Words per description")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+    write_dataset(args.path, args.rows, args.desc_words, seed=args.seed)
+    print(f"Wrote {args.rows} rows to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
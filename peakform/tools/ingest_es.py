@@ -3,10 +3,21 @@
 Simple ingestion helper for Elasticsearch that uses only Python stdlib.
 
 Features:
-- Accept local file paths or HTTP(S) URLs (JSON or CSV).
-- Basic field normalization via heuristics (common exercise field names).
+- Accept local file paths or HTTP(S) URLs (JSON, NDJSON or CSV), streamed in
+  constant memory (incremental JSON array parsing, chunked downloads).
+- Basic field normalization via heuristics (common exercise field names),
+  resolved once per input header; optionally fanned out over --workers
+  processes (output order is preserved).
 - Create index with a simple mapping if it doesn't exist.
-- Bulk-index documents using the ES HTTP Bulk API in batches.
+- Bulk-index documents using the ES HTTP Bulk API in batches (by document
+  count and/or payload bytes), sent by a pool of worker threads, each holding
+  one keep-alive connection, with optional gzip request bodies, per-item
+  error handling and retries on 429/503.
+- Deterministic document ids (content hash of the normalized fields) and an
+  optional SQLite manifest so reruns only send new/changed documents and can
+  delete documents that disappeared from the source.
+- --reindex: load a fresh versioned index (<index>_v<n>) with bulk-load
+  settings, then atomically move the <index> alias to it and prune old versions.
 - --dry-run to print normalized documents instead of sending them.
 - --check-connection to print cluster health and exit.
 
@@ -14,17 +25,31 @@ This is intentionally minimal to avoid extra pip installs. For production,
 prefer the official Elasticsearch client and batching with retries.
 """
 import argparse
+import collections
 import csv
+import gzip
+import hashlib
+import http.client
+import io
 import json
 import os
+import queue
+import random
+import re
+import socket
+import sqlite3
 import sys
+import threading
 import time
-from typing import Dict, Iterable, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 try:
     # python3 only: urllib.request for downloading and HTTP calls
     from urllib.request import Request, urlopen
     from urllib.error import HTTPError, URLError
+    from urllib.parse import urlsplit
     from base64 import b64encode
 except Exception:
     print("Missing required stdlib modules", file=sys.stderr)
@@ -41,7 +66,7 @@ def basic_auth_header(user: str, password: str) -> Dict[str, str]:
     return {"Authorization": f"Basic {token}"}
 
 
-def http_request(path: str, method: str = "GET", body: bytes = None, headers=None):
+def http_request(path: str, method: str = "GET", body: bytes = None, headers=None, timeout: float = 30):
     url = path if path.startswith("http") else DEFAULT_ES.rstrip("/") + "/" + path.lstrip("/")
     req = Request(url, data=body, method=method)
     hdrs = headers.copy() if headers else {}
@@ -49,7 +74,7 @@ def http_request(path: str, method: str = "GET", body: bytes = None, headers=Non
     for k, v in hdrs.items():
         req.add_header(k, v)
     try:
-        with urlopen(req, timeout=30) as resp:
+        with urlopen(req, timeout=timeout) as resp:
             return resp.read().decode(), resp.getcode()
     except HTTPError as e:
         return e.read().decode(), e.code
@@ -57,6 +82,59 @@ def http_request(path: str, method: str = "GET", body: bytes = None, headers=Non
         raise
 
 
+class EsConnection:
+    """A persistent (keep-alive) HTTP connection to Elasticsearch.
+
+    Not thread-safe: each bulk worker owns one, so batches reuse the same TCP
+    (and TLS) session instead of reconnecting through urlopen every time.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_ES, timeout: float = 30):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.https else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.served = 0
+        self.auth = basic_auth_header(DEFAULT_USER, DEFAULT_PASS)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+            self.served = 0
+
+    def request(self, path: str, method: str = "GET", body: bytes = None, headers=None) -> Tuple[str, int]:
+        hdrs = dict(self.auth)
+        hdrs.update(headers or {})
+        while True:
+            if self.conn is None:
+                cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+                self.conn = cls(self.host, self.port, timeout=self.timeout)
+                self.conn.connect()
+                # http.client writes headers and large bodies separately; without
+                # TCP_NODELAY, Nagle + delayed ACK stalls every reused request
+                self.conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            reused = self.served > 0
+            try:
+                self.conn.request(method, self.prefix + "/" + path.lstrip("/"), body=body, headers=hdrs)
+                resp = self.conn.getresponse()
+                data = resp.read()
+            except (http.client.HTTPException, OSError):
+                self.close()
+                # the server may have dropped an idle keep-alive connection;
+                # retry once on a fresh one, but never mask a real failure
+                if reused:
+                    continue
+                raise
+            self.served += 1
+            if resp.will_close:
+                self.close()
+            return data.decode("utf-8", errors="replace"), resp.status
+
+
 def check_es():
     body, code = http_request("/_cluster/health?pretty")
     print(body)
@@ -66,147 +144,425 @@ def check_es():
 COMMON_FIELD_ALIASES = {
     "name": ["name", "exercise_name", "title"],
     "description": ["description", "desc", "instruction", "instructions", "how_to"],
-    "muscles": ["muscle", "muscles", "primary_muscle", "target_muscles"],
+    "muscles": ["muscle", "muscles", "primary_muscle", "target_muscles", "bodypart", "body_part"],
     "equipment": ["equipment", "equip", "tools"],
     "difficulty": ["difficulty", "level", "skill_level"],
-    "tags": ["tags", "categories", "category"],
+    "tags": ["tags", "categories", "category", "type"],
     "id": ["id", "exercise_id", "uid"],
 }
 
 
-def normalize_row(d: Dict[str, str]) -> Dict:
-    out = {}
-    # map aliases
-    lower = {k.lower(): v for k, v in d.items()}
-    for target, aliases in COMMON_FIELD_ALIASES.items():
-        for a in aliases:
-            if a in lower and lower[a] not in (None, ""):
-                val = lower[a]
+LIST_FIELDS = ("muscles", "equipment", "tags")
+
+# Bump whenever normalization changes document content (aliases above, list
+# splitting, snippet). Ids are content hashes, so a plain rerun over an index
+# loaded by another version would add every document a second time.
+# Stamped into the index _meta by mark_ingest_version.
+NORMALIZATION_VERSION = 2
+
+
+def compile_transformer(header: Iterable[str]) -> Callable[[Dict], Tuple[Dict, str]]:
+    """Build a row normalizer for a fixed set of column names.
+
+    Alias lookup (case-insensitive, first non-empty alias wins) is resolved
+    once here instead of lowercasing and scanning every alias per row. The
+    transformer returns (normalized doc, content hash).
+    """
+    columns = list(header)
+    # lowercased name -> original column (the last one wins, like a dict rebuild)
+    by_lower = {}
+    for col in columns:
+        by_lower[col.lower()] = col
+    ordered = list(by_lower.values())
+    candidates = [
+        (target, [by_lower[a] for a in aliases if a in by_lower])
+        for target, aliases in COMMON_FIELD_ALIASES.items()
+    ]
+    candidates = [(t, cols) for t, cols in candidates if cols]
+    name_col = by_lower.get("name")
+
+    def transform(d: Dict) -> Tuple[Dict, str]:
+        out = {}
+        for target, cols in candidates:
+            for col in cols:
+                val = d[col]
+                if val is None or val == "":
+                    continue
                 # split comma-separated lists for muscles/equipment/tags
-                if target in ("muscles", "equipment", "tags"):
-                    if isinstance(val, str):
-                        parts = [p.strip() for p in val.split(",") if p.strip()]
-                        out[target] = parts
-                    else:
-                        out[target] = val
+                if target in LIST_FIELDS and isinstance(val, str):
+                    out[target] = [p.strip() for p in val.split(",") if p.strip()]
                 else:
                     out[target] = val
                 break
 
-    # fallback: include name or first field as name
-    if "name" not in out:
-        if "name" in lower:
-            out["name"] = lower["name"]
+        # fallback: include name or first field as name
+        if "name" not in out:
+            if name_col is not None:
+                val = d[name_col]
+                out["name"] = val if val is not None else ""
+            else:
+                # pick first available non-empty field
+                for col in ordered:
+                    if d[col]:
+                        out["name"] = d[col]
+                        break
+
+        out["source"] = out.get("source", "import")
+
+        # short snippet
+        if "description" in out and isinstance(out["description"], str):
+            out["snippet"] = out["description"][0:200]
         else:
-            # pick first available non-empty field
-            for k, v in lower.items():
-                if v:
-                    out.setdefault("name", v)
-                    break
-
-    out["source"] = out.get("source", "import")
-    # ensure id exists
-    if "id" not in out:
-        out["id"] = str(int(time.time() * 1000))  # fallback: timestamp
-
-    # short snippet
-    if "description" in out and isinstance(out["description"], str):
-        out["snippet"] = out["description"][0:200]
-    else:
-        out.setdefault("snippet", "")
+            out.setdefault("snippet", "")
 
-    return out
+        # ensure id exists: stable across runs, so re-ingesting overwrites
+        # instead of duplicating (identical rows collapse into one document)
+        digest = content_hash(out)
+        out["id"] = str(out["id"]) if "id" in out else digest
+
+        return out, digest
+
+    return transform
+
+
+# header tuple -> compiled transformer (CSV has one header; JSON inputs a few)
+_TRANSFORMERS: Dict[Tuple[str, ...], Callable[[Dict], Tuple[Dict, str]]] = {}
+
+
+def normalize_with_hash(d: Dict[str, Any]) -> Tuple[Dict, str]:
+    header = tuple(d)
+    transform = _TRANSFORMERS.get(header)
+    if transform is None:
+        if len(_TRANSFORMERS) >= 1024:
+            _TRANSFORMERS.clear()
+        transform = _TRANSFORMERS[header] = compile_transformer(header)
+    return transform(d)
+
+
+def normalize_row(d: Dict[str, Any]) -> Dict:
+    return normalize_with_hash(d)[0]
+
+
+def content_hash(doc: Dict) -> str:
+    """Hash of a normalized document's fields (excluding id)"""
+    body = json.dumps({k: v for k, v in doc.items() if k != "id"}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """SQLite record of what was last indexed: (index, id) -> content hash.
+
+    Lets a rerun skip unchanged documents and find ids that disappeared from
+    the source. Entries are only written after ES acknowledged the item, so
+    failed documents are retried on the next run. Thread-safe.
+    """
+
+    def __init__(self, path: str, index: str, full: bool = False):
+        self.index = index
+        self.full = full
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "index_name TEXT NOT NULL, id TEXT NOT NULL, hash TEXT NOT NULL, "
+            "PRIMARY KEY (index_name, id))"
+        )
+        self.db.execute("CREATE TEMP TABLE seen (id TEXT PRIMARY KEY)")
+
+    def unchanged(self, doc_id: str, digest: str) -> bool:
+        """Mark the id as present in the source; True if already indexed with this hash"""
+        with self.lock:
+            self.db.execute("INSERT OR IGNORE INTO seen (id) VALUES (?)", (doc_id,))
+            if self.full:
+                return False
+            row = self.db.execute(
+                "SELECT hash FROM docs WHERE index_name = ? AND id = ?", (self.index, doc_id)
+            ).fetchone()
+        return row is not None and row[0] == digest
+
+    def record(self, entries: List[Tuple[str, Optional[str]]]):
+        """Store acknowledged (id, hash) pairs; a hash of None records a delete"""
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO docs (index_name, id, hash) VALUES (?, ?, ?)",
+                [(self.index, i, h) for i, h in entries if h is not None],
+            )
+            self.db.executemany(
+                "DELETE FROM docs WHERE index_name = ? AND id = ?",
+                [(self.index, i) for i, h in entries if h is None],
+            )
+            self.db.commit()
+
+    def rename(self, index: str):
+        """Move this run's entries to another index name, replacing what it had"""
+        with self.lock:
+            self.db.execute("DELETE FROM docs WHERE index_name = ?", (index,))
+            self.db.execute("UPDATE docs SET index_name = ? WHERE index_name = ?", (index, self.index))
+            self.db.commit()
+        self.index = index
+
+    def discard(self):
+        """Forget everything recorded for this index"""
+        with self.lock:
+            self.db.execute("DELETE FROM docs WHERE index_name = ?", (self.index,))
+            self.db.commit()
+
+    def missing(self) -> List[str]:
+        """Ids indexed by a previous run that were not seen in this one"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT id FROM docs WHERE index_name = ? AND id NOT IN (SELECT id FROM seen)", (self.index,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
+
+
+def is_url(path: str) -> bool:
+    return path.startswith("http://") or path.startswith("https://")
+
+
+def open_input(path: str):
+    """Open a local file or URL as a binary stream (URLs are downloaded in chunks)"""
+    if not is_url(path):
+        return open(path, "rb")
+    req = Request(path, method="GET")
+    # only send ES credentials to the ES host itself
+    if path.startswith(DEFAULT_ES.rstrip("/")):
+        for k, v in basic_auth_header(DEFAULT_USER, DEFAULT_PASS).items():
+            req.add_header(k, v)
+    try:
+        return urlopen(req, timeout=30)
+    except HTTPError as e:
+        raise RuntimeError(f"Failed downloading {path}: {e.code}\n{e.read().decode(errors='replace')[:500]}")
+
+
+def open_text(path: str):
+    return io.TextIOWrapper(open_input(path), encoding="utf-8-sig", newline="")
+
+
+_JSON_DELIMITERS = " \t\r\n,]}:"
+
+
+class JsonStream:
+    """Incremental reader for large JSON documents.
+
+    Holds only the current chunk plus the value being decoded, so top-level
+    arrays and {"key": [...]} wrappers are read in constant memory.
+    """
+
+    def __init__(self, fp, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character without consuming it (None at EOF)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # a value is complete once a delimiter follows it; a number at the
+                # end of the buffer ("12", "1e") may continue in the next chunk
+                if self.eof or (end < len(self.buf) and self.buf[end] in _JSON_DELIMITERS):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self.fill():
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                self.pos = end
+                return obj
+
+    def iter_array(self) -> Iterable:
+        """Yield elements of the array starting at the current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            nxt = self.peek()
+            self.pos += 1
+            if nxt == "]":
+                return
+            if nxt != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self.pos}")
+
+    def iter_document(self) -> Iterable:
+        """Yield records from a top-level array, a {"key": [...]} wrapper, or one object"""
+        first = self.peek()
+        if first == "[":
+            yield from self.iter_array()
+            return
+        if first != "{":
+            yield self.value()
+            return
+        # walk the object: stream the first list-valued key, else yield the object
+        self.expect("{")
+        obj = {}
+        while self.peek() not in ("}", None):
+            key = self.value()
+            self.expect(":")
+            if self.peek() == "[":
+                yield from self.iter_array()
+                return
+            obj[key] = self.value()
+            if self.peek() == ",":
+                self.pos += 1
+        yield obj
+
+
+def iter_ndjson(fp) -> Iterable[Dict]:
+    """Line-at-a-time newline-delimited JSON"""
+    for line in fp:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _parse_line(line: str):
+    """JSON value of a complete line, or None"""
+    if not line.endswith("\n"):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
 
 
 def read_json_file(path: str) -> Iterable[Dict]:
-    # path can be URL
-    if path.startswith("http://") or path.startswith("https://"):
-        data, code = http_request(path)
-        if code >= 400:
-            raise RuntimeError(f"Failed downloading {path}: {code}\n{data}")
-        try:
-            obj = json.loads(data)
-        except Exception:
-            # try newline-delimited
-            for line in data.splitlines():
-                if not line.strip():
-                    continue
-                yield json.loads(line)
+    """Stream records from JSON (array / wrapped list / object) or NDJSON"""
+    with open_text(path) as fp:
+        if path.endswith((".ndjson", ".jsonl")):
+            yield from iter_ndjson(fp)
             return
-        if isinstance(obj, list):
-            for item in obj:
-                yield item
-        elif isinstance(obj, dict):
-            # assume top-level object contains list under some key
-            for v in obj.values():
-                if isinstance(v, list):
-                    for item in v:
-                        yield item
-                    return
-            yield obj
-    else:
-        with open(path, "r", encoding="utf-8") as f:
-            data = f.read()
-            try:
-                obj = json.loads(data)
-            except Exception:
-                # NDJSON
-                for line in data.splitlines():
-                    if not line.strip():
-                        continue
-                    yield json.loads(line)
+        # sniff NDJSON from the first lines (bounded, works for URL streams too)
+        prefix = fp.readline(1 << 20)
+        while prefix and not prefix.strip():
+            prefix = fp.readline(1 << 20)
+        first = _parse_line(prefix)
+        if first is not None:
+            nxt = fp.readline(1 << 20)
+            while nxt and not nxt.strip():
+                nxt = fp.readline(1 << 20)
+            if nxt:
+                yield first
+                yield json.loads(nxt)
+                yield from iter_ndjson(fp)
                 return
-            if isinstance(obj, list):
-                for item in obj:
-                    yield item
-            elif isinstance(obj, dict):
-                for v in obj.values():
-                    if isinstance(v, list):
-                        for item in v:
-                            yield item
-                        return
-                yield obj
+        yield from JsonStream(_ChainedText(io.StringIO(prefix), fp)).iter_document()
+
+
+class _ChainedText:
+    """read() over a buffered prefix followed by the rest of a stream"""
+
+    def __init__(self, *parts):
+        self.parts = list(parts)
+
+    def read(self, size: int = -1) -> str:
+        while self.parts:
+            data = self.parts[0].read(size)
+            if data:
+                return data
+            self.parts.pop(0)
+        return ""
 
 
 def read_csv_file(path: str) -> Iterable[Dict]:
-    if path.startswith("http://") or path.startswith("https://"):
-        data, code = http_request(path)
-        if code >= 400:
-            raise RuntimeError(f"Failed downloading {path}: {code}\n{data}")
-        lines = data.splitlines()
-        reader = csv.DictReader(lines)
+    """Stream CSV rows from a local file or a chunked URL download"""
+    with open_text(path) as csvfile:
+        reader = csv.DictReader(csvfile)
         for row in reader:
             yield row
-    else:
-        with open(path, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                yield row
+
+
+def sniff_format(path: str) -> str:
+    """'json' when the first non-blank character opens a JSON value, else 'csv'"""
+    with open_text(path) as fp:
+        head = fp.read(4096)
+    return "json" if head.lstrip("\ufeff \t\r\n")[:1] in ("[", "{") else "csv"
 
 
 def iter_input_files(paths: List[str]) -> Iterable[Dict]:
     for p in paths:
-        if p.endswith(".json"):
+        if p.endswith((".json", ".ndjson", ".jsonl")):
             yield from read_json_file(p)
         elif p.endswith(".csv"):
             yield from read_csv_file(p)
+        # no extension: decide before yielding anything, since a JSON parse
+        # error after some rows would otherwise re-read them as CSV
+        elif sniff_format(p) == "json":
+            yield from read_json_file(p)
         else:
-            # try JSON, fallback CSV
-            try:
-                yield from read_json_file(p)
-            except Exception:
-                yield from read_csv_file(p)
+            yield from read_csv_file(p)
+
 
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# Edge n-gram subfield for typeahead (/api/exercises/suggest): indexed as
+# word prefixes, searched as whole lowercased words
+PREFIX_SUBFIELD = {"type": "text", "analyzer": "autocomplete", "search_analyzer": "autocomplete_search"}
 
 DEFAULT_MAPPING = {
+    "settings": {
+        "analysis": {
+            "filter": {"autocomplete_edge": {"type": "edge_ngram", "min_gram": 1, "max_gram": 20}},
+            "analyzer": {
+                "autocomplete": {"type": "custom", "tokenizer": "standard", "filter": ["lowercase", "autocomplete_edge"]},
+                "autocomplete_search": {"type": "custom", "tokenizer": "standard", "filter": ["lowercase"]},
+            },
+        }
+    },
     "mappings": {
         "properties": {
             "id": {"type": "keyword"},
-            "name": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+            "name": {"type": "text", "fields": {"keyword": {"type": "keyword"}, "prefix": PREFIX_SUBFIELD}},
             "description": {"type": "text"},
             "snippet": {"type": "text"},
-            "muscles": {"type": "keyword"},
-            "equipment": {"type": "keyword"},
+            "muscles": {"type": "keyword", "fields": {"prefix": PREFIX_SUBFIELD}},
+            "equipment": {"type": "keyword", "fields": {"prefix": PREFIX_SUBFIELD}},
             "difficulty": {"type": "keyword"},
             "tags": {"type": "keyword"},
             "source": {"type": "keyword"},
@@ -215,6 +571,17 @@ DEFAULT_MAPPING = {
 }
 
 
+def es_json(path: str, method: str = "GET", obj=None, timeout: float = 30) -> Tuple[Dict, int]:
+    """JSON request/response helper for the index management calls"""
+    body = json.dumps(obj).encode() if obj is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else None
+    resp, code = http_request(path, method=method, body=body, headers=headers, timeout=timeout)
+    try:
+        return json.loads(resp) if resp else {}, code
+    except ValueError:
+        return {"error": resp}, code
+
+
 def ensure_index(index: str):
     # check existence
     resp, code = http_request(f"/{index}", method="GET")
@@ -230,30 +597,414 @@ def ensure_index(index: str):
     return True
 
 
-def bulk_index(index: str, docs: Iterable[Dict], batch: int = 500, dry_run: bool = False, no_id: bool = False):
-    batch_list = []
-    count = 0
+# Item/request statuses worth retrying (backpressure / temporarily unavailable)
+RETRYABLE_STATUSES = (429, 503)
+
+# gzip level for --gzip: low levels already shrink bulk NDJSON ~5x and keep
+# compression well below the cost of the request itself
+GZIP_LEVEL = 3
+
+
+class BulkStats:
+    """Thread-safe counters for a bulk ingest run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.indexed = 0
+        self.failed = 0
+        self.retried = 0
+        self.skipped = 0
+        self.deleted = 0
+        self.requests = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        self.started = time.time()
+        self.errors: List[str] = []
+
+    def add(self, **counts):
+        with self.lock:
+            for k, v in counts.items():
+                setattr(self, k, getattr(self, k) + v)
+
+    def add_error(self, error: str, limit: int = 10):
+        with self.lock:
+            if len(self.errors) < limit:
+                self.errors.append(error)
+
+    def summary(self) -> str:
+        elapsed = max(time.time() - self.started, 1e-9)
+        return (
+            f"Indexed: {self.indexed}, unchanged: {self.skipped}, deleted: {self.deleted}, "
+            f"failed: {self.failed}, retried: {self.retried}, "
+            f"requests: {self.requests}, elapsed: {elapsed:.2f}s, "
+            f"{self.indexed / elapsed:.0f} docs/sec, "
+            f"sent {self.bytes_sent / 1e6:.2f} MB ({self.bytes_raw / 1e6:.2f} MB uncompressed)"
+        )
+
+
+def parse_bulk_response(body: str) -> List[Tuple[int, Optional[str]]]:
+    """Return (status, error) for each item of a _bulk response, in order"""
+    results = []
+    try:
+        items = json.loads(body).get("items", [])
+    except Exception:
+        return results
+    for item in items:
+        # each item is {"index": {...}} / {"create": {...}} / {"delete": {...}}
+        result = next(iter(item.values()), {})
+        error = result.get("error")
+        if isinstance(error, dict):
+            error = f"{error.get('type')}: {error.get('reason')}"
+        results.append((int(result.get("status", 0)), error))
+    return results
+
+
+def prepare_chunk(rows: List[Dict], no_id: bool = False) -> List[Tuple[str, str, bytes, bytes]]:
+    """Normalize and serialize rows: (id, content hash, action line, source line)"""
+    out = []
+    for d in rows:
+        doc, digest = normalize_with_hash(d)
+        header = {"index": {}} if no_id else {"index": {"_id": doc["id"]}}
+        out.append((
+            doc["id"],
+            digest,
+            json.dumps(header, ensure_ascii=False).encode("utf-8"),
+            json.dumps(doc, ensure_ascii=False).encode("utf-8"),
+        ))
+    return out
+
+
+def _chunks(docs: Iterable[Dict], size: int) -> Iterable[List[Dict]]:
+    chunk = []
     for d in docs:
-        doc = normalize_row({k: (v if v is not None else "") for k, v in d.items()})
-        if dry_run:
-            print(json.dumps(doc, ensure_ascii=False))
-            continue
-        if no_id:
-            header = {"index": {}}
+        chunk.append(d)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def prepare_docs(docs: Iterable[Dict], workers: int = 1, chunk_size: int = 1000, no_id: bool = False) -> Iterable[Tuple[str, str, bytes, bytes]]:
+    """Yield prepared documents in input order, optionally using worker processes"""
+    fn = partial(prepare_chunk, no_id=no_id)
+    if workers <= 1:
+        for chunk in _chunks(docs, chunk_size):
+            yield from fn(chunk)
+        return
+    # a bounded window of in-flight chunks keeps memory flat (Pool.imap would
+    # read the whole input ahead) and results come back in submission order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window: "collections.deque" = collections.deque()
+        for chunk in _chunks(docs, chunk_size):
+            window.append(pool.submit(fn, chunk))
+            if len(window) >= workers * 2:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+
+# One bulk item: action line, source line (None for deletes), and the
+# (id, content hash) to record in the manifest once ES acknowledges it
+BulkItem = Tuple[bytes, Optional[bytes], Tuple[str, Optional[str]]]
+
+
+def send_bulk(
+    conn: EsConnection,
+    index: str,
+    items: List[BulkItem],
+    stats: BulkStats,
+    max_retries: int = 5,
+    backoff: float = 0.5,
+    compress: bool = False,
+    on_success: Optional[Callable[[List[Tuple[str, Optional[str]]]], None]] = None,
+):
+    """Send one batch of bulk items, retrying only failed items"""
+    pending = items
+    attempt = 0
+    headers = {"Content-Type": "application/x-ndjson"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    while pending:
+        payload = b"".join(line + b"\n" for item in pending for line in item[:2] if line is not None)
+        body = gzip.compress(payload, compresslevel=GZIP_LEVEL) if compress else payload
+        retry: List[BulkItem] = []
+        try:
+            resp, code = conn.request(f"/{index}/_bulk", method="POST", body=body, headers=headers)
+        except (http.client.HTTPException, OSError) as e:
+            resp, code = str(e), 0
+        stats.add(requests=1, bytes_raw=len(payload), bytes_sent=len(body))
+
+        if code in RETRYABLE_STATUSES or code == 0:
+            # whole request rejected (backpressure) or connection error
+            retry = pending
+        elif code >= 400:
+            stats.add(failed=len(pending))
+            stats.add_error(f"bulk request failed with {code}: {resp[:200]}")
         else:
-            header = {"index": {"_id": str(doc.get("id"))}}
-        batch_list.append(json.dumps(header, ensure_ascii=False))
-        batch_list.append(json.dumps(doc, ensure_ascii=False))
-        count += 1
-        if count % batch == 0:
-            payload = "\n".join(batch_list) + "\n"
-            resp, code = http_request(f"/{index}/_bulk", method="POST", body=payload.encode("utf-8"), headers={"Content-Type": "application/x-ndjson"})
-            print(f"Bulk sent: {count} docs, status {code}")
-            batch_list = []
-    if batch_list and not dry_run:
-        payload = "\n".join(batch_list) + "\n"
-        resp, code = http_request(f"/{index}/_bulk", method="POST", body=payload.encode("utf-8"), headers={"Content-Type": "application/x-ndjson"})
-        print(f"Bulk sent final: {count} docs, status {code}")
+            results = parse_bulk_response(resp)
+            if len(results) != len(pending):
+                stats.add(failed=len(pending))
+                stats.add_error(f"unexpected bulk response: {resp[:200]}")
+            else:
+                done = []
+                for item, (status, error) in zip(pending, results):
+                    # deleting an id that is already gone is fine
+                    if status < 300 or (status == 404 and item[1] is None):
+                        done.append(item)
+                    elif status in RETRYABLE_STATUSES:
+                        retry.append(item)
+                    else:
+                        stats.add(failed=1)
+                        stats.add_error(f"{status} {error}")
+                deleted = sum(1 for item in done if item[1] is None)
+                stats.add(indexed=len(done) - deleted, deleted=deleted)
+                if on_success and done:
+                    on_success([item[2] for item in done])
+
+        if not retry:
+            return
+        if attempt >= max_retries:
+            stats.add(failed=len(retry))
+            stats.add_error(f"gave up on {len(retry)} items after {attempt} retries (last status {code})")
+            return
+        # exponential backoff with jitter
+        time.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+        attempt += 1
+        stats.add(retried=len(retry))
+        pending = retry
+
+
+def bulk_index(
+    index: str,
+    docs: Iterable[Dict],
+    batch: int = 500,
+    dry_run: bool = False,
+    no_id: bool = False,
+    threads: int = 4,
+    max_in_flight: int = 8,
+    max_retries: int = 5,
+    max_bytes: int = 0,
+    compress: bool = False,
+    manifest: Optional[Manifest] = None,
+    delete_missing: bool = False,
+    workers: int = 1,
+) -> BulkStats:
+    stats = BulkStats()
+    prepared = prepare_docs(docs, workers=workers, no_id=no_id)
+    if dry_run:
+        # read-only against the manifest: print only what would be sent
+        out = sys.stdout
+        for doc_id, digest, _, source in prepared:
+            if manifest and manifest.unchanged(doc_id, digest):
+                stats.add(skipped=1)
+                continue
+            out.write(source.decode("utf-8"))
+            out.write("\n")
+        if manifest and delete_missing:
+            for doc_id in manifest.missing():
+                print(json.dumps({"delete": {"_id": doc_id}}))
+        return stats
+
+    # bounded queue: the reader blocks when workers fall behind
+    batches: "queue.Queue[Optional[List[BulkItem]]]" = queue.Queue(maxsize=max_in_flight)
+    on_success = manifest.record if manifest else None
+
+    worker_errors: List[BaseException] = []
+
+    def worker():
+        conn = EsConnection()
+        try:
+            while True:
+                items = batches.get()
+                if items is None:
+                    return
+                send_bulk(conn, index, items, stats, max_retries=max_retries, compress=compress, on_success=on_success)
+                print(f"Bulk sent: {len(items)} docs ({stats.indexed} indexed so far)")
+        except Exception as e:
+            # e.g. a sqlite error from the manifest; the reader re-raises it
+            # instead of blocking forever on a queue nobody drains
+            worker_errors.append(e)
+        finally:
+            conn.close()
+
+    def put(items: Optional[List[BulkItem]]):
+        while True:
+            if worker_errors:
+                raise RuntimeError(f"Bulk worker failed: {worker_errors[0]!r}") from worker_errors[0]
+            try:
+                batches.put(items, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+    pool = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, threads))]
+    for t in pool:
+        t.start()
+
+    batch_list: List[BulkItem] = []
+    batch_bytes = 0
+
+    def add(item: BulkItem):
+        nonlocal batch_list, batch_bytes
+        size = len(item[0]) + len(item[1] or b"") + 2
+        # flush before a document would push the payload past --max-bytes
+        # (an oversized document still goes out on its own)
+        if max_bytes and batch_list and batch_bytes + size > max_bytes:
+            put(batch_list)
+            batch_list, batch_bytes = [], 0
+        batch_list.append(item)
+        batch_bytes += size
+        if len(batch_list) >= batch:
+            put(batch_list)
+            batch_list, batch_bytes = [], 0
+
+    for doc_id, digest, action, source in prepared:
+        if manifest and manifest.unchanged(doc_id, digest):
+            stats.add(skipped=1)
+            continue
+        add((action, source, (doc_id, digest)))
+    if manifest and delete_missing:
+        for doc_id in manifest.missing():
+            add((json.dumps({"delete": {"_id": doc_id}}, ensure_ascii=False).encode("utf-8"), None, (doc_id, None)))
+    if batch_list:
+        put(batch_list)
+    for _ in pool:
+        put(None)
+    for t in pool:
+        t.join()
+    if worker_errors:
+        raise RuntimeError(f"Bulk worker failed: {worker_errors[0]!r}") from worker_errors[0]
+
+    print(stats.summary())
+    for err in stats.errors:
+        print(f"  error: {err}", file=sys.stderr)
+    return stats
+
+
+# Settings for the duration of a bulk load: no periodic refreshes and no
+# replica writes; both are restored before the index goes live
+BULK_LOAD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+
+def list_versions(alias: str) -> Dict[int, str]:
+    """Existing <alias>_v<n> indices, as {n: name}"""
+    found, code = es_json(f"/{alias}_v*?expand_wildcards=open")
+    if code >= 400:
+        return {}
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    return {int(m.group(1)): name for name in found for m in [pattern.match(name)] if m}
+
+
+def reindex(alias: str, docs: Iterable[Dict], forcemerge: bool = False, keep: int = 2, replicas: Optional[int] = None, manifest: Optional[Manifest] = None, **bulk_kwargs) -> BulkStats:
+    """Bulk-load a new <alias>_v<n> index and atomically point <alias> at it.
+
+    Searches keep hitting the current index (consistent results) until the
+    alias moves. If documents fail, the new index is deleted and the alias
+    is left alone.
+    """
+    aliased, code = es_json(f"/_alias/{alias}")
+    current = sorted(aliased) if code == 200 else []
+    # a plain index named like the alias (pre-alias setup) is dropped in the swap
+    legacy = False
+    if not current:
+        _, code = es_json(f"/{alias}")
+        legacy = code == 200
+
+    if replicas is None:
+        replicas = 1
+        source = current[0] if current else (alias if legacy else None)
+        if source:
+            settings, code = es_json(f"/{source}/_settings")
+            if code == 200 and settings:
+                replicas = int(next(iter(settings.values()))["settings"]["index"].get("number_of_replicas", 1))
+
+    versions = list_versions(alias)
+    target = f"{alias}_v{max(versions, default=0) + 1}"
+    body = json.loads(json.dumps(DEFAULT_MAPPING))
+    body.setdefault("settings", {}).update(BULK_LOAD_SETTINGS)
+    resp, code = es_json(f"/{target}", method="PUT", obj=body)
+    if code >= 400:
+        raise RuntimeError(f"Failed to create index {target}: {code}\n{resp}")
+    print(f"Created '{target}' for bulk load (refresh off, 0 replicas)")
+
+    if manifest:
+        # record under the new index; adopted by the alias only after the swap
+        manifest.index = target
+        manifest.full = True
+    started = time.time()
+    stats = bulk_index(target, docs, manifest=manifest, **bulk_kwargs)
+    if stats.failed:
+        print(f"{stats.failed} documents failed; deleting '{target}' and leaving '{alias}' unchanged", file=sys.stderr)
+        es_json(f"/{target}", method="DELETE")
+        if manifest:
+            manifest.discard()
+        return stats
+    print(f"Loaded '{target}' in {time.time() - started:.2f}s")
+
+    # restore live settings (null resets refresh_interval to the default)
+    resp, code = es_json(f"/{target}/_settings", method="PUT", obj={"index": {"refresh_interval": None, "number_of_replicas": replicas}})
+    if code >= 400:
+        raise RuntimeError(f"Failed to restore settings on {target}: {code}\n{resp}")
+    es_json(f"/{target}/_refresh", method="POST")
+    if forcemerge:
+        print(f"Force-merging '{target}' to 1 segment")
+        es_json(f"/{target}/_forcemerge?max_num_segments=1", method="POST", timeout=600)
+    health, code = es_json(f"/_cluster/health/{target}?wait_for_status=yellow&timeout=60s", timeout=90)
+    if code >= 400 or health.get("timed_out"):
+        raise RuntimeError(f"'{target}' did not become ready: {code}\n{health}")
+    mark_ingest_version(target)
+
+    actions = [{"remove": {"index": name, "alias": alias}} for name in current]
+    if legacy:
+        actions.append({"remove_index": {"index": alias}})
+    actions.append({"add": {"index": target, "alias": alias}})
+    resp, code = es_json("/_aliases", method="POST", obj={"actions": actions})
+    if code >= 400:
+        raise RuntimeError(f"Alias swap failed: {code}\n{resp}")
+    print(f"Alias '{alias}' -> '{target}'" + (f" (was {', '.join(current)})" if current else ""))
+    if manifest:
+        manifest.rename(alias)
+
+    # keep the newest `keep` versions (including the live one) for rollback
+    versions[int(target.rsplit("_v", 1)[1])] = target
+    for n in sorted(versions)[:-max(1, keep)]:
+        if versions[n] == target:
+            continue
+        _, code = es_json(f"/{versions[n]}", method="DELETE")
+        print(f"Pruned '{versions[n]}'" if code < 400 else f"Warning: failed to delete '{versions[n]}': {code}")
+    return stats
+
+
+def check_normalization(index: str) -> Optional[str]:
+    """Why an in-place run into <index> would duplicate documents, or None"""
+    count, code = es_json(f"/{index}/_count")
+    if code == 404 or not count.get("count"):
+        return None
+    mapping, code = es_json(f"/{index}/_mapping")
+    found = {
+        ((body.get("mappings") or {}).get("_meta") or {}).get("normalization_version")
+        for body in mapping.values()
+    } if code == 200 else {None}
+    if found == {NORMALIZATION_VERSION}:
+        return None
+    old = ", ".join(sorted(str(v) for v in found if v is not None)) or "unknown"
+    return (
+        f"'{index}' holds documents from normalization version {old} (this tool: {NORMALIZATION_VERSION}). "
+        "Document ids are content hashes and have changed, so a plain rerun would add a second copy of "
+        "every document. Rerun with --reindex, or with --manifest --delete-missing."
+    )
+
+
+def mark_ingest_version(index: str):
+    """Stamp the index mapping so the backend can drop its retrieval cache"""
+    version = str(int(time.time() * 1000))
+    body = json.dumps({"_meta": {"ingest_version": version, "normalization_version": NORMALIZATION_VERSION}}).encode()
+    resp, code = http_request(f"/{index}/_mapping", method="PUT", body=body, headers={"Content-Type": "application/json"})
+    if code >= 400:
+        print(f"Warning: failed to set ingest version: {code}\n{resp}", file=sys.stderr)
+    else:
+        print(f"Ingest version set: {version}")
 
 
 def main(argv=None):
@@ -262,8 +1013,21 @@ def main(argv=None):
     p.add_argument("--files", nargs="+", required=False, help="Local file paths or URLs (json/csv)")
     p.add_argument("--dry-run", action="store_true", help="Print normalized docs instead of indexing")
     p.add_argument("--check-connection", action="store_true", help="Check Elasticsearch cluster health and exit")
-    p.add_argument("--batch", type=int, default=500, help="Bulk batch size")
+    p.add_argument("--batch", type=int, default=500, help="Bulk batch size (max documents per request)")
+    p.add_argument("--max-bytes", type=int, default=0, help="Also flush a batch before its payload exceeds this many bytes (0 = count only)")
+    p.add_argument("--gzip", action="store_true", help="gzip bulk request bodies (Content-Encoding: gzip)")
     p.add_argument("--no-id", action="store_true", help="Do not send _id in bulk header (let ES assign ids)")
+    p.add_argument("--threads", type=int, default=4, help="Concurrent bulk request threads")
+    p.add_argument("--max-in-flight", type=int, default=8, help="Max batches queued for the bulk threads")
+    p.add_argument("--max-retries", type=int, default=5, help="Retries for items rejected with 429/503")
+    p.add_argument("--workers", type=int, default=1, help="Processes used to normalize/serialize rows (order is preserved)")
+    p.add_argument("--manifest", help="SQLite file tracking indexed ids/content hashes; reruns only send changes")
+    p.add_argument("--full", action="store_true", help="With --manifest: resend everything and rebuild the manifest")
+    p.add_argument("--delete-missing", action="store_true", help="With --manifest: delete docs no longer present in the inputs")
+    p.add_argument("--reindex", action="store_true", help="Load a new <index>_v<n> index, then atomically move the <index> alias to it")
+    p.add_argument("--forcemerge", action="store_true", help="With --reindex: force-merge the new index to one segment before the swap")
+    p.add_argument("--keep", type=int, default=2, help="With --reindex: versions to keep, including the live one")
+    p.add_argument("--replicas", type=int, help="With --reindex: replicas once loaded (default: same as the current index)")
     args = p.parse_args(argv)
 
     if args.check_connection:
@@ -274,7 +1038,20 @@ def main(argv=None):
         print("No input files provided. Use --files file1.json file2.csv or URLs.")
         sys.exit(1)
 
-    ensure_index(args.index)
+    if (args.full or args.delete_missing) and not args.manifest:
+        p.error("--full and --delete-missing require --manifest")
+    if args.manifest and args.no_id:
+        p.error("--manifest needs document ids; it cannot be combined with --no-id")
+    if args.reindex and args.delete_missing:
+        p.error("--reindex always loads a fresh index; --delete-missing does not apply")
+
+    if not args.dry_run and not args.reindex:
+        if not args.delete_missing:
+            problem = check_normalization(args.index)
+            if problem:
+                p.error(problem)
+        ensure_index(args.index)
+    manifest = Manifest(args.manifest, args.index, full=args.full) if args.manifest else None
 
     # stream docs from files
     def docs():
@@ -286,7 +1063,38 @@ def main(argv=None):
                 else:
                     yield item
 
-    bulk_index(args.index, docs(), batch=args.batch, dry_run=args.dry_run, no_id=args.no_id)
+    bulk_kwargs = dict(
+        batch=args.batch,
+        dry_run=args.dry_run,
+        no_id=args.no_id,
+        threads=args.threads,
+        max_in_flight=args.max_in_flight,
+        max_retries=args.max_retries,
+        max_bytes=args.max_bytes,
+        compress=args.gzip,
+        workers=args.workers,
+    )
+    if args.reindex and not args.dry_run:
+        stats = reindex(
+            args.index, docs(), forcemerge=args.forcemerge, keep=args.keep, replicas=args.replicas, manifest=manifest, **bulk_kwargs
+        )
+    else:
+        stats = bulk_index(args.index, docs(), manifest=manifest, delete_missing=args.delete_missing, **bulk_kwargs)
+    if manifest:
+        manifest.close()
+    if args.dry_run and manifest:
+        print(f"Unchanged (skipped): {stats.skipped}", file=sys.stderr)
+    rss = peak_rss_mb()
+    if rss is not None:
+        # stderr keeps --dry-run output clean
+        print(f"Peak RSS: {rss:.1f} MB", file=sys.stderr)
+    if not args.dry_run:
+        # nothing changed: keep the backend's retrieval cache warm
+        # (reindex stamps the new index itself before the swap)
+        if not args.reindex and (stats.indexed or stats.deleted):
+            mark_ingest_version(args.index)
+        if stats.failed:
+            sys.exit(3)
 
 
 if __name__ == "__main__":